@@ -123,6 +123,10 @@ CREATE INDEX IF NOT EXISTS idx_incidents_fingerprint ON incidents(fingerprint);
 CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents(status);
 CREATE INDEX IF NOT EXISTS idx_incidents_cluster_namespace ON incidents(cluster, namespace);
 CREATE INDEX IF NOT EXISTS idx_incidents_started_at ON incidents(started_at DESC);
+-- list_incidents: newest-first pages, optionally filtered by status/namespace
+CREATE INDEX IF NOT EXISTS idx_incidents_open_started ON incidents(started_at DESC, id DESC) WHERE status = 'open';
+CREATE INDEX IF NOT EXISTS idx_incidents_status_started ON incidents(status, started_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_incidents_ns_started ON incidents(namespace, started_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_evidence_incident_id ON evidence(incident_id);
 CREATE INDEX IF NOT EXISTS idx_evidence_type ON evidence(evidence_type);
 CREATE INDEX IF NOT EXISTS idx_hypotheses_incident_id ON hypotheses(incident_id);
@@ -1,4 +1,5 @@
 # Config package
+from src.config.logging_config import configure_logging
 from src.config.settings import Settings, get_settings, settings
 
-__all__ = ["settings", "get_settings", "Settings"]
+__all__ = ["settings", "get_settings", "Settings", "configure_logging"]
@@ -0,0 +1,47 @@
+"""
+Structured logging configuration.
+Renders structlog events as JSON lines with orjson, or as console output in development.
+"""
+import logging
+from typing import Any
+
+import orjson
+import structlog
+
+from src.config.settings import settings
+
+
+def _orjson_dumps(event: dict[str, Any], **_: Any) -> bytes:
+    # UUIDs and datetimes serialize natively; anything else falls back to str()
+    return orjson.dumps(event, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+
+
+def configure_logging(level: str | None = None) -> None:
+    """
+    Configure structlog for the process; call once at service startup.
+
+    level overrides settings.log_level, e.g. for a quieter CLI.
+    """
+    processors: list[Any] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.format_exc_info,
+    ]
+
+    if settings.log_format == "console":
+        processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory = structlog.PrintLoggerFactory()
+    else:
+        # orjson emits bytes, which the bytes logger writes without re-encoding
+        processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
+        logger_factory = structlog.BytesLoggerFactory()
+
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.getLevelName((level or settings.log_level).upper())
+        ),
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     app_env: str = Field(default="development", description="development, staging, production")
     debug: bool = False
     log_level: str = "INFO"
+    log_format: str = Field(default="json", description="json, console")
 
     # API Server
     api_host: str = "0.0.0.0"
@@ -75,9 +76,11 @@ class Settings(BaseSettings):
     # Kubernetes
     kubeconfig: str | None = None
     kubernetes_default_namespace: str = "default"
+    kubernetes_watch_cache_enabled: bool = False
 
     # Prometheus
     prometheus_url: str = "http://localhost:9090"
+    prometheus_batch_verification_queries: bool = True
 
     # Loki
     loki_url: str = "http://localhost:3100"
@@ -98,10 +101,14 @@ class Settings(BaseSettings):
     gemini_model: str = "gemini-pro"
     ollama_url: str = "http://localhost:11434"
     ollama_model: str = "llama2"
+    llm_batch_prompting: bool = True
+    llm_pattern_cache_ttl_seconds: float = 0.0
 
     # OPA
     opa_url: str = "http://localhost:8181"
     opa_policy_path: str = "/v1/data/remediation"
+    opa_decision_cache_size: int = 512
+    opa_decision_cache_ttl_seconds: float = 60.0
 
     # Slack
     slack_bot_token: str | None = None
@@ -118,6 +125,7 @@ class Settings(BaseSettings):
     api_key_header: str = "X-API-Key"
     rate_limit_per_minute: int = 100
     cors_origins: list[str] = Field(default_factory=lambda: ["http://localhost:3000"])
+    max_webhook_body_bytes: int = 10 * 1024 * 1024
 
     @field_validator('cors_origins', mode='before')
     @classmethod
@@ -135,12 +143,20 @@ class Settings(BaseSettings):
     max_log_lines: int = 1000
     max_metric_points: int = 500
 
+    # Deduplication
+    dedup_bloom_filter_enabled: bool = False
+    dedup_bloom_capacity: int = 100_000
+    dedup_bloom_rebuild_seconds: int = 300
+    dedup_local_cache_size: int = 10_000
+    dedup_local_cache_ttl_seconds: float = 30.0
+
     # Remediation
     remediation_auto_approve_dev: bool = True
     remediation_auto_approve_staging: bool = False
     remediation_auto_approve_prod: bool = False
     remediation_max_blast_radius: float = 50.0
     remediation_verification_wait_seconds: int = 120
+    remediation_blast_radius_cache_ttl_seconds: float = 30.0
 
 
 @lru_cache
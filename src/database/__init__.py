@@ -13,6 +13,7 @@ from src.database.postgres import (
     get_db,
     get_session,
     init_database,
+    warm_database_pool,
 )
 
 __all__ = [
@@ -24,6 +25,7 @@ __all__ = [
     "get_db",
     "check_database_connection",
     "init_database",
+    "warm_database_pool",
     "close_database",
     # Neo4j
     "Neo4jConnection",
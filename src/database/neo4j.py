@@ -2,6 +2,7 @@
 Neo4j graph database connection and operations.
 Used for storing and querying the Evidence Graph.
 """
+from collections import defaultdict
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
@@ -15,11 +16,23 @@ from src.models.evidence import GraphEntity, GraphRelation
 
 logger = structlog.get_logger()
 
+# Rows per UNWIND statement in the batch writers
+GRAPH_BATCH_SIZE = 5000
+# Entity groups larger than this are written with CALL { ... } IN CONCURRENT
+# TRANSACTIONS (Neo4j 5.21+), committing CONCURRENT_WRITE_ROWS rows per transaction.
+# Relationships always take the serial path: concurrent MERGEs on shared endpoint
+# nodes contend for the same locks and deadlock
+CONCURRENT_WRITE_THRESHOLD = 2000
+CONCURRENT_WRITE_ROWS = 1000
+CONCURRENT_TRANSACTIONS_VERSION = (5, 21)
+
 
 class Neo4jConnection:
     """Neo4j database connection manager."""
 
     _driver: AsyncDriver | None = None
+    # Probed once per driver; None until then
+    _concurrent_transactions: bool | None = None
 
     @classmethod
     async def get_driver(cls) -> AsyncDriver:
@@ -40,8 +53,24 @@ class Neo4jConnection:
         if cls._driver is not None:
             await cls._driver.close()
             cls._driver = None
+            cls._concurrent_transactions = None
             logger.info("Neo4j driver closed")
 
+    @classmethod
+    async def supports_concurrent_transactions(cls) -> bool:
+        """Whether the server accepts CALL { ... } IN CONCURRENT TRANSACTIONS."""
+        if cls._concurrent_transactions is None:
+            try:
+                async with get_neo4j_session() as session:
+                    result = await session.run("CALL dbms.components() YIELD versions RETURN versions[0] AS version")
+                    record = await result.single()
+                version = tuple(int(part) for part in record["version"].split(".")[:2])
+                cls._concurrent_transactions = version >= CONCURRENT_TRANSACTIONS_VERSION
+            except Exception as e:
+                logger.warning("Neo4j version probe failed", error=str(e))
+                cls._concurrent_transactions = False
+        return cls._concurrent_transactions
+
     @classmethod
     async def verify_connectivity(cls) -> bool:
         """Verify Neo4j connectivity."""
@@ -65,6 +94,27 @@ async def get_neo4j_session() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+def _unwind_query(body: str) -> str:
+    """Wrap a per-row write in UNWIND $rows."""
+    return f"UNWIND $rows AS row\n{body}"
+
+
+async def _concurrent_unwind_query(body: str, row_count: int) -> str:
+    """
+    Like _unwind_query, but large groups run the body in concurrent inner
+    transactions when the server supports it. Rows must not share nodes.
+    """
+    if row_count > CONCURRENT_WRITE_THRESHOLD and await Neo4jConnection.supports_concurrent_transactions():
+        return f"""
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            {body}
+        }} IN CONCURRENT TRANSACTIONS OF {CONCURRENT_WRITE_ROWS} ROWS
+        """
+    return _unwind_query(body)
+
+
 class GraphService:
     """Service for Evidence Graph operations."""
 
@@ -93,24 +143,30 @@ class GraphService:
             return record["id"] if record else entity.id
 
     @staticmethod
-    async def create_entities_batch(entities: list[GraphEntity]) -> int:
-        """Create multiple entities in a batch."""
-        async with get_neo4j_session() as session:
-            count = 0
-            for entity in entities:
-                props = entity.properties.copy()
-                props["id"] = entity.id
-
-                query = f"""
-                MERGE (n:{entity.type} {{id: $id}})
-                SET n += $properties
-                """
+    async def create_entities_batch(entities: list[GraphEntity], batch_size: int = GRAPH_BATCH_SIZE) -> int:
+        """Create multiple entities, one UNWIND MERGE per label and batch."""
+        # Rows are keyed by id so no two concurrent inner transactions MERGE the
+        # same node; repeated entities fold their properties in order
+        by_label: dict[str, dict[str, dict]] = defaultdict(dict)
+        for entity in entities:
+            row = by_label[entity.type].setdefault(entity.id, {"id": entity.id, "properties": {}})
+            row["properties"].update(entity.properties, id=entity.id)
 
-                await session.run(query, id=entity.id, properties=props)
-                count += 1
+        async with get_neo4j_session() as session:
+            for label, rows_by_id in by_label.items():
+                rows = list(rows_by_id.values())
+                query = await _concurrent_unwind_query(
+                    f"""
+                    MERGE (n:{label} {{id: row.id}})
+                    SET n += row.properties
+                    """,
+                    len(rows),
+                )
+                for start in range(0, len(rows), batch_size):
+                    await session.run(query, rows=rows[start:start + batch_size])
 
-            logger.info("Created entities batch", count=count)
-            return count
+        logger.info("Created entities batch", count=len(entities))
+        return len(entities)
 
     @staticmethod
     async def create_relation(relation: GraphRelation) -> bool:
@@ -143,28 +199,31 @@ class GraphService:
             return False
 
     @staticmethod
-    async def create_relations_batch(relations: list[GraphRelation]) -> int:
-        """Create multiple relationships in a batch."""
+    async def create_relations_batch(relations: list[GraphRelation], batch_size: int = GRAPH_BATCH_SIZE) -> int:
+        """Create multiple relationships, one UNWIND MERGE per type and batch."""
+        by_type: dict[str, list[dict]] = defaultdict(list)
+        for rel in relations:
+            by_type[rel.relation_type].append({
+                "source_id": rel.source_id,
+                "target_id": rel.target_id,
+                "properties": rel.properties,
+            })
+
         async with get_neo4j_session() as session:
-            count = 0
-            for rel in relations:
-                query = f"""
-                MATCH (source {{id: $source_id}})
-                MATCH (target {{id: $target_id}})
-                MERGE (source)-[r:{rel.relation_type}]->(target)
-                SET r += $properties
-                """
-
-                await session.run(
-                    query,
-                    source_id=rel.source_id,
-                    target_id=rel.target_id,
-                    properties=rel.properties,
+            for relation_type, rows in by_type.items():
+                query = _unwind_query(
+                    f"""
+                    MATCH (source {{id: row.source_id}})
+                    MATCH (target {{id: row.target_id}})
+                    MERGE (source)-[r:{relation_type}]->(target)
+                    SET r += row.properties
+                    """
                 )
-                count += 1
+                for start in range(0, len(rows), batch_size):
+                    await session.run(query, rows=rows[start:start + batch_size])
 
-            logger.info("Created relations batch", count=count)
-            return count
+        logger.info("Created relations batch", count=len(relations))
+        return len(relations)
 
     @staticmethod
     async def get_incident_graph(incident_id: str, depth: int = 3) -> dict[str, Any]:
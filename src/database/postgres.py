@@ -2,6 +2,7 @@
 PostgreSQL database connection and session management.
 Uses SQLAlchemy async with asyncpg driver.
 """
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -82,6 +83,24 @@ async def init_database() -> None:
     logger.info("Database tables initialized")
 
 
+async def warm_database_pool() -> None:
+    """
+    Open the pool's steady-state connections up front so the first activities
+    or requests don't each pay connection setup and authentication.
+    """
+    opened = await asyncio.gather(
+        *(engine.connect() for _ in range(engine.pool.size())),
+        return_exceptions=True,
+    )
+    connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+    # Closing returns each connection to the pool, where it stays open
+    await asyncio.gather(*(conn.close() for conn in connections))
+    if len(connections) < len(opened):
+        raise next(conn for conn in opened if isinstance(conn, BaseException))
+
+    logger.info("Database pool warmed", connections=len(connections))
+
+
 async def close_database() -> None:
     """Close database connections."""
     await engine.dispose()
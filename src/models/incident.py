@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class IncidentSeverity(str, Enum):
@@ -68,6 +68,9 @@ class Incident(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Record creation time")
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update time")
 
+    # JSON-mode dump cached at creation for the workflow start (not a field)
+    _workflow_input: dict | None = PrivateAttr(default=None)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -29,6 +29,41 @@ ERROR_PATTERNS = [
     (r"(?i)(TLS|SSL|certificate|handshake)", "tls"),
 ]
 
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _compile_error_matchers() -> list[tuple[tuple[str, ...], re.Pattern | None]]:
+    """
+    Reduce each error pattern to lowercase keywords where it is a plain
+    case-insensitive alternation of literals.
+
+    Substring tests against the lowercased line run in C and are far cheaper
+    than a regex search per pattern; patterns with real regex syntax keep
+    their compiled regex.
+    """
+    matchers = []
+    for pattern, _ in ERROR_PATTERNS:
+        body = pattern.removeprefix("(?i)")
+        alternatives = body[1:-1].split("|") if body.startswith("(") and body.endswith(")") else []
+        if alternatives and not any(ch in _REGEX_METACHARS for alt in alternatives for ch in alt):
+            matchers.append((tuple(alt.lower() for alt in alternatives), None))
+        else:
+            matchers.append(((), re.compile(pattern)))
+    return matchers
+
+
+# (keywords, regex) per ERROR_PATTERNS entry, in the same order
+_ERROR_MATCHERS = _compile_error_matchers()
+
+# One bit per pattern category, so matches accumulate in a single int
+_CAT_BITS = {category: 1 << i for i, (_, category) in enumerate(ERROR_PATTERNS)}
+_SEVERE_BITS = _CAT_BITS["oom"] | _CAT_BITS["critical"]
+
+# Only the head of a log line is scanned; keywords almost always appear early
+# and long JSON/stack payloads would otherwise dominate regex cost.
+ERROR_SCAN_CHARS = 512
+STACK_TRACE_SCAN_CHARS = 2048
+
 # Stack trace patterns
 STACK_TRACE_PATTERNS = [
     r"at\s+[\w.$]+\([\w.]+:\d+\)",  # Java
@@ -37,6 +72,9 @@ STACK_TRACE_PATTERNS = [
     r"\s+at\s+.+\s+\(.+:\d+:\d+\)",  # JavaScript/Node
 ]
 
+# All stack trace patterns as one alternation, so each line is scanned once
+_STACK_TRACE_RE = re.compile("|".join(f"(?:{p})" for p in STACK_TRACE_PATTERNS))
+
 
 class LogsCollector(BaseCollector):
     """Collects log evidence from Loki."""
@@ -143,7 +181,7 @@ class LogsCollector(BaseCollector):
             "total_lines": len(log_entries),
             "error_count": analysis["error_count"],
             "warning_count": analysis["warning_count"],
-            "patterns_found": list(analysis["patterns_found"]),
+            "patterns_found": analysis["patterns_found"],
             "sample_errors": analysis["sample_errors"],
             "stack_traces": analysis["stack_traces"],
             "time_range": {
@@ -167,14 +205,15 @@ class LogsCollector(BaseCollector):
         """Extract patterns from log entries."""
         error_count = 0
         warning_count = 0
-        patterns_found = set()
+        pattern_mask = 0
         stack_traces = []
         sample_errors = []
 
         for entry in log_entries:
             line = entry.get("line", "")
 
-            matched = self._match_error_patterns(line, patterns_found, sample_errors)
+            matched, category_bit = self._match_error_patterns(line, sample_errors)
+            pattern_mask |= category_bit
             if matched == "error":
                 error_count += 1
             elif matched == "warning":
@@ -185,7 +224,8 @@ class LogsCollector(BaseCollector):
         return {
             "error_count": error_count,
             "warning_count": warning_count,
-            "patterns_found": patterns_found,
+            "pattern_mask": pattern_mask,
+            "patterns_found": [name for name, bit in _CAT_BITS.items() if pattern_mask & bit],
             "sample_errors": sample_errors,
             "stack_traces": stack_traces,
         }
@@ -193,36 +233,37 @@ class LogsCollector(BaseCollector):
     def _match_error_patterns(
         self,
         line: str,
-        patterns_found: set,
         sample_errors: list
-    ) -> str | None:
-        """Match error patterns in a log line."""
-        for pattern, category in ERROR_PATTERNS:
-            if re.search(pattern, line):
-                patterns_found.add(category)
+    ) -> tuple[str | None, int]:
+        """
+        Match error patterns in a log line.
+
+        Returns:
+            Tuple of (match kind, category bit from _CAT_BITS or 0)
+        """
+        head = line[:ERROR_SCAN_CHARS]
+        lowered = head.lower()
+        for (keywords, regex), (_, category) in zip(_ERROR_MATCHERS, ERROR_PATTERNS):
+            if regex.search(head) if regex is not None else any(k in lowered for k in keywords):
                 if "error" in category or "critical" in category:
                     if len(sample_errors) < 10:
                         sample_errors.append(line[:500])
-                    return "error"
-                return "warning"
-        return None
+                    return "error", _CAT_BITS[category]
+                return "warning", _CAT_BITS[category]
+        return None, 0
 
     def _match_stack_traces(self, line: str, stack_traces: list) -> None:
         """Match stack trace patterns in a log line."""
         if len(stack_traces) >= 5:
             return
 
-        for st_pattern in STACK_TRACE_PATTERNS:
-            if re.search(st_pattern, line):
-                stack_traces.append(line[:1000])
-                return
+        if _STACK_TRACE_RE.search(line, 0, STACK_TRACE_SCAN_CHARS):
+            stack_traces.append(line[:1000])
 
     def _calculate_log_signal_strength(self, analysis: dict) -> float:
         """Calculate signal strength from log analysis."""
         error_count = analysis["error_count"]
         warning_count = analysis["warning_count"]
-        patterns_found = analysis["patterns_found"]
-
         signal_strength = 0.3
 
         if error_count > 10:
@@ -234,7 +275,7 @@ class LogsCollector(BaseCollector):
         elif warning_count > 10:
             signal_strength = 0.5
 
-        if "oom" in patterns_found or "critical" in patterns_found:
+        if analysis["pattern_mask"] & _SEVERE_BITS:
             signal_strength = max(signal_strength, 0.95)
 
         return signal_strength
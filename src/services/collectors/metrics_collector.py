@@ -2,6 +2,9 @@
 Metrics Evidence Collector.
 Collects metrics from Prometheus for the incident.
 """
+import copy
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -15,25 +18,50 @@ from src.services.collectors.base import BaseCollector
 
 logger = structlog.get_logger()
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+QUERIES_FILE = Path(__file__).parent.parent.parent / "config" / "promql_queries.yaml"
+
+
+@lru_cache(maxsize=4)
+def _parse_queries_file(path: Path) -> dict[str, list[dict]]:
+    """Parse a PromQL queries file; raises so only successful loads are cached."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
 
 class MetricsCollector(BaseCollector):
     """Collects metric evidence from Prometheus."""
 
     name = "metrics"
 
+    # Query-name keyword -> threshold check, in priority order
+    _THRESHOLD_MAP: dict[str, str] = {
+        "restart": "_check_restart_threshold",
+        "error": "_check_error_threshold",
+        "5xx": "_check_error_threshold",
+        "memory": "_check_memory_threshold",
+        "usage": "_check_memory_threshold",
+        "latency": "_check_latency_threshold",
+        "throttl": "_check_throttle_threshold",
+        "oom": "_check_oom_threshold",
+        "hpa": "_check_hpa_threshold",
+    }
+
     def __init__(self, incident):
         super().__init__(incident)
         self.prometheus_url = settings.prometheus_url
         self.max_points = settings.max_metric_points
         self.queries = self._load_queries()
 
-    def _load_queries(self) -> dict[str, list[dict]]:
-        """Load PromQL queries from config."""
-        queries_file = Path(__file__).parent.parent.parent / "config" / "promql_queries.yaml"
-
+    @classmethod
+    def _load_queries(cls) -> dict[str, list[dict]]:
+        """Load PromQL queries from config (parsed once per process)."""
         try:
-            with open(queries_file) as f:
-                return yaml.safe_load(f)
+            # Each collector gets its own copy; failures are not cached, so a
+            # later collector retries the load
+            return copy.deepcopy(_parse_queries_file(QUERIES_FILE))
         except Exception as e:
             logger.warning("Failed to load PromQL queries config", error=str(e))
             return {}
@@ -125,6 +153,7 @@ class MetricsCollector(BaseCollector):
             "query": query,
             "description": description,
             "series_count": len(results),
+            "series": metric_data["series"],
             "values": metric_data["values"],
             "current_value": metric_data.get("current_value"),
             "max_value": metric_data.get("max_value"),
@@ -192,55 +221,70 @@ class MetricsCollector(BaseCollector):
         return summary
 
     def _process_results(self, results: list) -> dict[str, Any]:
-        """Process Prometheus query results."""
+        """
+        Process Prometheus query results.
+
+        Labels are kept once per series; each value is a
+        ``(timestamp, value, series_index)`` tuple pointing back into ``series``.
+        """
+        series_labels = []
         all_values = []
 
         for result in results:
-            metric_labels = result.get("metric", {})
-            values = result.get("values", [])
+            series_index = len(series_labels)
+            series_labels.append(result.get("metric", {}))
 
-            for ts, val in values:
-                parsed = self._parse_metric_value(ts, val, metric_labels)
-                if parsed:
-                    all_values.append(parsed)
+            for ts, val in result.get("values", []):
+                parsed = self._parse_metric_value(val)
+                if parsed is not None:
+                    all_values.append((ts, parsed, series_index))
 
-        all_values.sort(key=lambda x: x["timestamp"])
+        all_values.sort(key=itemgetter(0))
 
         if len(all_values) > self.max_points:
             step = len(all_values) // self.max_points
             all_values = all_values[::step]
 
-        return self._calculate_stats(all_values)
+        metric_data = self._calculate_stats(all_values)
+        metric_data["series"] = series_labels
+        return metric_data
 
-    def _parse_metric_value(
-        self,
-        ts: float,
-        val: str,
-        labels: dict
-    ) -> dict | None:
-        """Parse a single metric value."""
+    def _parse_metric_value(self, val: str) -> float | None:
+        """Parse a single metric value, dropping non-numeric and infinite samples."""
         try:
             numeric_val = float(val)
             if numeric_val != float('inf') and numeric_val != float('-inf'):
-                return {
-                    "timestamp": ts,
-                    "value": numeric_val,
-                    "labels": labels,
-                }
+                return numeric_val
         except (ValueError, TypeError):
             pass
         return None
 
     def _calculate_stats(self, all_values: list) -> dict[str, Any]:
-        """Calculate statistics from metric values."""
-        numeric_values = [v["value"] for v in all_values]
+        """Calculate statistics from metric values in a single pass."""
+        if not all_values:
+            return {
+                "values": [],
+                "current_value": None,
+                "max_value": None,
+                "min_value": None,
+                "avg_value": None,
+            }
+
+        min_value = max_value = all_values[0][1]
+        total = 0.0
+        for _, value, _ in all_values:
+            if value < min_value:
+                min_value = value
+            elif value > max_value:
+                max_value = value
+            total += value
 
         return {
             "values": all_values[-50:],
-            "current_value": numeric_values[-1] if numeric_values else None,
-            "max_value": max(numeric_values) if numeric_values else None,
-            "min_value": min(numeric_values) if numeric_values else None,
-            "avg_value": sum(numeric_values) / len(numeric_values) if numeric_values else None,
+            "current_value": all_values[-1][1],
+            "max_value": max_value,
+            "min_value": min_value,
+            "avg_value": total / len(all_values),
         }
 
     def _calculate_signal_strength(self, metric_data: dict, query_name: str) -> float:
@@ -250,20 +294,10 @@ class MetricsCollector(BaseCollector):
         if current is None:
             return 0.3
 
-        # Check each threshold category
-        thresholds = [
-            (self._check_restart_threshold, ["restart"]),
-            (self._check_error_threshold, ["error", "5xx"]),
-            (self._check_memory_threshold, ["memory", "usage"]),
-            (self._check_latency_threshold, ["latency"]),
-            (self._check_throttle_threshold, ["throttl"]),
-            (self._check_oom_threshold, ["oom"]),
-            (self._check_hpa_threshold, ["hpa"]),
-        ]
-
-        for check_fn, keywords in thresholds:
-            if any(kw in query_name for kw in keywords):
-                return check_fn(current, query_name)
+        # First matching keyword wins; dict order preserves the priority
+        for keyword, check_name in self._THRESHOLD_MAP.items():
+            if keyword in query_name:
+                return getattr(self, check_name)(current, query_name)
 
         return 0.3
 
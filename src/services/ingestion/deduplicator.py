@@ -2,15 +2,51 @@
 Alert deduplicator - prevents duplicate incidents from the same alert.
 Uses Redis for fast fingerprint lookups with TTL.
 """
+import asyncio
+import hashlib
+import math
+import time
 from datetime import timedelta
 
 import redis.asyncio as redis
 import structlog
 
 from src.config import settings
+from src.services.resilience import TTLCache
 
 logger = structlog.get_logger()
 
+FINGERPRINT_KEY_PREFIX = "aiops:fingerprint:"
+
+
+class FingerprintBloomFilter:
+    """
+    Fixed-size in-process Bloom filter over alert fingerprints.
+
+    A miss means the fingerprint was definitely never added; a hit only means
+    it might have been, so callers must confirm hits against Redis.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions derived from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
 
 class AlertDeduplicator:
     """Deduplicates alerts based on fingerprint."""
@@ -19,6 +55,17 @@ class AlertDeduplicator:
     FINGERPRINT_TTL = timedelta(hours=4)
 
     _redis_client: redis.Redis | None = None
+    _bloom: FingerprintBloomFilter | None = None
+    _bloom_built_at: float = 0.0
+    # Only one rebuild SCAN at a time; waiters reuse its result
+    _bloom_lock = asyncio.Lock()
+    # Fingerprints recently confirmed as duplicates -> incident id. The TTL
+    # bounds how long a fingerprint removed in Redis by another process is
+    # still treated as a duplicate here
+    _recent = TTLCache(
+        max_size=settings.dedup_local_cache_size,
+        ttl_seconds=settings.dedup_local_cache_ttl_seconds,
+    )
 
     @classmethod
     async def get_redis(cls) -> redis.Redis:
@@ -37,6 +84,47 @@ class AlertDeduplicator:
         if cls._redis_client is not None:
             await cls._redis_client.close()
             cls._redis_client = None
+        cls._bloom = None
+        cls._bloom_built_at = 0.0
+        cls._recent.clear()
+
+    @classmethod
+    async def _get_bloom(cls) -> FingerprintBloomFilter | None:
+        """
+        Get the local fingerprint Bloom filter, rebuilding it from Redis when stale.
+
+        Disabled unless ``dedup_bloom_filter_enabled`` is set: fingerprints
+        registered by other ingestion processes only become visible here on the
+        next rebuild, so it is only safe for single-process deployments.
+        """
+        if not settings.dedup_bloom_filter_enabled:
+            return None
+
+        if not cls._bloom_is_stale():
+            return cls._bloom
+
+        async with cls._bloom_lock:
+            if cls._bloom_is_stale():
+                try:
+                    bloom = FingerprintBloomFilter(settings.dedup_bloom_capacity)
+                    client = await cls.get_redis()
+                    async for key in client.scan_iter(match=f"{FINGERPRINT_KEY_PREFIX}*", count=1000):
+                        bloom.add(key.removeprefix(FINGERPRINT_KEY_PREFIX))
+                    cls._bloom = bloom
+                except Exception as e:
+                    # Fall back to Redis lookups until the next rebuild is due
+                    logger.warning("Failed to rebuild fingerprint bloom filter", error=str(e))
+                    cls._bloom = None
+                cls._bloom_built_at = time.monotonic()
+
+        return cls._bloom
+
+    @classmethod
+    def _bloom_is_stale(cls) -> bool:
+        """Whether the Bloom filter is due for a rebuild (or was never built)."""
+        if cls._bloom_built_at == 0.0:
+            return True
+        return time.monotonic() - cls._bloom_built_at > settings.dedup_bloom_rebuild_seconds
 
     @classmethod
     async def check_duplicate(
@@ -49,13 +137,22 @@ class AlertDeduplicator:
         Returns:
             Tuple of (is_duplicate, existing_incident_id)
         """
+        cached_id = cls._recent.get(fingerprint)
+        if cached_id is not None:
+            return True, cached_id
+
         try:
+            bloom = await cls._get_bloom()
+            if bloom is not None and fingerprint not in bloom:
+                return False, None
+
             client = await cls.get_redis()
-            key = f"aiops:fingerprint:{fingerprint}"
+            key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
 
             existing_id = await client.get(key)
 
             if existing_id:
+                cls._recent.put(fingerprint, existing_id)
                 logger.debug(
                     "Duplicate alert detected",
                     fingerprint=fingerprint,
@@ -70,6 +167,53 @@ class AlertDeduplicator:
             # Fail open - don't block incident creation on Redis errors
             return False, None
 
+    @classmethod
+    async def check_duplicates_bulk(
+        cls,
+        fingerprints: list[str],
+    ) -> list[tuple[bool, str | None]]:
+        """
+        Check many fingerprints with a single Redis MGET.
+
+        Returns:
+            List of (is_duplicate, existing_incident_id), aligned with fingerprints
+        """
+        results: list[tuple[bool, str | None]] = [(False, None)] * len(fingerprints)
+
+        unresolved = []
+        for i, fp in enumerate(fingerprints):
+            cached_id = cls._recent.get(fp)
+            if cached_id is not None:
+                results[i] = (True, cached_id)
+            else:
+                unresolved.append(i)
+
+        try:
+            bloom = await cls._get_bloom()
+            indexes = [
+                i for i in unresolved
+                if bloom is None or fingerprints[i] in bloom
+            ]
+            if not indexes:
+                return results
+
+            client = await cls.get_redis()
+            existing_ids = await client.mget(
+                [f"{FINGERPRINT_KEY_PREFIX}{fingerprints[i]}" for i in indexes]
+            )
+
+            for i, existing_id in zip(indexes, existing_ids, strict=True):
+                if existing_id:
+                    results[i] = (True, existing_id)
+                    cls._recent.put(fingerprints[i], existing_id)
+
+            return results
+
+        except Exception as e:
+            logger.error("Redis error during bulk deduplication", error=str(e))
+            # Fail open - don't block incident creation on Redis errors
+            return results
+
     @classmethod
     async def register_fingerprint(
         cls,
@@ -87,10 +231,12 @@ class AlertDeduplicator:
         """
         try:
             client = await cls.get_redis()
-            key = f"aiops:fingerprint:{fingerprint}"
+            key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
             ttl = ttl or cls.FINGERPRINT_TTL
 
             await client.set(key, incident_id, ex=int(ttl.total_seconds()))
+            if cls._bloom is not None:
+                cls._bloom.add(fingerprint)
 
             logger.debug(
                 "Registered fingerprint",
@@ -103,12 +249,46 @@ class AlertDeduplicator:
             logger.error("Redis error during fingerprint registration", error=str(e))
             return False
 
+    @classmethod
+    async def register_fingerprints_bulk(
+        cls,
+        fingerprints: dict[str, str],
+        ttl: timedelta | None = None,
+    ) -> bool:
+        """
+        Register many fingerprint -> incident_id mappings in one pipelined round-trip.
+        """
+        if not fingerprints:
+            return True
+
+        try:
+            client = await cls.get_redis()
+            ex = int((ttl or cls.FINGERPRINT_TTL).total_seconds())
+
+            pipe = client.pipeline()
+            for fingerprint, incident_id in fingerprints.items():
+                pipe.set(f"{FINGERPRINT_KEY_PREFIX}{fingerprint}", incident_id, ex=ex)
+            await pipe.execute()
+
+            if cls._bloom is not None:
+                for fingerprint in fingerprints:
+                    cls._bloom.add(fingerprint)
+
+            logger.debug("Registered fingerprints", count=len(fingerprints))
+            return True
+
+        except Exception as e:
+            logger.error("Redis error during bulk fingerprint registration", error=str(e))
+            return False
+
     @classmethod
     async def remove_fingerprint(cls, fingerprint: str) -> bool:
         """Remove a fingerprint (e.g., when incident is resolved)."""
         try:
+            cls._recent.discard(fingerprint)
+
             client = await cls.get_redis()
-            key = f"aiops:fingerprint:{fingerprint}"
+            key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
 
             await client.delete(key)
             return True
@@ -126,7 +306,7 @@ class AlertDeduplicator:
         """Extend the TTL of an existing fingerprint."""
         try:
             client = await cls.get_redis()
-            key = f"aiops:fingerprint:{fingerprint}"
+            key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
             ttl = additional_ttl or cls.FINGERPRINT_TTL
 
             # Only extend if key exists
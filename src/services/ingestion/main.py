@@ -2,17 +2,24 @@
 Alert Ingestion Service - FastAPI application for receiving alerts.
 Handles webhooks from Alertmanager, Grafana, and Prometheus.
 """
-import json
+import asyncio
+import time
+from collections.abc import Callable
 from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
 
+import orjson
 import structlog
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from sqlalchemy import TextClause, text
 from starlette.responses import Response
 
-from src.config import settings
+from src.config import configure_logging, settings
 from src.database import check_database_connection, close_database, init_database
 from src.database.neo4j import GraphService, Neo4jConnection
 from src.models import (
@@ -24,6 +31,61 @@ from src.services.ingestion.normalizer import AlertNormalizer
 
 logger = structlog.get_logger()
 
+# Alert batches larger than this are normalized off the event loop
+NORMALIZE_OFFLOAD_THRESHOLD = 32
+
+# Incident batches of at least this size are inserted with COPY
+COPY_INSERT_THRESHOLD = 16
+INCIDENT_COLUMNS = (
+    "id", "fingerprint", "title", "description", "severity", "status",
+    "source", "cluster", "namespace", "service", "labels", "annotations",
+    "started_at", "created_at", "updated_at",
+)
+
+# One statement for the whole batch: each bind is a column array. Incidents
+# whose fingerprint already has a row are skipped (the dedup key can expire
+# while the row remains), and only inserted ids come back.
+INSERT_INCIDENT_SQL = text("""
+    INSERT INTO incidents (id, fingerprint, title, description, severity, status,
+        source, cluster, namespace, service, labels, annotations, started_at, created_at, updated_at)
+    SELECT i.id, i.fingerprint, i.title, i.description, i.severity, i.status,
+        i.source, i.cluster, i.namespace, i.service, CAST(i.labels AS jsonb), CAST(i.annotations AS jsonb),
+        i.started_at, i.created_at, i.updated_at
+    FROM unnest(
+        CAST(:id AS uuid[]), CAST(:fingerprint AS text[]), CAST(:title AS text[]),
+        CAST(:description AS text[]), CAST(:severity AS text[]), CAST(:status AS text[]),
+        CAST(:source AS text[]), CAST(:cluster AS text[]), CAST(:namespace AS text[]),
+        CAST(:service AS text[]), CAST(:labels AS text[]), CAST(:annotations AS text[]),
+        CAST(:started_at AS timestamptz[]), CAST(:created_at AS timestamptz[]),
+        CAST(:updated_at AS timestamptz[])
+    ) AS i(id, fingerprint, title, description, severity, status, source, cluster,
+        namespace, service, labels, annotations, started_at, created_at, updated_at)
+    ON CONFLICT (fingerprint) DO NOTHING
+    RETURNING id
+""")
+# COPY target for large bursts; dropped when the transaction commits
+CREATE_INCIDENT_STAGING_SQL = text("""
+    CREATE TEMP TABLE incidents_staging (LIKE incidents INCLUDING DEFAULTS) ON COMMIT DROP
+""")
+INSERT_STAGED_INCIDENTS_SQL = text("""
+    INSERT INTO incidents (id, fingerprint, title, description, severity, status,
+        source, cluster, namespace, service, labels, annotations, started_at, created_at, updated_at)
+    SELECT id, fingerprint, title, description, severity, status,
+        source, cluster, namespace, service, labels, annotations, started_at, created_at, updated_at
+    FROM incidents_staging
+    ON CONFLICT (fingerprint) DO NOTHING
+    RETURNING id
+""")
+SELECT_INCIDENT_SQL = text("SELECT * FROM incidents WHERE id = :id")
+
+# Rendered /metrics output is reused for this long to absorb scrape bursts
+METRICS_CACHE_SECONDS = 1.0
+_metrics_cache: tuple[float, bytes] = (float("-inf"), b"")
+
+# Temporal client shared by all workflow starts (connected lazily)
+_temporal_client = None
+_temporal_client_lock = asyncio.Lock()
+
 # Prometheus metrics
 ALERTS_RECEIVED = Counter(
     "aiops_alerts_received_total",
@@ -50,6 +112,7 @@ WEBHOOK_LATENCY = Histogram(
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    configure_logging()
     logger.info("Starting AIOps Ingestion Service")
     await init_database()
     await GraphService.init_constraints()
@@ -65,6 +128,7 @@ app = FastAPI(
     description="Production-ready AIOps platform for automated incident detection, RCA, and remediation",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -95,7 +159,7 @@ async def readiness_check():
     all_healthy = all(checks.values())
     status_code = 200 if all_healthy else 503
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={"status": "ready" if all_healthy else "not_ready", "checks": checks},
         status_code=status_code,
     )
@@ -103,9 +167,15 @@ async def readiness_check():
 
 @app.get("/metrics")
 async def metrics():
-    """Prometheus metrics endpoint."""
+    """Prometheus metrics endpoint (rendered output cached briefly between scrapes)."""
+    global _metrics_cache
+
+    now = time.monotonic()
+    if now - _metrics_cache[0] > METRICS_CACHE_SECONDS:
+        _metrics_cache = (now, generate_latest())
+
     return Response(
-        content=generate_latest(),
+        content=_metrics_cache[1],
         media_type=CONTENT_TYPE_LATEST,
     )
 
@@ -136,10 +206,10 @@ async def alertmanager_webhook(
     """
     with WEBHOOK_LATENCY.labels(source="alertmanager").time():
         try:
-            payload = await request.json()
+            payload = await read_json_payload(request)
             logger.info("Received Alertmanager webhook", alert_count=len(payload.get("alerts", [])))
 
-            incidents = []
+            firing = []
 
             for alert in payload.get("alerts", []):
                 if alert.get("status") != "firing":
@@ -148,31 +218,22 @@ async def alertmanager_webhook(
                 # Track metric
                 severity = alert.get("labels", {}).get("severity", "warning")
                 ALERTS_RECEIVED.labels(source="alertmanager", severity=severity).inc()
+                firing.append(alert)
 
-                # Normalize alert to incident
-                incident_data = AlertNormalizer.normalize_alertmanager(alert, payload)
-
-                # Check for duplicates
-                is_duplicate, _ = await AlertDeduplicator.check_duplicate(
-                    incident_data.fingerprint
-                )
+            # Normalize alerts to incidents
+            normalized = await normalize_alerts(AlertNormalizer.normalize_alertmanager, firing, payload)
 
-                if is_duplicate:
-                    ALERTS_DEDUPLICATED.inc()
-                    logger.debug("Alert deduplicated", fingerprint=incident_data.fingerprint)
-                    continue
+            # Check for duplicates in one round-trip
+            to_create = await filter_duplicates(normalized)
 
-                # Create incident
-                incident = await create_incident(incident_data)
-                incidents.append(incident)
+            # Create all incidents in one round-trip
+            incidents = await create_incidents(to_create)
 
+            for incident in incidents:
                 INCIDENTS_CREATED.labels(severity=incident.severity.value).inc()
 
-                # Trigger workflow in background
-                background_tasks.add_task(
-                    trigger_incident_workflow,
-                    incident,
-                )
+            # Trigger workflows in background
+            background_tasks.add_task(trigger_incident_workflows, incidents)
 
             return {
                 "status": "accepted",
@@ -180,6 +241,8 @@ async def alertmanager_webhook(
                 "incident_ids": [str(i.id) for i in incidents],
             }
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("Error processing Alertmanager webhook", error=str(e))
             raise HTTPException(status_code=500, detail=str(e))
@@ -205,13 +268,13 @@ async def grafana_webhook(
     """
     with WEBHOOK_LATENCY.labels(source="grafana").time():
         try:
-            payload = await request.json()
+            payload = await read_json_payload(request)
             logger.info("Received Grafana webhook", status=payload.get("status"))
 
             if payload.get("status") != "firing":
                 return {"status": "ignored", "reason": "not_firing"}
 
-            incidents = []
+            firing = []
 
             for alert in payload.get("alerts", []):
                 if alert.get("status") != "firing":
@@ -219,32 +282,29 @@ async def grafana_webhook(
 
                 severity = alert.get("labels", {}).get("severity", "warning")
                 ALERTS_RECEIVED.labels(source="grafana", severity=severity).inc()
+                firing.append(alert)
 
-                # Normalize
-                incident_data = AlertNormalizer.normalize_grafana(alert, payload)
+            # Normalize
+            normalized = await normalize_alerts(AlertNormalizer.normalize_grafana, firing, payload)
 
-                # Deduplicate
-                is_duplicate, _ = await AlertDeduplicator.check_duplicate(
-                    incident_data.fingerprint
-                )
-
-                if is_duplicate:
-                    ALERTS_DEDUPLICATED.inc()
-                    continue
+            # Deduplicate
+            to_create = await filter_duplicates(normalized)
 
-                # Create incident
-                incident = await create_incident(incident_data)
-                incidents.append(incident)
+            # Create incidents
+            incidents = await create_incidents(to_create)
 
+            for incident in incidents:
                 INCIDENTS_CREATED.labels(severity=incident.severity.value).inc()
 
-                background_tasks.add_task(trigger_incident_workflow, incident)
+            background_tasks.add_task(trigger_incident_workflows, incidents)
 
             return {
                 "status": "accepted",
                 "incidents_created": len(incidents),
             }
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("Error processing Grafana webhook", error=str(e))
             raise HTTPException(status_code=500, detail=str(e))
@@ -269,6 +329,11 @@ async def create_manual_incident(
         )
 
     incident = await create_incident(incident_data)
+    if incident is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Incident with fingerprint already exists",
+        )
     INCIDENTS_CREATED.labels(severity=incident.severity.value).inc()
 
     background_tasks.add_task(trigger_incident_workflow, incident)
@@ -277,77 +342,166 @@ async def create_manual_incident(
 
 
 # Get incident by ID
-@app.get("/api/v1/incidents/{incident_id}")
+@app.get("/api/v1/incidents/{incident_id}", response_class=ORJSONResponse, response_model=None)
 async def get_incident(incident_id: str):
     """Get incident details by ID."""
-    from sqlalchemy import text
-
     from src.database import get_session
 
     async with get_session() as session:
-        result = await session.execute(
-            text("SELECT * FROM incidents WHERE id = :id"),
-            {"id": incident_id}
-        )
+        result = await session.execute(SELECT_INCIDENT_SQL, {"id": incident_id})
         row = result.fetchone()
 
         if not row:
             raise HTTPException(status_code=404, detail="Incident not found")
 
-        return dict(row._mapping)
+        # orjson handles UUID/datetime natively, so skip FastAPI's encoder pass
+        return ORJSONResponse(content=dict(row._mapping))
 
 
 # Get incident evidence graph
-@app.get("/api/v1/incidents/{incident_id}/graph")
+@app.get("/api/v1/incidents/{incident_id}/graph", response_class=ORJSONResponse, response_model=None)
 async def get_incident_graph(incident_id: str, depth: int = 3):
     """Get the evidence graph for an incident."""
     graph = await GraphService.get_incident_graph(incident_id, depth)
-    return graph
+    return ORJSONResponse(content=graph)
 
 
 # List incidents
-@app.get("/api/v1/incidents")
+@app.get("/api/v1/incidents", response_class=ORJSONResponse, response_model=None)
 async def list_incidents(
     status: str = None,
     severity: str = None,
     namespace: str = None,
     limit: int = 50,
-    offset: int = 0,
+    after_started_at: datetime | None = None,
+    after_id: UUID | None = None,
 ):
-    """List incidents with optional filters."""
-    from sqlalchemy import text
+    """
+    List incidents with optional filters, newest first.
 
+    Uses keyset pagination: pass the previous page's ``next_cursor`` values as
+    ``after_started_at``/``after_id`` to fetch the next page.
+    """
     from src.database import get_session
 
-    query = "SELECT * FROM incidents WHERE 1=1"
-    params = {}
+    if (after_started_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_started_at and after_id must be provided together",
+        )
+
+    params = {"limit": limit}
 
     if status:
-        query += " AND status = :status"
         params["status"] = status
     if severity:
-        query += " AND severity = :severity"
         params["severity"] = severity
     if namespace:
-        query += " AND namespace = :namespace"
         params["namespace"] = namespace
+    if after_id is not None:
+        params["after_started_at"] = after_started_at
+        params["after_id"] = after_id
 
-    query += " ORDER BY started_at DESC LIMIT :limit OFFSET :offset"
-    params["limit"] = limit
-    params["offset"] = offset
+    query = _list_incidents_sql(bool(status), bool(severity), bool(namespace), after_id is not None)
 
     async with get_session() as session:
-        result = await session.execute(text(query), params)
-        rows = result.fetchall()
-        return [dict(row._mapping) for row in rows]
+        result = await session.execute(query, params)
+        incidents = [dict(row._mapping) for row in result.fetchall()]
 
+    next_cursor = None
+    if len(incidents) == limit:
+        last = incidents[-1]
+        next_cursor = {"after_started_at": last["started_at"], "after_id": last["id"]}
 
-async def create_incident(incident_data: IncidentCreate) -> Incident:
-    """Create an incident in the database."""
-    from sqlalchemy import text
+    return ORJSONResponse(content={"incidents": incidents, "next_cursor": next_cursor})
 
-    from src.database import get_session
 
+@lru_cache(maxsize=16)
+def _list_incidents_sql(
+    by_status: bool,
+    by_severity: bool,
+    by_namespace: bool,
+    after_cursor: bool,
+) -> TextClause:
+    """Build (once per filter combination) the list_incidents statement."""
+    query = "SELECT * FROM incidents WHERE 1=1"
+
+    if by_status:
+        query += " AND status = :status"
+    if by_severity:
+        query += " AND severity = :severity"
+    if by_namespace:
+        query += " AND namespace = :namespace"
+    if after_cursor:
+        query += " AND (started_at, id) < (:after_started_at, :after_id)"
+
+    query += " ORDER BY started_at DESC, id DESC LIMIT :limit"
+    return text(query)
+
+
+async def read_json_payload(request: Request) -> dict:
+    """
+    Read and parse a webhook body.
+
+    The body is streamed into a single buffer (no list of chunks plus a joined
+    copy) and rejected with 413 as soon as it exceeds the configured limit.
+    """
+    max_bytes = settings.max_webhook_body_bytes
+    body = bytearray()
+
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail="Webhook payload too large")
+
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON payload: {e}")
+
+
+async def normalize_alerts(
+    normalize: Callable[[dict, dict], IncidentCreate],
+    alerts: list[dict],
+    payload: dict,
+) -> list[IncidentCreate]:
+    """
+    Normalize a batch of alerts.
+
+    Large batches are normalized in a worker thread (one hop for the whole
+    batch) so the event loop keeps serving other webhooks meanwhile.
+    """
+    if len(alerts) <= NORMALIZE_OFFLOAD_THRESHOLD:
+        return [normalize(alert, payload) for alert in alerts]
+
+    return await asyncio.to_thread(lambda: [normalize(alert, payload) for alert in alerts])
+
+
+async def filter_duplicates(normalized: list[IncidentCreate]) -> list[IncidentCreate]:
+    """
+    Drop alerts whose fingerprint is already registered or repeated earlier in the batch.
+    """
+    duplicates = await AlertDeduplicator.check_duplicates_bulk(
+        [incident_data.fingerprint for incident_data in normalized]
+    )
+
+    unique = []
+    seen_fingerprints = set()
+
+    for incident_data, (is_duplicate, _) in zip(normalized, duplicates, strict=True):
+        if is_duplicate or incident_data.fingerprint in seen_fingerprints:
+            ALERTS_DEDUPLICATED.inc()
+            logger.debug("Alert deduplicated", fingerprint=incident_data.fingerprint)
+            continue
+
+        seen_fingerprints.add(incident_data.fingerprint)
+        unique.append(incident_data)
+
+    return unique
+
+
+def build_incident(incident_data: IncidentCreate) -> tuple[Incident, dict]:
+    """Build an Incident and its INSERT parameters without touching the database."""
     incident = Incident(
         fingerprint=incident_data.fingerprint,
         title=incident_data.title,
@@ -362,55 +516,125 @@ async def create_incident(incident_data: IncidentCreate) -> Incident:
         started_at=incident_data.started_at,
     )
 
+    params = {
+        "id": incident.id,
+        "fingerprint": incident.fingerprint,
+        "title": incident.title,
+        "description": incident.description,
+        "severity": incident.severity.value,
+        "status": incident.status.value,
+        "source": incident.source.value,
+        "cluster": incident.cluster,
+        "namespace": incident.namespace,
+        "service": incident.service,
+        "labels": orjson.dumps(incident.labels).decode(),
+        "annotations": orjson.dumps(incident.annotations).decode(),
+        "started_at": incident.started_at,
+        "created_at": incident.created_at,
+        "updated_at": incident.updated_at,
+    }
+
+    return incident, params
+
+
+async def create_incidents(incident_data_list: list[IncidentCreate]) -> list[Incident]:
+    """Create incidents in the database with a single batched INSERT."""
+    if not incident_data_list:
+        return []
+
+    from src.database import get_session
+
+    built = [build_incident(incident_data) for incident_data in incident_data_list]
+
     async with get_session() as session:
-        await session.execute(
-            text("""
-                INSERT INTO incidents (id, fingerprint, title, description, severity, status, 
-                    source, cluster, namespace, service, labels, annotations, started_at, created_at, updated_at)
-                VALUES (:id, :fingerprint, :title, :description, :severity, :status,
-                    :source, :cluster, :namespace, :service, :labels, :annotations, :started_at, :created_at, :updated_at)
-            """),
-            {
-                "id": str(incident.id),
-                "fingerprint": incident.fingerprint,
-                "title": incident.title,
-                "description": incident.description,
-                "severity": incident.severity.value,
-                "status": incident.status.value,
-                "source": incident.source.value,
-                "cluster": incident.cluster,
-                "namespace": incident.namespace,
-                "service": incident.service,
-                "labels": json.dumps(incident.labels),
-                "annotations": json.dumps(incident.annotations),
-                "started_at": incident.started_at,
-                "created_at": incident.created_at,
-                "updated_at": incident.updated_at,
-            }
+        if len(built) >= COPY_INSERT_THRESHOLD:
+            # Large bursts: binary COPY through the underlying asyncpg
+            # connection into a constraint-free staging table, since COPY
+            # cannot skip conflicting fingerprints itself
+            await session.execute(CREATE_INCIDENT_STAGING_SQL)
+            conn = await session.connection()
+            raw_conn = await conn.get_raw_connection()
+            await raw_conn.driver_connection.copy_records_to_table(
+                "incidents_staging",
+                records=[
+                    tuple(params[column] for column in INCIDENT_COLUMNS)
+                    for _, params in built
+                ],
+                columns=INCIDENT_COLUMNS,
+            )
+            inserted = await session.execute(INSERT_STAGED_INCIDENTS_SQL)
+            inserted_ids = set(inserted.scalars())
+        else:
+            inserted = await session.execute(INSERT_INCIDENT_SQL, {
+                column: [params[column] for _, params in built]
+                for column in INCIDENT_COLUMNS
+            })
+            inserted_ids = set(inserted.scalars())
+
+    incidents = []
+    for incident, _ in built:
+        if incident.id in inserted_ids:
+            incidents.append(incident)
+        else:
+            ALERTS_DEDUPLICATED.inc()
+            logger.info("Incident already exists", fingerprint=incident.fingerprint)
+
+    if not incidents:
+        return []
+
+    # Nothing mutates an incident between insert and workflow start, so dump once here
+    for incident in incidents:
+        incident._workflow_input = incident.model_dump(mode="json")
+
+    await AlertDeduplicator.register_fingerprints_bulk(
+        {incident.fingerprint: str(incident.id) for incident in incidents}
+    )
+
+    for incident in incidents:
+        logger.info(
+            "Created incident",
+            incident_id=str(incident.id),
+            title=incident.title,
+            severity=incident.severity.value,
         )
 
-    await AlertDeduplicator.register_fingerprint(incident.fingerprint, str(incident.id))
+    return incidents
 
-    logger.info(
-        "Created incident",
-        incident_id=str(incident.id),
-        title=incident.title,
-        severity=incident.severity.value,
-    )
 
-    return incident
+async def create_incident(incident_data: IncidentCreate) -> Incident | None:
+    """Create an incident in the database; None if its fingerprint already exists."""
+    incidents = await create_incidents([incident_data])
+    return incidents[0] if incidents else None
+
+
+async def get_temporal_client():
+    """Get or create the process-wide Temporal client."""
+    global _temporal_client
+
+    if _temporal_client is None:
+        async with _temporal_client_lock:
+            if _temporal_client is None:
+                from temporalio.client import Client
+
+                from src.services.workflow.converter import data_converter
+
+                _temporal_client = await Client.connect(settings.temporal_address, data_converter=data_converter)
+    return _temporal_client
+
+
+async def trigger_incident_workflows(incidents: list[Incident]) -> None:
+    """Trigger incident workflows in Temporal, overlapping the start calls."""
+    await asyncio.gather(*(trigger_incident_workflow(incident) for incident in incidents))
 
 
 async def trigger_incident_workflow(incident: Incident) -> None:
     """Trigger the incident workflow in Temporal."""
     try:
-        from temporalio.client import Client
-
-        client = await Client.connect(settings.temporal_address)
+        client = await get_temporal_client()
 
         await client.start_workflow(
             "IncidentWorkflow",
-            incident.model_dump(mode="json"),
+            incident._workflow_input or incident.model_dump(mode="json"),
             id=f"incident-{incident.id}",
             task_queue=settings.temporal_task_queue,
         )
@@ -3,6 +3,7 @@ Alert normalizer - converts various alert formats to standard Incident schema.
 """
 import hashlib
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
 
 import structlog
@@ -53,8 +54,7 @@ class AlertNormalizer:
         pod = labels.get("pod")
 
         # Determine severity
-        severity_str = labels.get("severity", "warning").lower()
-        severity = cls.SEVERITY_MAP.get(severity_str, IncidentSeverity.MEDIUM)
+        severity = _severity_for(labels.get("severity", "warning"))
 
         # Build title
         if pod:
@@ -68,16 +68,7 @@ class AlertNormalizer:
         description = annotations.get("description") or annotations.get("summary") or ""
 
         # Parse start time
-        starts_at_str = alert.get("startsAt")
-        if starts_at_str:
-            # Handle ISO format with Z suffix
-            starts_at_str = starts_at_str.replace("Z", "+00:00")
-            try:
-                started_at = datetime.fromisoformat(starts_at_str)
-            except ValueError:
-                started_at = datetime.now(UTC)
-        else:
-            started_at = datetime.now(UTC)
+        started_at = _parse_timestamp(alert.get("startsAt")) or datetime.now(UTC)
 
         # Generate fingerprint for deduplication
         fingerprint = cls._generate_fingerprint(
@@ -117,9 +108,14 @@ class AlertNormalizer:
         labels = alert.get("labels", {})
         annotations = alert.get("annotations", {})
 
-        # Merge common labels/annotations
-        labels = {**payload.get("commonLabels", {}), **labels}
-        annotations = {**payload.get("commonAnnotations", {}), **annotations}
+        # Merge common labels/annotations (alert-level values win); skip the
+        # merge allocation entirely when the payload has none
+        common_labels = payload.get("commonLabels")
+        if common_labels:
+            labels = common_labels | labels
+        common_annotations = payload.get("commonAnnotations")
+        if common_annotations:
+            annotations = common_annotations | annotations
 
         # Extract key fields
         alertname = labels.get("alertname") or alert.get("alertname", "Grafana Alert")
@@ -128,23 +124,14 @@ class AlertNormalizer:
         service = labels.get("service") or labels.get("grafana_folder")
 
         # Severity
-        severity_str = labels.get("severity", "warning").lower()
-        severity = cls.SEVERITY_MAP.get(severity_str, IncidentSeverity.MEDIUM)
+        severity = _severity_for(labels.get("severity", "warning"))
 
         # Title and description
         title = annotations.get("summary") or alertname
         description = annotations.get("description", "")
 
         # Start time
-        starts_at_str = alert.get("startsAt")
-        if starts_at_str:
-            starts_at_str = starts_at_str.replace("Z", "+00:00")
-            try:
-                started_at = datetime.fromisoformat(starts_at_str)
-            except ValueError:
-                started_at = datetime.now(UTC)
-        else:
-            started_at = datetime.now(UTC)
+        started_at = _parse_timestamp(alert.get("startsAt")) or datetime.now(UTC)
 
         fingerprint = cls._generate_fingerprint(
             source="grafana",
@@ -181,8 +168,7 @@ class AlertNormalizer:
         cluster = labels.get("cluster", "default-cluster")
         service = labels.get("service") or labels.get("instance")
 
-        severity_str = labels.get("severity", "warning").lower()
-        severity = cls.SEVERITY_MAP.get(severity_str, IncidentSeverity.MEDIUM)
+        severity = _severity_for(labels.get("severity", "warning"))
 
         fingerprint = cls._generate_fingerprint(
             source="prometheus",
@@ -213,6 +199,33 @@ class AlertNormalizer:
         namespace: str,
         service: str,
     ) -> str:
-        """Generate a unique fingerprint for deduplication."""
-        key = f"{source}:{alertname}:{namespace}:{service}"
-        return hashlib.sha256(key.encode()).hexdigest()[:32]
+        """
+        Generate a unique fingerprint for deduplication.
+
+        This is a non-adversarial dedup key, so a 16-byte BLAKE2b digest
+        (32 hex chars, same width as before) is used instead of SHA-256.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(source.encode())
+        for part in (alertname, namespace, service):
+            hasher.update(b":")
+            hasher.update(part.encode())
+        return hasher.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _severity_for(severity_label: str) -> IncidentSeverity:
+    """Map a raw severity label to IncidentSeverity (memoized; labels repeat heavily)."""
+    return AlertNormalizer.SEVERITY_MAP.get(severity_label.lower(), IncidentSeverity.MEDIUM)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str | None) -> datetime | None:
+    """Parse an ISO-8601 alert timestamp, returning None if missing or invalid."""
+    if not value:
+        return None
+    # Python 3.11+ fromisoformat accepts the "Z" suffix natively
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
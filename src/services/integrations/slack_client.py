@@ -1,22 +1,96 @@
 """
 Slack Client for ChatOps approvals.
 """
+import asyncio
 from typing import Any
 
+import orjson
 import structlog
 
 from src.config import settings
 
 logger = structlog.get_logger()
 
+# Static approval message layout; per-request values are appended to the
+# field labels and set on the buttons in _build_approval_blocks
+_APPROVAL_BLOCKS_JSON = orjson.dumps([
+    {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": "🚨 Remediation Approval Required",
+        }
+    },
+    {
+        "type": "section",
+        "fields": [
+            {"type": "mrkdwn", "text": "*Incident:*\n"},
+            {"type": "mrkdwn", "text": "*Severity:*\n"},
+            {"type": "mrkdwn", "text": "*Namespace:*\n"},
+            {"type": "mrkdwn", "text": "*Action:*\n"},
+        ]
+    },
+    {
+        "type": "section",
+        "fields": [
+            {"type": "mrkdwn", "text": "*Blast Radius:*\n"},
+            {"type": "mrkdwn", "text": "*Affected Pods:*\n"},
+        ]
+    },
+    {
+        "type": "actions",
+        "elements": [
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "✅ Approve"},
+                "style": "primary",
+                "action_id": "approve_action",
+                "value": "",
+            },
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "❌ Reject"},
+                "style": "danger",
+                "action_id": "reject_action",
+                "value": "",
+            },
+        ]
+    },
+])
+
 
 class SlackClient:
     """Slack integration for approval workflows."""
 
+    # Shared across instances so approvals reuse pooled TLS connections
+    _web_client = None
+
     def __init__(self):
         self.bot_token = settings.slack_bot_token
         self.channel = settings.slack_approval_channel
 
+    @classmethod
+    async def _get_web_client(cls, token: str):
+        """Get or create the shared Slack web client."""
+        if cls._web_client is None or cls._web_client.token != token:
+            # A rotated token replaces the client; don't leak its session
+            await cls.close()
+
+            import aiohttp
+            from slack_sdk.web.async_client import AsyncWebClient
+
+            # Without an explicit session, AsyncWebClient opens a new aiohttp
+            # session (and TLS handshake) for every API call
+            cls._web_client = AsyncWebClient(token=token, session=aiohttp.ClientSession())
+        return cls._web_client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared Slack client session."""
+        if cls._web_client is not None:
+            await cls._web_client.session.close()
+            cls._web_client = None
+
     async def request_approval(
         self,
         incident: dict,
@@ -29,9 +103,7 @@ class SlackClient:
             return {"approved": False, "reason": "Slack not configured"}
 
         try:
-            from slack_sdk.web.async_client import AsyncWebClient
-
-            client = AsyncWebClient(token=self.bot_token)
+            client = await self._get_web_client(self.bot_token)
 
             blocks = self._build_approval_blocks(incident, action, blast_radius)
 
@@ -65,51 +137,25 @@ class SlackClient:
         action: str,
         blast_radius: dict,
     ) -> list:
-        """Build Slack block kit message."""
-        return [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🚨 Remediation Approval Required",
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Incident:*\n{incident.get('title', 'Unknown')}"},
-                    {"type": "mrkdwn", "text": f"*Severity:*\n{incident.get('severity', 'Unknown')}"},
-                    {"type": "mrkdwn", "text": f"*Namespace:*\n{incident.get('namespace', 'Unknown')}"},
-                    {"type": "mrkdwn", "text": f"*Action:*\n{action}"},
-                ]
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Blast Radius:*\n{blast_radius.get('score', 0):.1f}"},
-                    {"type": "mrkdwn", "text": f"*Affected Pods:*\n{blast_radius.get('affected_pods', 0)}"},
-                ]
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "✅ Approve"},
-                        "style": "primary",
-                        "action_id": "approve_action",
-                        "value": incident.get("id", ""),
-                    },
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "❌ Reject"},
-                        "style": "danger",
-                        "action_id": "reject_action",
-                        "value": incident.get("id", ""),
-                    },
-                ]
-            },
-        ]
+        """Build Slack block kit message from the pre-serialized template."""
+        # orjson.loads gives a fresh deep copy of the static structure in C
+        blocks = orjson.loads(_APPROVAL_BLOCKS_JSON)
+
+        incident_fields = blocks[1]["fields"]
+        incident_fields[0]["text"] += str(incident.get("title", "Unknown"))
+        incident_fields[1]["text"] += str(incident.get("severity", "Unknown"))
+        incident_fields[2]["text"] += str(incident.get("namespace", "Unknown"))
+        incident_fields[3]["text"] += str(action)
+
+        blast_fields = blocks[2]["fields"]
+        blast_fields[0]["text"] += f"{blast_radius.get('score', 0):.1f}"
+        blast_fields[1]["text"] += str(blast_radius.get("affected_pods", 0))
+
+        incident_id = incident.get("id", "")
+        for button in blocks[3]["elements"]:
+            button["value"] = incident_id
+
+        return blocks
 
 
 class JiraClient:
@@ -135,20 +181,24 @@ class JiraClient:
         try:
             from jira import JIRA
 
-            jira = JIRA(
-                server=self.jira_url,
-                basic_auth=(self.user, self.token),
-            )
-
             description = self._build_description(incident, hypotheses, runbook)
 
-            issue = jira.create_issue(
-                project=self.project,
-                summary=f"[Incident] {incident.get('title', 'Unknown Incident')}",
-                description=description,
-                issuetype={"name": "Bug"},
-                priority={"name": self._map_severity(incident.get("severity"))},
-            )
+            # The jira client is blocking (session setup + REST call), so run
+            # it in a worker thread rather than stalling the event loop
+            def create_issue():
+                jira = JIRA(
+                    server=self.jira_url,
+                    basic_auth=(self.user, self.token),
+                )
+                return jira.create_issue(
+                    project=self.project,
+                    summary=f"[Incident] {incident.get('title', 'Unknown Incident')}",
+                    description=description,
+                    issuetype={"name": "Bug"},
+                    priority={"name": self._map_severity(incident.get("severity"))},
+                )
+
+            issue = await asyncio.to_thread(create_issue)
 
             logger.info("Created Jira ticket", key=issue.key)
 
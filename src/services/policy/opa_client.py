@@ -2,24 +2,86 @@
 OPA Policy Client.
 Evaluates remediation policies using Open Policy Agent.
 """
+import asyncio
+import time
 from datetime import UTC, datetime
+from functools import partial
+from hashlib import blake2b
 from typing import Any
 
 import httpx
+import orjson
 import structlog
+from prometheus_client import Counter
 
 from src.config import settings
+from src.services.resilience import CircuitBreaker, TTLCache, send_with_retry
 
 logger = structlog.get_logger()
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# Carries the decision cache key so a caching proxy in front of OPA can share
+# decisions across replicas
+INPUT_HASH_HEADER = "X-Opa-Input-Hash"
+
+OPA_DECISION_CACHE = Counter(
+    "opa_decision_cache_total",
+    "OPA decision cache lookups",
+    ["result"],
+)
+
+
+# (epoch second, hour, is_weekend) for the last second _clock_bucket() saw
+_clock = (0, 0, False)
+
+
+def _clock_bucket() -> tuple[int, bool]:
+    """UTC (hour, is_weekend), recomputed at most once per second."""
+    global _clock
+    now_s = int(time.time())
+    if now_s != _clock[0]:
+        now = datetime.fromtimestamp(now_s, UTC)
+        _clock = (now_s, now.hour, now.weekday() >= 5)
+    return _clock[1], _clock[2]
+
 
 class OPAClient:
     """Client for Open Policy Agent policy evaluation."""
 
+    # Shared across instances so policy checks reuse keep-alive connections
+    _http_client: httpx.AsyncClient | None = None
+    # Denies immediately (fail closed) while OPA is down instead of waiting out timeouts
+    _breaker = CircuitBreaker("opa")
+    # Decisions keyed by the full policy input; the TTL bounds how long a policy
+    # update pushed to OPA takes to be picked up
+    _decisions = TTLCache(
+        max_size=settings.opa_decision_cache_size,
+        ttl_seconds=settings.opa_decision_cache_ttl_seconds,
+    )
+    # Cache key -> decision future of the OPA query currently in flight
+    _inflight: dict[str, asyncio.Task] = {}
+
     def __init__(self):
         self.opa_url = settings.opa_url
         self.policy_path = settings.opa_policy_path
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return cls._http_client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client."""
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+            cls._http_client = None
+
     async def evaluate_remediation(
         self,
         action_type: str,
@@ -39,42 +101,40 @@ class OPAClient:
                 "reason": str
             }
         """
-        now = datetime.now(UTC)
-
+        # Clock and freeze state are evaluated inside OPA; only the action
+        # facts are sent
         input_data = {
             "action_type": action_type,
             "environment": environment,
             "blast_radius_score": blast_radius_score,
             "namespace": namespace,
             "affected_replicas": affected_replicas,
-            "current_hour": now.hour,
-            "is_weekend": now.weekday() >= 5,
-            "freeze_active": False,  # Could be set by config
         }
 
-        try:
-            result = await self._query_opa(input_data)
-
-            allow = result.get("allow", False)
-            requires_approval = result.get("requires_approval", True)
-            deny_reasons = result.get("deny", [])
+        # The body is encoded once and reused for the request. Decisions also
+        # depend on the hour and weekday, so those go into the cache key hash.
+        # Errors raise before put() and are never cached.
+        body = orjson.dumps({"input": input_data})
+        hour, is_weekend = _clock_bucket()
+        cache_key = blake2b(b"%b|%d|%d" % (body, hour, is_weekend), digest_size=16).hexdigest()
 
-            reason = self._build_reason(allow, deny_reasons)
+        try:
+            decision = self._decisions.get(cache_key)
+            if decision is not None:
+                OPA_DECISION_CACHE.labels(result="hit").inc()
+            else:
+                decision = await self._decide(cache_key, body)
 
             logger.info(
                 "Policy evaluation complete",
                 action_type=action_type,
                 environment=environment,
-                allow=allow,
-                requires_approval=requires_approval,
+                allow=decision["allow"],
+                requires_approval=decision["requires_approval"],
             )
 
-            return {
-                "allow": allow,
-                "requires_approval": requires_approval,
-                "deny_reasons": deny_reasons,
-                "reason": reason,
-            }
+            # Callers get their own copy; the cached decision stays untouched
+            return {**decision, "deny_reasons": list(decision["deny_reasons"])}
 
         except Exception as e:
             logger.error("OPA evaluation failed", error=str(e))
@@ -86,6 +146,48 @@ class OPAClient:
                 "reason": f"Policy evaluation error: {e}",
             }
 
+    async def _decide(self, cache_key: str, body: bytes) -> dict[str, Any]:
+        """
+        Query OPA for a cache miss and cache the decision.
+
+        Concurrent misses for the same key share one in-flight query instead
+        of stampeding OPA; they all see its decision or its error. The query
+        runs as its own task, so a cancelled caller never cancels it for the
+        others.
+        """
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            OPA_DECISION_CACHE.labels(result="coalesced").inc()
+        else:
+            OPA_DECISION_CACHE.labels(result="miss").inc()
+            task = asyncio.ensure_future(self._query_and_cache(cache_key, body))
+            self._inflight[cache_key] = task
+            task.add_done_callback(partial(self._query_done, cache_key))
+        return await asyncio.shield(task)
+
+    async def _query_and_cache(self, cache_key: str, body: bytes) -> dict[str, Any]:
+        decision = self._build_decision(await self._query_opa(body, cache_key))
+        self._decisions.put(cache_key, decision)
+        return decision
+
+    @classmethod
+    def _query_done(cls, cache_key: str, task: asyncio.Task) -> None:
+        cls._inflight.pop(cache_key, None)
+        # Mark errors retrieved so a query every caller abandoned doesn't log a warning
+        if not task.cancelled():
+            task.exception()
+
+    def _build_decision(self, result: dict) -> dict[str, Any]:
+        """Turn a raw OPA result into the decision returned to callers (and cached)."""
+        allow = result.get("allow", False)
+        deny_reasons = result.get("deny", [])
+        return {
+            "allow": allow,
+            "requires_approval": result.get("requires_approval", True),
+            "deny_reasons": deny_reasons,
+            "reason": self._build_reason(allow, deny_reasons),
+        }
+
     def _build_reason(self, allow: bool, deny_reasons: list) -> str:
         """Build reason string from policy result."""
         if allow:
@@ -94,25 +196,27 @@ class OPAClient:
             return "; ".join(deny_reasons)
         return "policy denied"
 
-    async def _query_opa(self, input_data: dict) -> dict:
+    async def _query_opa(self, body: bytes, input_hash: str) -> dict:
         """Query OPA for policy decision."""
         url = f"{self.opa_url}{self.policy_path}"
+        headers = {**_JSON_HEADERS, INPUT_HASH_HEADER: input_hash}
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
+        response = await self._breaker.call(
+            send_with_retry,
+            lambda: self._get_http_client().post(
                 url,
-                json={"input": input_data},
-            )
-            response.raise_for_status()
+                headers=headers,
+                content=body,
+            ),
+        )
 
-            data = response.json()
-            return data.get("result", {})
+        data = orjson.loads(response.content)
+        return data.get("result", {})
 
     async def check_health(self) -> bool:
         """Check if OPA is healthy."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.opa_url}/health")
-                return response.status_code == 200
+            response = await self._get_http_client().get(f"{self.opa_url}/health", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
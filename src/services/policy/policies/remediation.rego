@@ -58,25 +58,32 @@ high_risk_actions := {
     "uncordon_node"
 }
 
+# Clock (UTC), evaluated by OPA so callers don't send it
+current_hour := time.clock([time.now_ns(), "UTC"])[0]
+
+is_weekend if {
+    time.weekday([time.now_ns(), "UTC"]) in {"Saturday", "Sunday"}
+}
+
 # Freeze window detection
 in_freeze_window if {
     # Late night freeze (10 PM - 6 AM)
-    input.current_hour >= 22
+    current_hour >= 22
 }
 
 in_freeze_window if {
-    input.current_hour < 6
+    current_hour < 6
 }
 
 in_freeze_window if {
     # Weekend freeze for production
     input.environment == "prod"
-    input.is_weekend == true
+    is_weekend
 }
 
 in_freeze_window if {
-    # Explicit freeze window set
-    input.freeze_active == true
+    # Explicit freeze window, loaded as data.freeze (freeze/data.json or a bundle)
+    data.freeze.active == true
 }
 
 # Blast radius acceptable
@@ -2,11 +2,39 @@
 Hypothesis Ranker.
 Ranks hypotheses by confidence and evidence support.
 """
+from operator import itemgetter
+
 import structlog
 
 logger = structlog.get_logger()
 
 
+# Category priority weights
+CATEGORY_WEIGHTS = {
+    "resource_exhaustion": 1.2,  # OOM is critical
+    "bad_deployment": 1.15,      # Recent deploy is likely cause
+    "configuration_error": 1.1,
+    "infrastructure_issue": 1.05,
+    "dependency_failure": 1.0,
+    "network_issue": 0.95,
+    "scaling_issue": 0.9,
+    "security_issue": 0.85,
+    "external_dependency": 0.8,
+    "data_issue": 0.75,
+    "unknown": 0.5,
+}
+
+# Dense category codes; the rules engine stamps "category_code" on hypotheses
+# so ranking indexes a list instead of hashing the category string
+CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORY_WEIGHTS)}
+UNRECOGNIZED_CATEGORY_CODE = len(CATEGORY_WEIGHTS)
+_WEIGHT_TABLE = [*CATEGORY_WEIGHTS.values(), 1.0]  # unrecognized categories: neutral
+
+# Evidence support boost by support count; counts above the cap get the last entry
+SUPPORT_BOOST_CAP = 5
+_SUPPORT_BOOST = [1.0] + [1 + (n * 0.05) for n in range(1, SUPPORT_BOOST_CAP + 1)]
+
+
 class HypothesisRanker:
     """Ranks and prioritizes RCA hypotheses."""
 
@@ -24,57 +52,38 @@ class HypothesisRanker:
         if not hypotheses:
             return []
 
-        # Category priority weights
-        category_weights = {
-            "resource_exhaustion": 1.2,  # OOM is critical
-            "bad_deployment": 1.15,      # Recent deploy is likely cause
-            "configuration_error": 1.1,
-            "infrastructure_issue": 1.05,
-            "dependency_failure": 1.0,
-            "network_issue": 0.95,
-            "scaling_issue": 0.9,
-            "security_issue": 0.85,
-            "external_dependency": 0.8,
-            "data_issue": 0.75,
-            "unknown": 0.5,
-        }
-
-        ranked = []
+        weights = _WEIGHT_TABLE
+        support_boost = _SUPPORT_BOOST
+        category_code = CATEGORY_CODES.get
 
         for h in hypotheses:
-            # Base score from confidence
-            score = h.get("confidence", 0.5)
+            get = h.get
+            support_count = get("support_count", 0)
 
-            # Apply category weight
-            category = h.get("category", "unknown")
-            category_weight = category_weights.get(category, 1.0)
-            score *= category_weight
+            code = get("category_code")
+            if code is None:
+                code = category_code(get("category", "unknown"), UNRECOGNIZED_CATEGORY_CODE)
 
-            # Boost for evidence support
-            support_count = h.get("support_count", 0)
+            # Confidence x category weight x evidence support boost x signal boost
+            score = get("confidence", 0.5) * weights[code]
             if support_count > 0:
-                score *= 1 + (min(support_count, 5) * 0.05)
-
-            # Boost for signal strength
-            signal_strength = h.get("signal_strength", 0)
-            score *= 1 + (signal_strength * 0.2)
+                score *= support_boost[min(support_count, SUPPORT_BOOST_CAP)]
+            score *= 1 + (get("signal_strength", 0) * 0.2)
 
-            # Store final score
             h["final_score"] = round(score, 4)
-            ranked.append(h)
 
         # Sort by final score descending
-        ranked.sort(key=lambda x: x["final_score"], reverse=True)
+        ranked = sorted(hypotheses, key=itemgetter("final_score"), reverse=True)
 
         # Assign ranks
-        for i, h in enumerate(ranked):
-            h["rank"] = i + 1
+        for i, h in enumerate(ranked, start=1):
+            h["rank"] = i
 
         logger.info(
             "Hypotheses ranked",
             count=len(ranked),
-            top_category=ranked[0].get("category") if ranked else None,
-            top_score=ranked[0].get("final_score") if ranked else None,
+            top_category=ranked[0].get("category"),
+            top_score=ranked[0]["final_score"],
         )
 
         return ranked
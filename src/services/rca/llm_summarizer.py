@@ -2,22 +2,211 @@
 LLM Summarizer for hypothesis enhancement.
 Uses LLM to summarize evidence and enhance hypotheses.
 """
+import asyncio
+import hashlib
 import json
+from collections import OrderedDict
 
 import httpx
+import orjson
 import structlog
+from prometheus_client import Counter
 
 from src.config import settings
+from src.services.resilience import CircuitBreaker, TTLCache, send_with_retry
 
 logger = structlog.get_logger()
 
+_DECODER = json.JSONDecoder()
+
+# Number of top-ranked hypotheses sent to the LLM
+ENHANCE_TOP_N = 3
+
+# Enhancements remembered per (hypothesis, evidence summary) content hash
+ENHANCEMENT_CACHE_SIZE = 1024
+
+# Enhancements remembered per incident pattern: the top hypotheses plus the
+# evidence type counts, so recurring incidents reuse an earlier answer. The
+# reused text names the earlier incident's workloads, so the tier is opt-in
+# (llm_pattern_cache_ttl_seconds)
+PATTERN_CACHE_SIZE = 256
+
+LLM_ENHANCEMENT_CACHE = Counter(
+    "llm_enhancement_cache_total",
+    "LLM hypothesis enhancement cache lookups",
+    ["result"],
+)
+
+# Approximate token budget for the evidence block of a prompt
+EVIDENCE_SUMMARY_MAX_TOKENS = 800
+
+# Output token budget per hypothesis in a reply (a batched reply for N
+# hypotheses gets N times this); the JSON shape routinely fits in ~300 tokens
+LLM_OUTPUT_TOKENS_PER_HYPOTHESIS = 320
+LLM_TEMPERATURE = 0.0
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1/models"
+
+# Request bodies are pre-serialized with orjson and sent as raw content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a Kubernetes incident analyst. Respond only with valid JSON.",
+}
+_GEMINI_GENERATION_CONFIG = {
+    "temperature": LLM_TEMPERATURE,
+    "stopSequences": ["\n\n```"],
+}
+_GEMINI_JSON_GENERATION_CONFIG = {
+    **_GEMINI_GENERATION_CONFIG,
+    "responseMimeType": "application/json",
+}
+# Gemini 1.0 models reject responseMimeType, so they keep free-form output
+_GEMINI_LEGACY_MODEL_PREFIXES = ("gemini-pro", "gemini-1.0")
+
+# Prompt templates, bound to str.format so only the per-call values are filled in.
+# Instructions and evidence come first and the hypotheses last, so prompts for
+# the same incident share a long identical prefix that providers with
+# automatic prompt caching (OpenAI, Gemini) can reuse.
+_SINGLE_PROMPT = """You are a Kubernetes incident analyst. Given the following evidence and hypothesis, provide:
+1. A concise reasoning chain explaining why this hypothesis is likely
+2. Additional investigation steps
+3. Potential alternative explanations
+
+Respond in JSON format:
+{{
+    "reasoning": "Step by step reasoning for this hypothesis",
+    "additional_steps": ["step1", "step2"],
+    "alternatives": ["alternative1", "alternative2"],
+    "enhanced_description": "More detailed description"
+}}
+
+Evidence:
+{evidence_summary}
+
+Hypothesis: {title}
+Category: {category}
+Description: {description}
+Confidence: {confidence}
+""".format
+
+_BATCH_PROMPT = """You are a Kubernetes incident analyst. Given the following evidence, for each hypothesis provide:
+1. A concise reasoning chain explaining why this hypothesis is likely
+2. Additional investigation steps
+3. Potential alternative explanations
+
+Respond in JSON format with one entry per hypothesis, where "id" is the number
+from its [H<id>] marker:
+{{
+    "hypotheses": [
+        {{
+            "id": 1,
+            "reasoning": "Step by step reasoning for this hypothesis",
+            "additional_steps": ["step1", "step2"],
+            "alternatives": ["alternative1", "alternative2"],
+            "enhanced_description": "More detailed description"
+        }}
+    ]
+}}
+
+Evidence:
+{evidence_summary}
+
+Hypotheses:
+{listing}
+""".format
+
+
+def _extract_json(text: str, open_char: str) -> dict | list | None:
+    """
+    Parse the first complete JSON value starting with open_char in text.
+
+    raw_decode stops at the end of that value, so trailing chatter (or a
+    second code block) after it is ignored instead of breaking the parse.
+    """
+    start = text.find(open_char)
+    while start != -1:
+        try:
+            return _DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            start = text.find(open_char, start + 1)
+
+    if text:
+        logger.warning("Failed to parse LLM JSON response")
+    return None
+
+
+def _has_complete_object(text: str) -> bool:
+    """Whether text already holds a complete JSON object (used to stop streaming early)."""
+    start = text.find("{")
+    if start == -1:
+        return False
+    try:
+        _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+def _parse_json(text: str, open_char: str) -> dict | list | None:
+    """Parse a JSON-mode reply, salvaging it from surrounding text if needed."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return _extract_json(text, open_char)
+
 
 class LLMSummarizer:
     """Uses LLM to enhance RCA hypotheses."""
 
+    # Shared across instances so provider calls reuse pooled (HTTP/2) connections
+    _http_client: httpx.AsyncClient | None = None
+    # Fails provider calls fast during an outage instead of waiting out timeouts
+    _breaker = CircuitBreaker("llm")
+    # LRU of enhancements keyed by _enhancement_key
+    _enhancement_cache: OrderedDict[bytes, dict] = OrderedDict()
+    # Serialized enhancements for the top hypotheses keyed by _pattern_key, so
+    # every hit applies its own copy
+    _pattern_cache = TTLCache(
+        max_size=PATTERN_CACHE_SIZE,
+        ttl_seconds=settings.llm_pattern_cache_ttl_seconds,
+    )
+
     def __init__(self):
         self.provider = settings.llm_provider
 
+        # Static per-provider request scaffolding
+        self._openai_headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
+        self._openai_json_headers = {**self._openai_headers, **_JSON_HEADERS}
+        self._gemini_url = f"{GEMINI_API_URL}/{settings.gemini_model}:generateContent"
+        self._gemini_params = {"key": settings.google_api_key}
+        self._gemini_generation_config = (
+            _GEMINI_GENERATION_CONFIG
+            if settings.gemini_model.startswith(_GEMINI_LEGACY_MODEL_PREFIXES)
+            else _GEMINI_JSON_GENERATION_CONFIG
+        )
+        self._ollama_url = f"{settings.ollama_url}/api/generate"
+
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return cls._http_client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client."""
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+            cls._http_client = None
+
     async def enhance_hypotheses(
         self,
         hypotheses: list[dict],
@@ -27,163 +216,308 @@ class LLMSummarizer:
         if not hypotheses:
             return hypotheses
 
+        top = hypotheses[:ENHANCE_TOP_N]
+
+        # A recurring incident (same hypotheses, same evidence mix) reuses the
+        # earlier enhancements without summarizing the evidence at all
+        pattern_key = self._pattern_key(top, evidence)
+        cached_pattern = self._pattern_cache.get(pattern_key)
+        if cached_pattern is not None:
+            LLM_ENHANCEMENT_CACHE.labels(result="pattern_hit").inc()
+            for h, enhanced in zip(top, orjson.loads(cached_pattern)):
+                h.update(enhanced)
+            return hypotheses
+
         # Prepare evidence summary
         evidence_summary = self._summarize_evidence(evidence)
 
-        # Enhance top hypotheses
-        for h in hypotheses[:3]:  # Only enhance top 3
+        # Reuse enhancements for hypotheses already seen with the same evidence
+        evidence_digest = hashlib.blake2b(evidence_summary.encode(), digest_size=16).digest()
+        applied: list[dict | None] = []
+        pending = []
+        keys = []
+        slots = []
+        for slot, h in enumerate(top):
+            key = self._enhancement_key(h, evidence_digest)
+            cached = self._enhancement_cache.get(key)
+            if cached is not None:
+                LLM_ENHANCEMENT_CACHE.labels(result="hit").inc()
+                self._enhancement_cache.move_to_end(key)
+                h.update(cached)
+            else:
+                LLM_ENHANCEMENT_CACHE.labels(result="miss").inc()
+                pending.append(h)
+                keys.append(key)
+                slots.append(slot)
+            applied.append(cached)
+
+        if not pending:
+            self._pattern_cache.put(pattern_key, orjson.dumps(applied))
+            return hypotheses
+
+        # Enhance the rest, in a single batched prompt unless disabled
+        enhanced_by_id = {}
+        if settings.llm_batch_prompting:
             try:
-                enhanced = await self._enhance_single(h, evidence_summary)
-                h.update(enhanced)
+                enhanced_by_id = await self._enhance_batch(pending, evidence_summary)
             except Exception as e:
-                logger.warning("LLM enhancement failed for hypothesis", error=str(e))
+                logger.warning("Batched LLM enhancement failed", error=str(e))
+
+        enhancements = await self._apply_enhancements(pending, enhanced_by_id, evidence_summary)
+        for slot, key, enhanced in zip(slots, keys, enhancements):
+            applied[slot] = enhanced
+            if enhanced:
+                self._enhancement_cache[key] = enhanced
+                if len(self._enhancement_cache) > ENHANCEMENT_CACHE_SIZE:
+                    self._enhancement_cache.popitem(last=False)
+
+        # Only complete answers are reused for the whole pattern
+        if all(applied):
+            self._pattern_cache.put(pattern_key, orjson.dumps(applied))
 
         return hypotheses
 
+    @staticmethod
+    def _enhancement_key(hypothesis: dict, evidence_digest: bytes) -> bytes:
+        """Content hash of the hypothesis fields sent to the LLM plus the evidence."""
+        hasher = hashlib.blake2b(evidence_digest, digest_size=16)
+        for field in ("title", "category", "description", "confidence"):
+            hasher.update(b"|")
+            hasher.update(str(hypothesis.get(field)).encode())
+        return hasher.digest()
+
+    @staticmethod
+    def _pattern_key(top: list[dict], evidence: list[dict]) -> bytes:
+        """Hash of the top hypotheses' identity and the evidence type counts."""
+        hasher = hashlib.blake2b(digest_size=16)
+        for h in top:
+            hasher.update(f"{h.get('title')}|{h.get('category')}\n".encode())
+        type_counts: dict[str, int] = {}
+        for ev in evidence:
+            evidence_type = str(ev.get("evidence_type"))
+            type_counts[evidence_type] = type_counts.get(evidence_type, 0) + 1
+        hasher.update(repr(sorted(type_counts.items())).encode())
+        return hasher.digest()
+
+    async def _apply_enhancements(
+        self,
+        top: list[dict],
+        enhanced_by_id: dict[int, dict],
+        evidence_summary: str,
+    ) -> list[dict | None]:
+        """
+        Merge batched results into hypotheses, re-asking for any that are missing.
+
+        Returns the enhancement applied to each hypothesis, or None if it failed.
+        """
+        enhancements = [enhanced_by_id.get(h_idx) for h_idx in range(1, len(top) + 1)]
+        missing = []
+        for i, (h, enhanced) in enumerate(zip(top, enhancements)):
+            if enhanced is not None:
+                h.update(enhanced)
+            else:
+                missing.append(i)
+
+        if not missing:
+            return enhancements
+
+        # Dedicated prompts for entries the batch missed, issued concurrently
+        results = await asyncio.gather(
+            *(self._enhance_single(top[i], evidence_summary) for i in missing),
+            return_exceptions=True,
+        )
+        for i, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                logger.warning("LLM enhancement failed for hypothesis", error=str(result))
+            else:
+                top[i].update(result)
+                enhancements[i] = result
+
+        return enhancements
+
     def _summarize_evidence(self, evidence: list[dict]) -> str:
-        """Create a text summary of evidence."""
+        """
+        Create a text summary of evidence.
+
+        Strongest signals come first; repeated summaries are dropped and the
+        result is capped at roughly EVIDENCE_SUMMARY_MAX_TOKENS.
+        """
         summaries = []
+        seen = set()
+        budget = EVIDENCE_SUMMARY_MAX_TOKENS
 
-        for ev in evidence[:20]:  # Limit to 20 items
+        for ev in sorted(evidence, key=lambda e: e.get("signal_strength") or 0, reverse=True):
             summary = ev.get("summary", "")
-            if summary:
-                summaries.append(f"- {summary}")
+            if not summary or summary in seen:
+                continue
+            seen.add(summary)
+
+            # ~4 characters per token
+            tokens = len(summary) // 4 + 1
+            if tokens > budget:
+                break
+            budget -= tokens
+            summaries.append(f"- {summary}")
 
         return "\n".join(summaries) if summaries else "No evidence summary available."
 
+    async def _enhance_batch(
+        self,
+        hypotheses: list[dict],
+        evidence_summary: str,
+    ) -> dict[int, dict]:
+        """Enhance several hypotheses with one LLM call, keyed by 1-based index."""
+        prompt = self._build_batch_prompt(hypotheses, evidence_summary)
+        text = await self._complete(prompt, LLM_OUTPUT_TOKENS_PER_HYPOTHESIS * len(hypotheses))
+        return self._parse_batch_response(text, len(hypotheses))
+
+    def _build_batch_prompt(self, hypotheses: list[dict], evidence_summary: str) -> str:
+        """Build one prompt covering every hypothesis, marked [H1]..[HN]."""
+        listing = "\n".join(
+            f"[H{i}] title={h.get('title')} | category={h.get('category')} | "
+            f"confidence={h.get('confidence')} | description={h.get('description')}"
+            for i, h in enumerate(hypotheses, start=1)
+        )
+
+        return _BATCH_PROMPT(evidence_summary=evidence_summary, listing=listing)
+
+    def _parse_batch_response(self, text: str, count: int) -> dict[int, dict]:
+        """Map a batched JSON reply back to 1-based hypothesis ids."""
+        result = _parse_json(text, "{")
+        items = result.get("hypotheses") if isinstance(result, dict) else result
+        if not isinstance(items, list):
+            return {}
+
+        enhanced_by_id = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            h_idx = item.pop("id", None)
+            if isinstance(h_idx, int) and 1 <= h_idx <= count:
+                enhanced_by_id[h_idx] = item
+
+        return enhanced_by_id
+
     async def _enhance_single(
         self,
         hypothesis: dict,
         evidence_summary: str,
     ) -> dict:
         """Enhance a single hypothesis using LLM."""
-        prompt = f"""You are a Kubernetes incident analyst. Given the following hypothesis and evidence, provide:
-1. A concise reasoning chain explaining why this hypothesis is likely
-2. Additional investigation steps
-3. Potential alternative explanations
-
-Hypothesis: {hypothesis.get('title')}
-Category: {hypothesis.get('category')}
-Description: {hypothesis.get('description')}
-Confidence: {hypothesis.get('confidence')}
-
-Evidence:
-{evidence_summary}
-
-Respond in JSON format:
-{{
-    "reasoning": "Step by step reasoning for this hypothesis",
-    "additional_steps": ["step1", "step2"],
-    "alternatives": ["alternative1", "alternative2"],
-    "enhanced_description": "More detailed description"
-}}
-"""
-
+        prompt = _SINGLE_PROMPT(
+            title=hypothesis.get("title"),
+            category=hypothesis.get("category"),
+            description=hypothesis.get("description"),
+            confidence=hypothesis.get("confidence"),
+            evidence_summary=evidence_summary,
+        )
+
+        result = _parse_json(await self._complete(prompt, LLM_OUTPUT_TOKENS_PER_HYPOTHESIS), "{")
+        return result if isinstance(result, dict) else {}
+
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Send a prompt to the configured provider and return the raw text."""
         if self.provider == "gemini":
-            return await self._call_gemini(prompt)
+            return await self._breaker.call(self._call_gemini, prompt, max_tokens)
         elif self.provider == "openai":
-            return await self._call_openai(prompt)
+            return await self._breaker.call(self._call_openai, prompt, max_tokens)
         elif self.provider == "ollama":
-            return await self._call_ollama(prompt)
+            return await self._breaker.call(self._call_ollama, prompt, max_tokens)
         else:
-            return {}
+            return ""
 
-    async def _call_gemini(self, prompt: str) -> dict:
+    async def _call_gemini(self, prompt: str, max_tokens: int) -> str:
         """Call Google Gemini API."""
         if not settings.google_api_key:
-            return {}
-
-        url = f"https://generativelanguage.googleapis.com/v1/models/{settings.gemini_model}:generateContent"
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                url,
-                params={"key": settings.google_api_key},
-                json={
+            return ""
+
+        response = await send_with_retry(
+            lambda: self._get_http_client().post(
+                self._gemini_url,
+                params=self._gemini_params,
+                headers=_JSON_HEADERS,
+                content=orjson.dumps({
                     "contents": [{"parts": [{"text": prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.3,
-                        "maxOutputTokens": 1000,
-                    }
-                },
+                    "generationConfig": {**self._gemini_generation_config, "maxOutputTokens": max_tokens},
+                }),
             )
-            response.raise_for_status()
-
-            data = response.json()
-            text = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-
-            # Parse JSON from response
-            try:
-                # Find JSON in response
-                start = text.find("{")
-                end = text.rfind("}") + 1
-                if start != -1 and end > start:
-                    return json.loads(text[start:end])
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse LLM JSON response")
+        )
 
-            return {}
+        data = orjson.loads(response.content)
+        candidate = data.get("candidates", [{}])[0]
+        if candidate.get("finishReason") == "MAX_TOKENS":
+            logger.warning("Gemini reply truncated at output token cap", max_tokens=max_tokens)
+        return candidate.get("content", {}).get("parts", [{}])[0].get("text", "")
 
-    async def _call_openai(self, prompt: str) -> dict:
+    async def _call_openai(self, prompt: str, max_tokens: int) -> str:
         """Call OpenAI API."""
         if not settings.openai_api_key:
-            return {}
+            return ""
 
-        url = "https://api.openai.com/v1/chat/completions"
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                url,
-                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
-                json={
-                    "model": settings.openai_model,
-                    "messages": [
-                        {"role": "system", "content": "You are a Kubernetes incident analyst. Respond only with valid JSON."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 1000,
-                },
+        response = await send_with_retry(
+            lambda: self._get_http_client().post(
+                f"{OPENAI_API_URL}/chat/completions",
+                headers=self._openai_json_headers,
+                content=orjson.dumps(self._openai_body(prompt, max_tokens)),
             )
+        )
+
+        data = orjson.loads(response.content)
+        usage = data.get("usage") or {}
+        logger.debug(
+            "OpenAI completion",
+            prompt_tokens=usage.get("prompt_tokens"),
+            cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+        )
+        choice = data.get("choices", [{}])[0]
+        if choice.get("finish_reason") == "length":
+            logger.warning("OpenAI reply truncated at output token cap", max_tokens=max_tokens)
+        return choice.get("message", {}).get("content", "")
+
+    def _openai_body(self, prompt: str, max_tokens: int) -> dict:
+        """Chat completion request body."""
+        return {
+            "model": settings.openai_model,
+            "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            "temperature": LLM_TEMPERATURE,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"},
+        }
+
+    async def _call_ollama(self, prompt: str, max_tokens: int) -> str:
+        """
+        Call Ollama local LLM.
+
+        The reply is streamed and the connection dropped as soon as a complete
+        JSON object has arrived, so Ollama stops generating any trailing text.
+        """
+        body = orjson.dumps({
+            "model": settings.ollama_model,
+            "prompt": prompt,
+            "stream": True,
+            "format": "json",
+            "options": {"num_predict": max_tokens, "temperature": LLM_TEMPERATURE},
+        })
+
+        parts = []
+        async with self._get_http_client().stream(
+            "POST",
+            self._ollama_url,
+            headers=_JSON_HEADERS,
+            content=body,
+            timeout=60.0,
+        ) as response:
             response.raise_for_status()
 
-            data = response.json()
-            text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-
-            try:
-                start = text.find("{")
-                end = text.rfind("}") + 1
-                if start != -1 and end > start:
-                    return json.loads(text[start:end])
-            except json.JSONDecodeError:
-                pass
-
-            return {}
-
-    async def _call_ollama(self, prompt: str) -> dict:
-        """Call Ollama local LLM."""
-        url = f"{settings.ollama_url}/api/generate"
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                url,
-                json={
-                    "model": settings.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            text = data.get("response", "")
-
-            try:
-                start = text.find("{")
-                end = text.rfind("}") + 1
-                if start != -1 and end > start:
-                    return json.loads(text[start:end])
-            except json.JSONDecodeError:
-                pass
-
-            return {}
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                piece = chunk.get("response", "")
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+                if "}" in piece and _has_complete_object("".join(parts)):
+                    break
+
+        return "".join(parts)
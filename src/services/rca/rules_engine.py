@@ -2,15 +2,24 @@
 Rules Engine for deterministic RCA hypothesis generation.
 Matches evidence patterns to known issue patterns.
 """
+import heapq
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import NamedTuple
 from uuid import uuid4
 
 import structlog
 
 from src.models import HypothesisCategory, HypothesisSource, Incident
+from src.services.rca.hypothesis_ranker import CATEGORY_CODES, UNRECOGNIZED_CATEGORY_CODE
 
 logger = structlog.get_logger()
 
 
+# Evidence ids kept per incident and cited by each hypothesis
+MAX_SUPPORTING_EVIDENCE = 5
+
 # Diagnosis rules - patterns that map to hypotheses
 DIAGNOSIS_RULES = [
     {
@@ -190,20 +199,295 @@ DIAGNOSIS_RULES = [
 ]
 
 
+
+# Condition checks, keyed by condition type. Each takes (signals, condition)
+# and returns whether the condition holds.
+CONDITION_CHECKS: dict[str, tuple[Callable[[dict, dict], bool], float]] = {
+    "waiting_reason": (
+        lambda signals, condition: not signals["waiting_reasons"].isdisjoint(condition["values"]),
+        0.9,
+    ),
+    "terminated_reason": (
+        lambda signals, condition: not signals["terminated_reasons"].isdisjoint(condition["values"]),
+        0.9,
+    ),
+    "recent_deploy": (lambda signals, condition: signals["has_recent_deploy"], 0.8),
+    "no_recent_deploy": (lambda signals, condition: not signals["has_recent_deploy"], 0.6),
+    "memory_usage_high": (lambda signals, condition: signals["memory_usage_high"], 0.85),
+    "hpa_at_max": (lambda signals, condition: signals["hpa_at_max"], 0.75),
+    "latency_high": (lambda signals, condition: signals["latency_high"], 0.7),
+    "log_pattern": (
+        lambda signals, condition: not signals["log_patterns"].isdisjoint(condition["patterns"]),
+        0.65,
+    ),
+    "node_unhealthy": (lambda signals, condition: bool(signals["node_issues"]), 0.8),
+    "multiple_pods_same_node": (
+        lambda signals, condition: signals["max_pods_per_node"] >= condition.get("threshold", 2),
+        0.75,
+    ),
+    "pod_not_ready": (lambda signals, condition: signals["not_ready_pods"] > 0, 0.6),
+    "readiness_probe_failing": (lambda signals, condition: signals["readiness_probe_failures"] > 0, 0.75),
+    "network_errors_high": (
+        lambda signals, condition: signals["error_count"] >= condition.get("threshold", 10)
+        and "network" in signals["log_patterns"],
+        0.7,
+    ),
+}
+
+
+# Evaluation order within a rule: selective, cheap checks first so a rule
+# that can't match is rejected early; unlisted types go last
+CONDITION_PRIORITY = (
+    "terminated_reason",
+    "waiting_reason",
+    "memory_usage_high",
+    "hpa_at_max",
+    "readiness_probe_failing",
+    "node_unhealthy",
+    "recent_deploy",
+    "no_recent_deploy",
+    "latency_high",
+    "pod_not_ready",
+    "log_pattern",
+    "network_errors_high",
+    "multiple_pods_same_node",
+)
+_CONDITION_RANK = {cond_type: i for i, cond_type in enumerate(CONDITION_PRIORITY)}
+
+
+def _never_matches(signals: dict, condition: dict) -> bool:
+    return False
+
+
+def calculate_confidence(base_confidence: float, match_count: int, evidence_strength: float) -> float:
+    """Calculate final confidence score."""
+    confidence = base_confidence * 0.6 + evidence_strength * 0.4
+
+    if match_count > 2:
+        confidence = min(confidence * 1.1, 0.99)
+
+    return round(confidence, 3)
+
+
+# Enum values stamped onto every hypothesis, resolved once
+RULES_ENGINE_SOURCE = HypothesisSource.RULES_ENGINE.value
+UNKNOWN_CATEGORY = HypothesisCategory.UNKNOWN.value
+UNKNOWN_CATEGORY_CODE = CATEGORY_CODES[UNKNOWN_CATEGORY]
+
+
+class CompiledRule(NamedTuple):
+    """
+    A diagnosis rule with its conditions resolved to (check, condition, strength).
+
+    A rule only matches when every condition holds, so its evidence strength
+    and confidence are fixed; hypothesis_template holds every hypothesis
+    field except the per-incident id, incident_id and evidence ids.
+    """
+    id: str
+    name: str
+    category: str
+    category_code: int
+    description: str
+    confidence_base: float
+    actions: list[str]
+    conditions: tuple[tuple[Callable[[dict, dict], bool], dict, float], ...]
+    hypothesis_template: dict
+
+
+# Set-valued condition types: condition key holding the values, signals key
+# holding what was observed
+_INDEXED_CONDITIONS = {
+    "waiting_reason": ("values", "waiting_reasons"),
+    "terminated_reason": ("values", "terminated_reasons"),
+    "log_pattern": ("patterns", "log_patterns"),
+}
+
+
+def compile_rules(rules: list[dict]) -> tuple[CompiledRule, ...]:
+    """Resolve each rule's condition types to their check functions once."""
+    compiled = []
+    for rule in rules:
+        conditions = []
+        ordered = sorted(
+            rule["conditions"],
+            key=lambda c: _CONDITION_RANK.get(c["type"], len(CONDITION_PRIORITY)),
+        )
+        for condition in ordered:
+            # Unknown condition types can never match, as before
+            check, strength = CONDITION_CHECKS.get(condition["type"], (_never_matches, 0.0))
+            indexed = _INDEXED_CONDITIONS.get(condition["type"])
+            if indexed is not None:
+                # Freeze set-valued conditions once so checks don't build a set per call
+                values_key = indexed[0]
+                condition = {**condition, values_key: frozenset(condition.get(values_key, ()))}
+            conditions.append((check, condition, strength))
+
+        category = rule["category"].value
+        category_code = CATEGORY_CODES.get(category, UNRECOGNIZED_CATEGORY_CODE)
+        evidence_strength = sum(strength for _, _, strength in conditions) / len(conditions) if conditions else 0.0
+        compiled.append(CompiledRule(
+            id=rule["id"],
+            name=rule["name"],
+            category=category,
+            category_code=category_code,
+            description=rule["description"],
+            confidence_base=rule["confidence_base"],
+            actions=rule["actions"],
+            conditions=tuple(conditions),
+            hypothesis_template={
+                "id": None,
+                "incident_id": None,
+                "category": category,
+                "category_code": category_code,
+                "title": rule["name"],
+                "description": rule["description"],
+                "confidence": calculate_confidence(rule["confidence_base"], len(conditions), evidence_strength),
+                "rank": 0,
+                "supporting_evidence_ids": None,
+                "recommended_actions": rule["actions"],
+                "generated_by": RULES_ENGINE_SOURCE,
+                "rule_id": rule["id"],
+                "support_count": len(conditions),
+                "signal_strength": evidence_strength,
+            },
+        ))
+    return tuple(compiled)
+
+
+COMPILED_RULES = compile_rules(DIAGNOSIS_RULES)
+
+def build_rule_index(rules: tuple[CompiledRule, ...]) -> tuple[dict[tuple[str, str], list[int]], list[int]]:
+    """
+    Inverted index from observed signal values to the rules that need them.
+
+    A rule whose first (most selective) condition is set-valued can only match
+    when one of that condition's values was observed, so it is registered under
+    each (signals key, value). Other rules are always candidates.
+    """
+    index: dict[tuple[str, str], list[int]] = {}
+    always = []
+    for rule_idx, rule in enumerate(rules):
+        condition = rule.conditions[0][1] if rule.conditions else {}
+        indexed = _INDEXED_CONDITIONS.get(condition.get("type"))
+        if indexed is None:
+            always.append(rule_idx)
+            continue
+
+        values_key, signals_key = indexed
+        for value in condition.get(values_key, []):
+            index.setdefault((signals_key, value), []).append(rule_idx)
+    return index, always
+
+
+RULE_INDEX, ALWAYS_CANDIDATE_RULES = build_rule_index(COMPILED_RULES)
+
+def candidate_rule_indices(signals: dict) -> list[int]:
+    """Indices of rules that can possibly match, in rule order, via RULE_INDEX."""
+    candidates = set(ALWAYS_CANDIDATE_RULES)
+    for _, signals_key in _INDEXED_CONDITIONS.values():
+        for value in signals[signals_key]:
+            candidates.update(RULE_INDEX.get((signals_key, value), ()))
+    return sorted(candidates)
+
+
+def rule_strength(rule: CompiledRule, signals: dict) -> float | None:
+    """Average condition strength if every condition of the rule holds, else None."""
+    if not rule.conditions:
+        return None
+
+    evidence_strength = 0.0
+    for check, condition, strength in rule.conditions:
+        if not check(signals, condition):
+            return None
+        evidence_strength += strength
+
+    return evidence_strength / len(rule.conditions)
+
+
+def _thresholds(cond_type: str, default: int) -> tuple[int, ...]:
+    """Every threshold the rules compare a count against, ascending, led by 0."""
+    return tuple(sorted({0} | {
+        c.get("threshold", default) for rule in DIAGNOSIS_RULES for c in rule["conditions"] if c["type"] == cond_type
+    }))
+
+
+def quantize(count: int, thresholds: tuple[int, ...]) -> int:
+    """Largest threshold not above count; checks see the same result as for count."""
+    return thresholds[bisect_right(thresholds, count) - 1] if count > 0 else 0
+
+
+# Everything the condition checks read, in signal-key order. Counts are
+# quantized to the thresholds rules actually compare them against, so the
+# key space is small and incidents that only differ between two thresholds
+# (101 vs 102 errors) share a key.
+SIGNAL_KEY_FIELDS = (
+    "waiting_reasons",
+    "terminated_reasons",
+    "log_patterns",
+    "has_recent_deploy",
+    "memory_usage_high",
+    "hpa_at_max",
+    "latency_high",
+    "node_issues",
+    "max_pods_per_node",
+    "not_ready_pods",
+    "readiness_probe_failures",
+    "error_count",
+)
+_PODS_PER_NODE_THRESHOLDS = _thresholds("multiple_pods_same_node", 2)
+_ERROR_COUNT_THRESHOLDS = _thresholds("network_errors_high", 10)
+
+
+def signal_key(signals: dict) -> tuple:
+    """Hashable digest of the signals that rule matching depends on."""
+    return (
+        frozenset(signals["waiting_reasons"]),
+        frozenset(signals["terminated_reasons"]),
+        frozenset(signals["log_patterns"]),
+        signals["has_recent_deploy"],
+        signals["memory_usage_high"],
+        signals["hpa_at_max"],
+        signals["latency_high"],
+        bool(signals["node_issues"]),
+        quantize(signals["max_pods_per_node"], _PODS_PER_NODE_THRESHOLDS),
+        min(signals["not_ready_pods"], 1),
+        min(signals["readiness_probe_failures"], 1),
+        quantize(signals["error_count"], _ERROR_COUNT_THRESHOLDS),
+    )
+
+
+def _rule_confidence(rule: CompiledRule) -> float:
+    return rule.hypothesis_template["confidence"]
+
+
+@lru_cache(maxsize=1024)
+def match_signal_key(key: tuple) -> tuple[int, ...]:
+    """Indices of the rules matching the signal key, in rule order."""
+    signals = dict(zip(SIGNAL_KEY_FIELDS, key))
+    return tuple(
+        rule_idx
+        for rule_idx in candidate_rule_indices(signals)
+        if rule_strength(COMPILED_RULES[rule_idx], signals) is not None
+    )
+
+
 class RulesEngine:
     """Deterministic rules engine for RCA hypothesis generation."""
 
     def __init__(self):
-        self.rules = DIAGNOSIS_RULES
+        self.rules = COMPILED_RULES
 
     async def generate_hypotheses(
         self,
         incident: Incident,
-        evidence: list[dict],
+        evidence: Iterable[dict],
+        top_k: int | None = None,
     ) -> list[dict]:
-        """Generate hypotheses by matching evidence against rules."""
-        hypotheses = []
+        """Generate hypotheses by matching evidence against rules.
 
+        Evidence is consumed in a single pass, so a generator works too.
+        With top_k, only the k most confident hypotheses are built.
+        """
         signals = self._extract_signals(evidence)
 
         logger.debug(
@@ -212,20 +496,27 @@ class RulesEngine:
             signals=list(signals.keys()),
         )
 
-        for rule in self.rules:
-            match_result = self._match_rule(rule, signals)
+        # Matching is deterministic in the signals, so it is memoized per
+        # signal key; only the hypothesis dicts are built per incident
+        matched = [self.rules[rule_idx] for rule_idx in match_signal_key(signal_key(signals))]
 
-            if match_result["matched"]:
-                hypothesis = self._create_hypothesis(incident, rule, match_result)
-                hypotheses.append(hypothesis)
+        # Confidence is fixed per rule, so rules are ranked before any
+        # hypothesis dict exists; both orderings are stable on rule order
+        if top_k is None:
+            matched.sort(key=_rule_confidence, reverse=True)
+        else:
+            matched = heapq.nlargest(top_k, matched, key=_rule_confidence)
 
-                logger.info(
-                    "Rule matched",
-                    rule_id=rule["id"],
-                    confidence=hypothesis["confidence"],
-                )
+        hypotheses = []
+        for rule in matched:
+            hypothesis = self._create_hypothesis(incident, rule, signals["evidence_ids"])
+            hypotheses.append(hypothesis)
 
-        hypotheses.sort(key=lambda x: x["confidence"], reverse=True)
+            logger.info(
+                "Rule matched",
+                rule_id=rule.id,
+                confidence=hypothesis["confidence"],
+            )
 
         if not hypotheses:
             hypotheses.append(self._create_unknown_hypothesis(incident, signals))
@@ -235,39 +526,25 @@ class RulesEngine:
     def _create_hypothesis(
         self,
         incident: Incident,
-        rule: dict,
-        match_result: dict
+        rule: CompiledRule,
+        evidence_ids: list,
     ) -> dict:
-        """Create a hypothesis from a matched rule."""
-        confidence = self._calculate_confidence(
-            rule["confidence_base"],
-            match_result["match_count"],
-            match_result["evidence_strength"],
-        )
-
-        return {
-            "id": str(uuid4()),
-            "incident_id": str(incident.id),
-            "category": rule["category"].value,
-            "title": rule["name"],
-            "description": rule["description"],
-            "confidence": confidence,
-            "rank": 0,
-            "supporting_evidence_ids": match_result["evidence_ids"],
-            "recommended_actions": rule["actions"],
-            "generated_by": HypothesisSource.RULES_ENGINE.value,
-            "rule_id": rule["id"],
-            "support_count": match_result["match_count"],
-            "signal_strength": match_result["evidence_strength"],
-        }
-
-    def _extract_signals(self, evidence: list[dict]) -> dict:
+        """Create a hypothesis from a matched rule's precomputed template."""
+        hypothesis = rule.hypothesis_template.copy()
+        hypothesis["id"] = str(uuid4())
+        hypothesis["incident_id"] = str(incident.id)
+        hypothesis["supporting_evidence_ids"] = evidence_ids
+        return hypothesis
+
+    def _extract_signals(self, evidence: Iterable[dict]) -> dict:
         """Extract signals from evidence for rule matching."""
         signals = self._init_signals()
 
         for ev in evidence:
             self._process_evidence_item(ev, signals)
 
+        signals["max_pods_per_node"] = max(signals["pods_by_node"].values(), default=0)
+
         return signals
 
     def _init_signals(self) -> dict:
@@ -287,6 +564,7 @@ class RulesEngine:
             "latency_high": False,
             "evidence_ids": [],
             "pods_by_node": {},
+            "max_pods_per_node": 0,
             "not_ready_pods": 0,
             "readiness_probe_failures": 0,
         }
@@ -297,22 +575,16 @@ class RulesEngine:
         ev_type = ev.get("evidence_type")
         data = ev.get("data", {})
 
-        signals["evidence_ids"].append(ev_id)
+        # Hypotheses only cite the first few evidence items
+        if len(signals["evidence_ids"]) < MAX_SUPPORTING_EVIDENCE:
+            signals["evidence_ids"].append(ev_id)
 
-        processors = {
-            "kubernetes_pod": self._process_pod_evidence,
-            "deploy_change": self._process_deploy_evidence,
-            "image_change": self._process_image_evidence,
-            "log_signal": self._process_log_evidence,
-            "metric_signal": self._process_metric_evidence,
-            "kubernetes_node": self._process_node_evidence,
-        }
-
-        processor = processors.get(ev_type)
+        processor = self._EVIDENCE_PROCESSORS.get(ev_type)
         if processor:
             processor(data, signals)
 
-    def _process_pod_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_pod_evidence(data: dict, signals: dict) -> None:
         """Process pod evidence."""
         if data.get("waiting_reason"):
             signals["waiting_reasons"].add(data["waiting_reason"])
@@ -337,23 +609,27 @@ class RulesEngine:
             if ready_condition.get("reason") == "ContainersNotReady":
                 signals["readiness_probe_failures"] += 1
 
-    def _process_deploy_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_deploy_evidence(data: dict, signals: dict) -> None:
         """Process deploy change evidence."""
         if data.get("is_recent_change"):
             signals["has_recent_deploy"] = True
 
-    def _process_image_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_image_evidence(data: dict, signals: dict) -> None:
         """Process image change evidence."""
         if data.get("image_changed"):
             signals["has_image_change"] = True
 
-    def _process_log_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_log_evidence(data: dict, signals: dict) -> None:
         """Process log signal evidence."""
         for pattern in data.get("patterns_found", []):
             signals["log_patterns"].add(pattern)
         signals["error_count"] += data.get("error_count", 0)
 
-    def _process_metric_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_metric_evidence(data: dict, signals: dict) -> None:
         """Process metric signal evidence."""
         query_name = data.get("query_name", "")
 
@@ -368,110 +644,43 @@ class RulesEngine:
         if "latency" in query_name and data.get("current_value", 0) > 1:
             signals["latency_high"] = True
 
-    def _process_node_evidence(self, data: dict, signals: dict) -> None:
+    @staticmethod
+    def _process_node_evidence(data: dict, signals: dict) -> None:
         """Process node evidence."""
         node_name = data.get("name")
         ready_status = data.get("conditions", {}).get("Ready", {}).get("status")
         if ready_status != "True":
             signals["node_issues"][node_name] = data.get("conditions", {})
 
-    def _match_rule(self, rule: dict, signals: dict) -> dict:
-        """Check if a rule matches the current signals."""
-        matched_conditions = 0
-        total_conditions = len(rule["conditions"])
-        evidence_strength = 0.0
-
-        for condition in rule["conditions"]:
-            result = self._check_condition(condition, signals)
-            if result["matched"]:
-                matched_conditions += 1
-                evidence_strength += result["strength"]
-
-        matched = matched_conditions == total_conditions and total_conditions > 0
-
-        return {
-            "matched": matched,
-            "match_count": matched_conditions,
-            "evidence_ids": signals["evidence_ids"][:5],
-            "evidence_strength": evidence_strength / max(total_conditions, 1),
-        }
-
-    def _check_condition(self, condition: dict, signals: dict) -> dict:
-        """Check a single condition against signals."""
-        cond_type = condition["type"]
-
-        checks = {
-            "waiting_reason": (
-                lambda: bool(signals["waiting_reasons"] & set(condition.get("values", []))),
-                0.9
-            ),
-            "terminated_reason": (
-                lambda: bool(signals["terminated_reasons"] & set(condition.get("values", []))),
-                0.9
-            ),
-            "recent_deploy": (lambda: signals["has_recent_deploy"], 0.8),
-            "no_recent_deploy": (lambda: not signals["has_recent_deploy"], 0.6),
-            "memory_usage_high": (lambda: signals["memory_usage_high"], 0.85),
-            "hpa_at_max": (lambda: signals["hpa_at_max"], 0.75),
-            "latency_high": (lambda: signals["latency_high"], 0.7),
-            "log_pattern": (
-                lambda: bool(signals["log_patterns"] & set(condition.get("patterns", []))),
-                0.65
-            ),
-            "node_unhealthy": (lambda: bool(signals["node_issues"]), 0.8),
-            "multiple_pods_same_node": (
-                lambda: bool(signals["pods_by_node"])
-                and max(signals["pods_by_node"].values()) >= condition.get("threshold", 2),
-                0.75
-            ),
-            "pod_not_ready": (lambda: signals["not_ready_pods"] > 0, 0.6),
-            "readiness_probe_failing": (lambda: signals["readiness_probe_failures"] > 0, 0.75),
-            "network_errors_high": (
-                lambda: signals["error_count"] >= condition.get("threshold", 10)
-                and "network" in signals["log_patterns"],
-                0.7
-            ),
-        }
-
-        if cond_type in checks:
-            check_fn, strength = checks[cond_type]
-            if check_fn():
-                return {"matched": True, "strength": strength}
-
-        return {"matched": False, "strength": 0.0}
-
-    def _calculate_confidence(
-        self,
-        base_confidence: float,
-        match_count: int,
-        evidence_strength: float,
-    ) -> float:
-        """Calculate final confidence score."""
-        confidence = base_confidence * 0.6 + evidence_strength * 0.4
-
-        if match_count > 2:
-            confidence = min(confidence * 1.1, 0.99)
-
-        return round(confidence, 3)
+    # Evidence type -> signal processor, built once with the class
+    _EVIDENCE_PROCESSORS = {
+        "kubernetes_pod": _process_pod_evidence,
+        "deploy_change": _process_deploy_evidence,
+        "image_change": _process_image_evidence,
+        "log_signal": _process_log_evidence,
+        "metric_signal": _process_metric_evidence,
+        "kubernetes_node": _process_node_evidence,
+    }
 
     def _create_unknown_hypothesis(self, incident: Incident, signals: dict) -> dict:
         """Create a hypothesis when no rules match."""
         return {
             "id": str(uuid4()),
             "incident_id": str(incident.id),
-            "category": HypothesisCategory.UNKNOWN.value,
+            "category": UNKNOWN_CATEGORY,
+            "category_code": UNKNOWN_CATEGORY_CODE,
             "title": "Unknown Issue",
             "description": "No specific pattern matched. Manual investigation required.",
             "confidence": 0.3,
             "rank": 1,
-            "supporting_evidence_ids": signals["evidence_ids"][:5],
+            "supporting_evidence_ids": signals["evidence_ids"],
             "recommended_actions": [
                 "Review application logs",
                 "Check recent deployments",
                 "Verify external dependencies",
                 "Escalate to engineering team",
             ],
-            "generated_by": HypothesisSource.RULES_ENGINE.value,
+            "generated_by": RULES_ENGINE_SOURCE,
             "rule_id": "unknown",
             "support_count": 0,
             "signal_strength": 0.0,
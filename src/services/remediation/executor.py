@@ -2,45 +2,61 @@
 Remediation Executor.
 Executes approved remediation actions against Kubernetes.
 """
+import asyncio
+import heapq
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import partial
+from operator import itemgetter
 from typing import Any
 
 import structlog
-from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
-from src.config import settings
 from src.models import ActionType, Incident
+from src.services.remediation.kube import get_kube_clients
 
 logger = structlog.get_logger()
 
 # Constants
 ERROR_NO_DEPLOYMENT_NAME = "No deployment name specified"
+RESTARTED_AT_ANNOTATION = "kubectl.kubernetes.io/restartedAt"
+REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+K8S_API_MAX_WORKERS = 8
+
+
+def restart_patch(restarted_at: str) -> dict:
+    """Rollout-restart patch: only the restartedAt pod template annotation varies."""
+    return {"spec": {"template": {"metadata": {"annotations": {RESTARTED_AT_ANNOTATION: restarted_at}}}}}
 
 
 class RemediationExecutor:
     """Executes remediation actions against Kubernetes."""
 
+    # Blocking client calls run here; the client releases the GIL on socket
+    # I/O, and the pool bounds how many API requests a batch keeps in flight
+    _api_pool = ThreadPoolExecutor(max_workers=K8S_API_MAX_WORKERS, thread_name_prefix="k8s-remediation")
+
+    # ActionType values double as the plain action strings, so one key covers both
+    _ACTION_HANDLERS = {
+        ActionType.RESTART_POD.value: "_restart_pod",
+        ActionType.RESTART_DEPLOYMENT.value: "_restart_deployment",
+        ActionType.ROLLBACK_DEPLOYMENT.value: "_rollback_deployment",
+        ActionType.SCALE_REPLICAS.value: "_scale_replicas",
+        ActionType.CORDON_NODE.value: "_cordon_node",
+    }
+
     def __init__(self):
         self._init_client()
 
     def _init_client(self):
         """Initialize Kubernetes client."""
-        try:
-            if settings.kubeconfig:
-                config.load_kube_config(settings.kubeconfig)
-            else:
-                try:
-                    config.load_incluster_config()
-                except config.ConfigException:
-                    config.load_kube_config()
-
-            self.core_v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
+        self.core_v1, self.apps_v1 = get_kube_clients()
 
-        except Exception as e:
-            logger.error("Failed to initialize Kubernetes client", error=str(e))
-            raise
+    async def _call_api(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking Kubernetes client call on the executor's API pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._api_pool, partial(func, **kwargs))
 
     async def execute(
         self,
@@ -51,25 +67,10 @@ class RemediationExecutor:
         """Execute a remediation action."""
         parameters = parameters or {}
 
-        action_handlers = {
-            "restart_pod": self._restart_pod,
-            ActionType.RESTART_POD.value: self._restart_pod,
-            "restart_deployment": self._restart_deployment,
-            ActionType.RESTART_DEPLOYMENT.value: self._restart_deployment,
-            "rollback_deployment": self._rollback_deployment,
-            ActionType.ROLLBACK_DEPLOYMENT.value: self._rollback_deployment,
-            "scale_replicas": self._scale_replicas,
-            ActionType.SCALE_REPLICAS.value: self._scale_replicas,
-            "cordon_node": self._cordon_node,
-            ActionType.CORDON_NODE.value: self._cordon_node,
-        }
-
         try:
-            handler = action_handlers.get(action_type)
-            if handler:
-                if action_type == "cordon_node" or action_type == ActionType.CORDON_NODE.value:
-                    return handler(parameters)
-                return handler(incident, parameters)
+            method_name = self._ACTION_HANDLERS.get(action_type)
+            if method_name:
+                return await getattr(self, method_name)(incident, parameters)
 
             return {
                 "success": False,
@@ -83,19 +84,20 @@ class RemediationExecutor:
                 "error": str(e),
             }
 
-    def _restart_pod(self, incident: Incident, parameters: dict) -> dict:
+    async def _restart_pod(self, incident: Incident, parameters: dict) -> dict:
         """Restart a pod by deleting it (assuming deployment-managed)."""
         namespace = incident.namespace
         pod_name = parameters.get("pod_name")
 
         if not pod_name:
-            pod_name = self._find_unhealthy_pod(incident)
+            pod_name = await self._find_unhealthy_pod(incident)
 
         if not pod_name:
             return {"success": False, "error": "No pods found"}
 
         try:
-            self.core_v1.delete_namespaced_pod(
+            await self._call_api(
+                self.core_v1.delete_namespaced_pod,
                 name=pod_name,
                 namespace=namespace,
             )
@@ -112,28 +114,35 @@ class RemediationExecutor:
         except ApiException as e:
             return {"success": False, "error": str(e)}
 
-    def _find_unhealthy_pod(self, incident: Incident) -> str | None:
+    async def _find_unhealthy_pod(self, incident: Incident) -> str | None:
         """Find an unhealthy pod for the incident's service."""
         namespace = incident.namespace
         label_selector = f"app={incident.service}" if incident.service else None
 
-        pods = self.core_v1.list_namespaced_pod(
+        # Let the API server filter to non-running pods; one is enough
+        pods = await self._call_api(
+            self.core_v1.list_namespaced_pod,
             namespace=namespace,
             label_selector=label_selector,
+            field_selector="status.phase!=Running",
+            limit=1,
         )
 
         if not pods.items:
-            return None
+            # Default to first pod
+            pods = await self._call_api(
+                self.core_v1.list_namespaced_pod,
+                namespace=namespace,
+                label_selector=label_selector,
+                limit=1,
+            )
 
-        # Find first unhealthy pod
-        for pod in pods.items:
-            if pod.status.phase != "Running":
-                return pod.metadata.name
+        if not pods.items:
+            return None
 
-        # Default to first pod
         return pods.items[0].metadata.name
 
-    def _restart_deployment(self, incident: Incident, parameters: dict) -> dict:
+    async def _restart_deployment(self, incident: Incident, parameters: dict) -> dict:
         """Restart deployment using rollout restart."""
         namespace = incident.namespace
         deployment_name = parameters.get("deployment_name") or incident.service
@@ -142,24 +151,11 @@ class RemediationExecutor:
             return {"success": False, "error": ERROR_NO_DEPLOYMENT_NAME}
 
         try:
-            now = datetime.now(UTC).isoformat()
-
-            patch = {
-                "spec": {
-                    "template": {
-                        "metadata": {
-                            "annotations": {
-                                "kubectl.kubernetes.io/restartedAt": now
-                            }
-                        }
-                    }
-                }
-            }
-
-            self.apps_v1.patch_namespaced_deployment(
+            await self._call_api(
+                self.apps_v1.patch_namespaced_deployment,
                 name=deployment_name,
                 namespace=namespace,
-                body=patch,
+                body=restart_patch(datetime.now(UTC).isoformat()),
             )
 
             logger.info("Restarted deployment", deployment=deployment_name, namespace=namespace)
@@ -174,7 +170,7 @@ class RemediationExecutor:
         except ApiException as e:
             return {"success": False, "error": str(e)}
 
-    def _rollback_deployment(self, incident: Incident, parameters: dict) -> dict:
+    async def _rollback_deployment(self, incident: Incident, parameters: dict) -> dict:
         """Rollback deployment to previous revision."""
         namespace = incident.namespace
         deployment_name = parameters.get("deployment_name") or incident.service
@@ -184,31 +180,38 @@ class RemediationExecutor:
             return {"success": False, "error": ERROR_NO_DEPLOYMENT_NAME}
 
         try:
-            deploy = self.apps_v1.read_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-            )
-
-            rs_list = self.apps_v1.list_namespaced_replica_set(
-                namespace=namespace,
-                label_selector=f"app={deployment_name}",
+            # Independent reads: fetch the deployment and its ReplicaSets concurrently
+            deploy, rs_list = await asyncio.gather(
+                self._call_api(
+                    self.apps_v1.read_namespaced_deployment,
+                    name=deployment_name,
+                    namespace=namespace,
+                ),
+                self._call_api(
+                    self.apps_v1.list_namespaced_replica_set,
+                    namespace=namespace,
+                    label_selector=f"app={deployment_name}",
+                ),
             )
 
-            rs_sorted = sorted(
-                rs_list.items,
-                key=lambda x: int(x.metadata.annotations.get(
-                    "deployment.kubernetes.io/revision", "0"
-                )),
-                reverse=True
+            # Only the two newest revisions matter; parse each revision once
+            latest = heapq.nlargest(
+                2,
+                (
+                    (int(rs.metadata.annotations.get(REVISION_ANNOTATION, "0")), rs)
+                    for rs in rs_list.items
+                ),
+                key=itemgetter(0),
             )
 
-            if len(rs_sorted) < 2:
+            if len(latest) < 2:
                 return {"success": False, "error": "No previous revision available"}
 
-            previous_rs = rs_sorted[1]
+            previous_rs = latest[1][1]
             deploy.spec.template = previous_rs.spec.template
 
-            self.apps_v1.replace_namespaced_deployment(
+            await self._call_api(
+                self.apps_v1.replace_namespaced_deployment,
                 name=deployment_name,
                 namespace=namespace,
                 body=deploy,
@@ -218,9 +221,7 @@ class RemediationExecutor:
                 "Rolled back deployment",
                 deployment=deployment_name,
                 namespace=namespace,
-                to_revision=previous_rs.metadata.annotations.get(
-                    "deployment.kubernetes.io/revision"
-                ),
+                to_revision=previous_rs.metadata.annotations.get(REVISION_ANNOTATION),
             )
 
             return {
@@ -233,7 +234,7 @@ class RemediationExecutor:
         except ApiException as e:
             return {"success": False, "error": str(e)}
 
-    def _scale_replicas(self, incident: Incident, parameters: dict) -> dict:
+    async def _scale_replicas(self, incident: Incident, parameters: dict) -> dict:
         """Scale deployment replicas."""
         namespace = incident.namespace
         deployment_name = parameters.get("deployment_name") or incident.service
@@ -243,12 +244,13 @@ class RemediationExecutor:
             return {"success": False, "error": ERROR_NO_DEPLOYMENT_NAME}
 
         if replicas is None:
-            replicas = self._get_current_replicas_plus_one(namespace, deployment_name)
+            replicas = await self._get_current_replicas_plus_one(namespace, deployment_name)
 
         try:
             patch = {"spec": {"replicas": replicas}}
 
-            self.apps_v1.patch_namespaced_deployment_scale(
+            await self._call_api(
+                self.apps_v1.patch_namespaced_deployment_scale,
                 name=deployment_name,
                 namespace=namespace,
                 body=patch,
@@ -272,15 +274,16 @@ class RemediationExecutor:
         except ApiException as e:
             return {"success": False, "error": str(e)}
 
-    def _get_current_replicas_plus_one(self, namespace: str, deployment_name: str) -> int:
+    async def _get_current_replicas_plus_one(self, namespace: str, deployment_name: str) -> int:
         """Get current replica count + 1."""
-        deploy = self.apps_v1.read_namespaced_deployment(
+        deploy = await self._call_api(
+            self.apps_v1.read_namespaced_deployment,
             name=deployment_name,
             namespace=namespace,
         )
         return (deploy.spec.replicas or 1) + 1
 
-    def _cordon_node(self, parameters: dict) -> dict:
+    async def _cordon_node(self, incident: Incident, parameters: dict) -> dict:
         """Cordon a node to prevent new pods from scheduling."""
         node_name = parameters.get("node_name")
 
@@ -290,7 +293,8 @@ class RemediationExecutor:
         try:
             patch = {"spec": {"unschedulable": True}}
 
-            self.core_v1.patch_node(
+            await self._call_api(
+                self.core_v1.patch_node,
                 name=node_name,
                 body=patch,
             )
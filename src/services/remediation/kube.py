@@ -0,0 +1,41 @@
+"""
+Kubernetes API Clients.
+Process-wide clients shared by the remediation executor, verifier, orchestrator and watch cache.
+"""
+import threading
+
+import structlog
+from kubernetes import client, config
+
+from src.config import settings
+
+logger = structlog.get_logger()
+
+# Created on first use so kubeconfig is parsed and the connection pool is set
+# up once per process
+_clients: tuple[client.CoreV1Api, client.AppsV1Api] | None = None
+_clients_lock = threading.Lock()
+
+
+def get_kube_clients() -> tuple[client.CoreV1Api, client.AppsV1Api]:
+    """Get or create the shared Kubernetes API clients."""
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                try:
+                    if settings.kubeconfig:
+                        config.load_kube_config(settings.kubeconfig)
+                    else:
+                        try:
+                            config.load_incluster_config()
+                        except config.ConfigException:
+                            config.load_kube_config()
+
+                    _clients = (client.CoreV1Api(), client.AppsV1Api())
+
+                except Exception as e:
+                    logger.error("Failed to initialize Kubernetes client", error=str(e))
+                    raise
+
+    return _clients
@@ -2,6 +2,7 @@
 Remediation Orchestrator.
 Coordinates remediation actions with policy evaluation and blast radius assessment.
 """
+import asyncio
 from datetime import UTC, datetime
 from typing import Any
 
@@ -17,9 +18,33 @@ from src.models import (
     RemediationAction,
 )
 from src.services.policy.opa_client import OPAClient
+from src.services.remediation.kube import get_kube_clients
+from src.services.remediation.watch_cache import KubernetesWatchCache
+from src.services.resilience import TTLCache
 
 logger = structlog.get_logger()
 
+# Blast radius multiplier per APP_ENV; unknown environments use the fallback
+ENV_MULTIPLIERS = {
+    "dev": 1.0,
+    "staging": 2.0,
+    "uat": 2.5,
+    "prod": 5.0,
+}
+DEFAULT_ENV_MULTIPLIER = 3.0
+
+# Namespaces whose workloads weigh more in the blast radius
+CRITICAL_NAMESPACES = frozenset({"default", "platform", "core-services"})
+
+# APP_ENV -> policy environment; unknown values are treated as production
+ENVIRONMENTS = {
+    "development": Environment.DEV,
+    "staging": Environment.STAGING,
+    "uat": Environment.UAT,
+    "production": Environment.PROD,
+    "prod": Environment.PROD,
+}
+
 
 class RemediationOrchestrator:
     """Orchestrates remediation actions with safety controls."""
@@ -39,24 +64,68 @@ class RemediationOrchestrator:
         ActionType.UPDATE_HPA: ActionRisk.MEDIUM,
     }
 
+    # Deployment lookups per (cluster, namespace, service); incident storms
+    # propose many actions for the same service within seconds
+    _deployments = TTLCache(
+        max_size=1024,
+        ttl_seconds=settings.remediation_blast_radius_cache_ttl_seconds,
+    )
+    # Failed assessments, cached for the same TTL so a degraded API server is
+    # not retried (and logged) on every proposal
+    _blast_failures = TTLCache(
+        max_size=1024,
+        ttl_seconds=settings.remediation_blast_radius_cache_ttl_seconds,
+    )
+
     def __init__(self):
         self.opa_client = OPAClient()
 
+    async def _get_deploy_info(self, incident: Incident) -> dict[str, int]:
+        """Affected pods and deployments for the incident's service, cached briefly."""
+        from kubernetes import client
+
+        key = (incident.cluster, incident.namespace, incident.service)
+        cached = self._deployments.get(key)
+        if cached is not None:
+            return cached
+
+        mirror = None
+        if settings.kubernetes_watch_cache_enabled:
+            mirror = KubernetesWatchCache.deployments(incident.namespace)
+
+        if mirror is not None:
+            deploy = mirror.get(incident.service)
+        else:
+            # Kubeconfig is loaded once per process with the shared clients
+            _, apps_v1 = get_kube_clients()
+
+            try:
+                # Blocking client call; keep the event loop free
+                deploy = await asyncio.to_thread(
+                    apps_v1.read_namespaced_deployment,
+                    name=incident.service,
+                    namespace=incident.namespace,
+                )
+            except client.ApiException:
+                deploy = None
+
+        if deploy is not None:
+            info = {"affected_pods": deploy.spec.replicas or 1, "affected_deployments": 1}
+        else:
+            # Cached too, so a missing deployment isn't re-read on every proposal
+            info = {"affected_pods": 0, "affected_deployments": 0}
+
+        self._deployments.put(key, info)
+        return info
+
     async def calculate_blast_radius(self, incident: Incident) -> dict[str, Any]:
         """Calculate blast radius for potential remediation."""
-        from kubernetes import client, config
+        key = (incident.cluster, incident.namespace, incident.service)
+        failed = self._blast_failures.get(key)
+        if failed is not None:
+            return dict(failed)
 
         try:
-            if settings.kubeconfig:
-                config.load_kube_config(settings.kubeconfig)
-            else:
-                try:
-                    config.load_incluster_config()
-                except config.ConfigException:
-                    config.load_kube_config()
-
-            apps_v1 = client.AppsV1Api()
-
             # Get deployment info
             namespace = incident.namespace
             service_name = incident.service
@@ -65,33 +134,18 @@ class RemediationOrchestrator:
             affected_deployments = 0
 
             if service_name:
-                try:
-                    deploy = apps_v1.read_namespaced_deployment(
-                        name=service_name,
-                        namespace=namespace
-                    )
-                    affected_pods = deploy.spec.replicas or 1
-                    affected_deployments = 1
-                except client.ApiException:
-                    pass
-
-            # Environment multiplier
-            env_multiplier = {
-                "dev": 1.0,
-                "staging": 2.0,
-                "uat": 2.5,
-                "prod": 5.0,
-            }
+                deploy_info = await self._get_deploy_info(incident)
+                affected_pods = deploy_info["affected_pods"]
+                affected_deployments = deploy_info["affected_deployments"]
 
             env = settings.app_env.lower()
-            multiplier = env_multiplier.get(env, 3.0)
+            multiplier = ENV_MULTIPLIERS.get(env, DEFAULT_ENV_MULTIPLIER)
 
             # Base score
             base_score = affected_pods * 5 + affected_deployments * 10
 
             # Critical namespace boost
-            critical_namespaces = {"default", "platform", "core-services"}
-            if namespace in critical_namespaces:
+            if namespace in CRITICAL_NAMESPACES:
                 base_score *= 1.5
 
             final_score = min(base_score * multiplier, 100)
@@ -106,12 +160,19 @@ class RemediationOrchestrator:
             }
 
         except Exception as e:
-            logger.error("Failed to calculate blast radius", error=str(e))
-            return {
+            logger.warning(
+                "Failed to calculate blast radius",
+                namespace=incident.namespace,
+                service=incident.service,
+                error=str(e),
+            )
+            failed = {
                 "score": 100,  # Max score on error
                 "error": str(e),
                 "is_acceptable": False,
             }
+            self._blast_failures.put(key, failed)
+            return dict(failed)
 
     async def propose_action(
         self,
@@ -121,6 +182,8 @@ class RemediationOrchestrator:
         parameters: dict | None = None,
     ) -> RemediationAction:
         """Propose a remediation action."""
+        app_env = settings.app_env
+
         # Determine action type enum
         try:
             action_enum = ActionType(action_type)
@@ -134,22 +197,15 @@ class RemediationOrchestrator:
         blast_radius = await self.calculate_blast_radius(incident)
 
         # Determine environment
-        env_map = {
-            "development": Environment.DEV,
-            "staging": Environment.STAGING,
-            "uat": Environment.UAT,
-            "production": Environment.PROD,
-            "prod": Environment.PROD,
-        }
-        environment = env_map.get(settings.app_env.lower(), Environment.PROD)
+        environment = ENVIRONMENTS.get(app_env.lower(), Environment.PROD)
 
         # Create idempotency key
-        idempotency_key = f"{incident.id}_{action_type}_{target_resource}_{datetime.now(UTC).strftime('%Y%m%d%H')}"
+        idempotency_key = f"{incident.id}_{action_type}_{target_resource}_{datetime.now(UTC):%Y%m%d%H}"
 
         # Evaluate policy
         policy_result = await self.opa_client.evaluate_remediation(
             action_type=action_type,
-            environment=settings.app_env,
+            environment=app_env,
             blast_radius_score=blast_radius["score"],
             namespace=incident.namespace,
             affected_replicas=blast_radius.get("affected_pods", 1),
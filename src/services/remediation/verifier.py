@@ -2,37 +2,115 @@
 Remediation Verifier.
 Verifies that remediation actions were successful by checking metrics.
 """
+import asyncio
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
+from uuid import UUID
 
 import httpx
+import orjson
 import structlog
-from kubernetes import client, config
 
 from src.config import settings
 from src.models import Incident
+from src.services.remediation.kube import get_kube_clients
+from src.services.remediation.watch_cache import KubernetesWatchCache
 
 logger = structlog.get_logger()
 
+# PromQL templates for the verification probes; {offset} is "" for the
+# current window or " offset 15m" for the pre-remediation baseline
+ERROR_RATE_QUERY = (
+    'sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}, status=~"5.."}}[5m]{offset}))'
+    ' / sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}}}[5m]{offset}))'
+)
+RESTART_RATE_QUERY = (
+    'sum(increase(kube_pod_container_status_restarts_total{{namespace="{namespace}", pod=~"{pod_prefix}.*"}}[5m]{offset}))'
+)
+BASELINE_OFFSET = " offset 15m"
+# Label that tags each subquery's series in a batched query
+BATCH_KEY_LABEL = "verify_key"
+
+
+@lru_cache(maxsize=256)
+def verification_queries(namespace: str, service: str | None) -> dict[str, tuple[str, str]]:
+    """(current, baseline) PromQL per probe, rendered once per namespace/service."""
+    pod_filter = f', pod=~"{service}.*"' if service else ""
+    pod_prefix = service or ".*"
+    return {
+        "error_rate": tuple(
+            ERROR_RATE_QUERY.format(namespace=namespace, pod_filter=pod_filter, offset=offset)
+            for offset in ("", BASELINE_OFFSET)
+        ),
+        "restart_rate": tuple(
+            RESTART_RATE_QUERY.format(namespace=namespace, pod_prefix=pod_prefix, offset=offset)
+            for offset in ("", BASELINE_OFFSET)
+        ),
+    }
+
 
 class RemediationVerifier:
     """Verifies remediation success by checking metrics and state."""
 
+    # Shared across verifiers so Prometheus connections are kept alive
+    _http_client: httpx.AsyncClient | None = None
+    # Verifications in progress, so concurrent callers share one run
+    _inflight: dict[UUID, asyncio.Task] = {}
+
     def __init__(self):
         self.prometheus_url = settings.prometheus_url
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+        return cls._http_client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+            cls._http_client = None
+
     async def verify(
         self,
         incident: Incident,
     ) -> dict[str, Any]:
         """Verify that remediation improved the situation."""
+        task = self._inflight.get(incident.id)
+        if task is None:
+            # The run is its own task, so cancelling one caller (e.g. the
+            # recovery watch) never cancels it for the callers that joined
+            task = asyncio.ensure_future(self._verify(incident))
+            self._inflight[incident.id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(incident.id, None))
+        return await asyncio.shield(task)
+
+    async def _verify(
+        self,
+        incident: Incident,
+    ) -> dict[str, Any]:
         namespace = incident.namespace
         service = incident.service
 
         try:
-            error_rate = await self._check_error_rate(namespace, service)
-            restart_rate = await self._check_restart_rate(namespace, service)
-            pod_health = self._check_pod_health(namespace, service)
+            # Independent probes; pod health uses the blocking kube client
+            if settings.prometheus_batch_verification_queries:
+                (error_rate, restart_rate), pod_health = await asyncio.gather(
+                    self._check_rates_batched(namespace, service),
+                    asyncio.to_thread(self._check_pod_health, namespace, service),
+                )
+            else:
+                error_rate, restart_rate, pod_health = await asyncio.gather(
+                    self._check_error_rate(namespace, service),
+                    self._check_restart_rate(namespace, service),
+                    asyncio.to_thread(self._check_pod_health, namespace, service),
+                )
 
             metrics_improved = (
                 error_rate.get("improved", False) or
@@ -67,17 +145,43 @@ class RemediationVerifier:
                 "error": str(e),
             }
 
+    async def _check_rates_batched(self, namespace: str, service: str | None) -> tuple[dict, dict]:
+        """Error and restart rate checks from one Prometheus request."""
+        queries = verification_queries(namespace, service)
+        try:
+            values = await self._query_prometheus_many({
+                "error_rate_current": queries["error_rate"][0],
+                "error_rate_before": queries["error_rate"][1],
+                "restart_rate_current": queries["restart_rate"][0],
+                "restart_rate_before": queries["restart_rate"][1],
+            })
+        except Exception as e:
+            return {"error": str(e)}, {"error": str(e)}
+
+        error_current, error_before = values["error_rate_current"], values["error_rate_before"]
+        restart_current, restart_before = values["restart_rate_current"], values["restart_rate_before"]
+
+        error_rate = {
+            "current": error_current,
+            "before": error_before,
+            "improved": self._is_metric_improved(error_current, error_before),
+        }
+        restart_rate = {
+            "current": restart_current,
+            "before": restart_before,
+            "improved": restart_current is not None and restart_before is not None and restart_current <= restart_before,
+        }
+        return error_rate, restart_rate
+
     async def _check_error_rate(self, namespace: str, service: str | None) -> dict:
         """Check if error rate has decreased."""
         try:
-            pod_filter = f', pod=~"{service}.*"' if service else ""
-            query = f'sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}, status=~"5.."}}[5m])) / sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}}}[5m]))'
-
-            current = await self._query_prometheus(query)
-
-            query_before = f'sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}, status=~"5.."}}[5m] offset 15m)) / sum(rate(http_requests_total{{namespace="{namespace}"{pod_filter}}}[5m] offset 15m))'
+            query, query_before = verification_queries(namespace, service)["error_rate"]
 
-            before = await self._query_prometheus(query_before)
+            current, before = await asyncio.gather(
+                self._query_prometheus(query),
+                self._query_prometheus(query_before),
+            )
 
             improved = self._is_metric_improved(current, before)
 
@@ -93,15 +197,12 @@ class RemediationVerifier:
     async def _check_restart_rate(self, namespace: str, service: str | None) -> dict:
         """Check if restart rate has decreased."""
         try:
-            pod_prefix = service or ".*"
-
-            query = f'sum(increase(kube_pod_container_status_restarts_total{{namespace="{namespace}", pod=~"{pod_prefix}.*"}}[5m]))'
-
-            current = await self._query_prometheus(query)
-
-            query_before = f'sum(increase(kube_pod_container_status_restarts_total{{namespace="{namespace}", pod=~"{pod_prefix}.*"}}[5m] offset 15m))'
+            query, query_before = verification_queries(namespace, service)["restart_rate"]
 
-            before = await self._query_prometheus(query_before)
+            current, before = await asyncio.gather(
+                self._query_prometheus(query),
+                self._query_prometheus(query_before),
+            )
 
             improved = current is not None and before is not None and current <= before
 
@@ -125,18 +226,33 @@ class RemediationVerifier:
     def _check_pod_health(self, namespace: str, service: str | None) -> dict:
         """Check if pods are healthy."""
         try:
-            self._init_kube_config()
-            core_v1 = client.CoreV1Api()
-
-            label_selector = f"app={service}" if service else None
-
-            pods = core_v1.list_namespaced_pod(
-                namespace=namespace,
-                label_selector=label_selector,
-            )
-
-            total = len(pods.items)
-            healthy = sum(1 for pod in pods.items if self._is_pod_healthy(pod))
+            pods = None
+            if settings.kubernetes_watch_cache_enabled:
+                pods = KubernetesWatchCache.pods(namespace, service)
+
+            if pods is None:
+                # Kubeconfig is loaded once per process with the shared clients
+                core_v1, _ = get_kube_clients()
+
+                label_selector = f"app={service}" if service else None
+
+                pods = core_v1.list_namespaced_pod(
+                    namespace=namespace,
+                    label_selector=label_selector,
+                ).items
+
+            # One pass: Running with no non-True Ready condition counts as healthy
+            total = len(pods)
+            healthy = 0
+            for pod in pods:
+                status = pod.status
+                if status.phase != "Running":
+                    continue
+                for cond in status.conditions or ():
+                    if cond.type == "Ready" and cond.status != "True":
+                        break
+                else:
+                    healthy += 1
 
             return {
                 "total": total,
@@ -148,46 +264,57 @@ class RemediationVerifier:
         except Exception as e:
             return {"error": str(e)}
 
-    def _init_kube_config(self) -> None:
-        """Initialize Kubernetes config."""
-        if settings.kubeconfig:
-            config.load_kube_config(settings.kubeconfig)
-        else:
-            try:
-                config.load_incluster_config()
-            except config.ConfigException:
-                config.load_kube_config()
+    async def _query_prometheus_many(self, queries: dict[str, str]) -> dict[str, float | None]:
+        """
+        Evaluate several single-value queries in one request.
+
+        Each subquery's series is tagged with BATCH_KEY_LABEL via label_replace
+        and the tagged vectors are unioned with `or`; results are split back
+        out by that label. Sent as a form POST so long unions fit.
+        """
+        expression = " or ".join(
+            f'label_replace({query}, "{BATCH_KEY_LABEL}", "{key}", "", "")'
+            for key, query in queries.items()
+        )
+        url = f"{self.prometheus_url}/api/v1/query"
+
+        response = await self._get_http_client().post(url, data={"query": expression})
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
 
-    def _is_pod_healthy(self, pod) -> bool:
-        """Check if a pod is healthy."""
-        if pod.status.phase != "Running":
-            return False
+        values: dict[str, float | None] = dict.fromkeys(queries)
+        if data.get("status") != "success":
+            return values
 
-        for cond in pod.status.conditions or []:
-            if cond.type == "Ready" and cond.status != "True":
-                return False
+        for series in data.get("data", {}).get("result", []):
+            key = series.get("metric", {}).get(BATCH_KEY_LABEL)
+            if key in values and values[key] is None:
+                try:
+                    values[key] = float(series["value"][1])
+                except (IndexError, KeyError, ValueError):
+                    pass
 
-        return True
+        return values
 
     async def _query_prometheus(self, query: str) -> float | None:
         """Query Prometheus for a single value."""
         url = f"{self.prometheus_url}/api/v1/query"
 
-        async with httpx.AsyncClient(timeout=10.0) as http_client:
-            response = await http_client.get(url, params={"query": query})
-            response.raise_for_status()
+        response = await self._get_http_client().get(url, params={"query": query})
+        response.raise_for_status()
 
-            data = response.json()
+        data = orjson.loads(response.content)
 
-            if data.get("status") != "success":
-                return None
+        if data.get("status") != "success":
+            return None
 
-            results = data.get("data", {}).get("result", [])
+        results = data.get("data", {}).get("result", [])
 
-            if not results:
-                return None
+        if not results:
+            return None
 
-            try:
-                return float(results[0]["value"][1])
-            except (IndexError, KeyError, ValueError):
-                return None
+        try:
+            return float(results[0]["value"][1])
+        except (IndexError, KeyError, ValueError):
+            return None
@@ -0,0 +1,153 @@
+"""
+Kubernetes Watch Cache.
+Informer-style in-memory mirror of pods and deployments for remediation reads.
+"""
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+from kubernetes import watch
+
+from src.services.remediation.kube import get_kube_clients
+
+logger = structlog.get_logger()
+
+# Server-side watch timeout; the namespace is relisted after each one
+WATCH_TIMEOUT_SECONDS = 300
+WATCH_RETRY_SECONDS = 5.0
+
+
+class NamespaceWatch:
+    """
+    Mirrors one resource kind in one namespace: list once, then apply watch
+    events from that resourceVersion. Objects are indexed by name and by their
+    ``app`` label. Runs in a daemon thread because the client is blocking.
+    """
+
+    def __init__(self, list_func: Callable[..., Any], namespace: str):
+        self.list_func = list_func
+        self.namespace = namespace
+        self.synced = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._by_name: dict[str, Any] = {}
+        self._by_app: dict[str | None, dict[str, Any]] = {}
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"k8s-watch-{namespace}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def get(self, name: str) -> Any | None:
+        with self._lock:
+            return self._by_name.get(name)
+
+    def by_app(self, app: str | None) -> list[Any]:
+        """Objects labelled app=<app>, or every object when app is None."""
+        with self._lock:
+            if app is None:
+                return list(self._by_name.values())
+            return list(self._by_app.get(app, {}).values())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                listing = self.list_func(namespace=self.namespace)
+                with self._lock:
+                    self._by_name.clear()
+                    self._by_app.clear()
+                    for obj in listing.items:
+                        self._add(obj)
+                self.synced.set()
+
+                stream = watch.Watch().stream(
+                    self.list_func,
+                    namespace=self.namespace,
+                    resource_version=listing.metadata.resource_version,
+                    timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                )
+                for event in stream:
+                    if self._stopped.is_set():
+                        return
+                    self._apply(event["type"], event["object"])
+
+            except Exception as e:
+                # Serve from the API again until the relist succeeds
+                self.synced.clear()
+                logger.warning("Kubernetes watch failed", namespace=self.namespace, error=str(e))
+                self._stopped.wait(WATCH_RETRY_SECONDS)
+
+    def _apply(self, event_type: str, obj: Any) -> None:
+        with self._lock:
+            self._remove(obj.metadata.name)
+            if event_type != "DELETED":
+                self._add(obj)
+
+    def _add(self, obj: Any) -> None:
+        name = obj.metadata.name
+        self._by_name[name] = obj
+        self._by_app.setdefault(_app_label(obj), {})[name] = obj
+
+    def _remove(self, name: str) -> None:
+        previous = self._by_name.pop(name, None)
+        if previous is not None:
+            self._by_app.get(_app_label(previous), {}).pop(name, None)
+
+
+def _app_label(obj: Any) -> str | None:
+    return (obj.metadata.labels or {}).get("app")
+
+
+class KubernetesWatchCache:
+    """
+    Shared pod and deployment mirrors, one watch per (kind, namespace).
+
+    A namespace's watch starts on its first lookup. Until it has synced,
+    lookups return None and callers read from the API directly, so the cache
+    only ever removes API calls.
+    """
+
+    _watches: dict[tuple[str, str], NamespaceWatch] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def pods(cls, namespace: str, app: str | None) -> list[Any] | None:
+        """Pods labelled app=<app> (all pods if None), or None if not synced yet."""
+        core_v1, _ = get_kube_clients()
+        mirror = cls._watch("pods", namespace, core_v1.list_namespaced_pod)
+        return mirror.by_app(app) if mirror.synced.is_set() else None
+
+    @classmethod
+    def deployments(cls, namespace: str) -> NamespaceWatch | None:
+        """The namespace's deployment mirror, or None if not synced yet."""
+        _, apps_v1 = get_kube_clients()
+        mirror = cls._watch("deployments", namespace, apps_v1.list_namespaced_deployment)
+        return mirror if mirror.synced.is_set() else None
+
+    @classmethod
+    def _watch(cls, kind: str, namespace: str, list_func: Callable[..., Any]) -> NamespaceWatch:
+        key = (kind, namespace)
+        mirror = cls._watches.get(key)
+        if mirror is None:
+            with cls._lock:
+                mirror = cls._watches.get(key)
+                if mirror is None:
+                    mirror = NamespaceWatch(list_func, namespace)
+                    mirror.start()
+                    cls._watches[key] = mirror
+        return mirror
+
+    @classmethod
+    def stop(cls) -> None:
+        """Stop every watch; each thread exits at its next event or retry."""
+        with cls._lock:
+            for mirror in cls._watches.values():
+                mirror.stop()
+            cls._watches.clear()
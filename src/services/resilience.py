@@ -0,0 +1,144 @@
+"""
+Resilience helpers for outbound calls.
+Circuit breaking, bounded retries and short-lived result caching for OPA,
+LLM providers and the Kubernetes API.
+"""
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+# Responses worth one more attempt: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because its breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the breaker opens and calls
+    fail immediately. Once ``reset_timeout`` seconds pass, a single trial call
+    is let through (half-open); success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        if self._opened_at is None:
+            return True
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            # Half-open: restart the window so only this trial call gets through
+            self._opened_at = time.monotonic()
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuit closed", breaker=self.name)
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit opened", breaker=self.name, failures=self._failures)
+            self._opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Run func through the breaker, raising CircuitOpenError while open."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success()
+        return result
+
+
+class TTLCache:
+    """
+    Small in-process LRU whose entries expire after ``ttl_seconds``.
+
+    A TTL of zero or less disables caching: puts are dropped.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def send_with_retry(
+    send: Callable[[], Awaitable[httpx.Response]],
+    attempts: int = 2,
+    base_delay: float = 0.1,
+) -> httpx.Response:
+    """
+    Send a request, retrying 429/5xx responses with exponential backoff and jitter.
+
+    Raises httpx.HTTPStatusError for the final non-2xx response.
+    """
+    for attempt in range(attempts):
+        response = await send()
+        if response.status_code in RETRYABLE_STATUS_CODES and attempt < attempts - 1:
+            await asyncio.sleep(base_delay * 2 ** attempt + random.uniform(0, base_delay / 2))
+            continue
+
+        response.raise_for_status()
+        return response
@@ -2,11 +2,16 @@
 Runbook Generator.
 Generates actionable runbooks with commands and dashboard links.
 """
-import json
+import os
+import time
 from datetime import UTC, datetime
+from functools import lru_cache
+from string import Template
 from typing import Any
-from uuid import uuid4
+from urllib.parse import quote
+from uuid import UUID
 
+import orjson
 import structlog
 
 from src.config import settings
@@ -16,40 +21,52 @@ from src.models import Incident
 logger = structlog.get_logger()
 
 
+def uuid7() -> UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits, so new runbook rows append to the primary key
+    index instead of splitting random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant
+    return UUID(int=value)
+
+
 class RunbookGenerator:
     """Generates runbooks for incident investigation and remediation."""
 
     # Command templates by action type
     COMMAND_TEMPLATES = {
-        "restart_pod": [
+        "restart_pod": (
             "kubectl delete pod {pod_name} -n {namespace}",
             "kubectl get pods -n {namespace} -w",
-        ],
-        "restart_deployment": [
+        ),
+        "restart_deployment": (
             "kubectl rollout restart deployment/{deployment} -n {namespace}",
             "kubectl rollout status deployment/{deployment} -n {namespace}",
-        ],
-        "rollback_deployment": [
+        ),
+        "rollback_deployment": (
             "kubectl rollout history deployment/{deployment} -n {namespace}",
             "kubectl rollout undo deployment/{deployment} -n {namespace}",
             "kubectl rollout status deployment/{deployment} -n {namespace}",
-        ],
-        "scale_replicas": [
+        ),
+        "scale_replicas": (
             "kubectl scale deployment/{deployment} --replicas={replicas} -n {namespace}",
             "kubectl get pods -n {namespace} -l app={deployment}",
-        ],
-        "investigate_logs": [
+        ),
+        "investigate_logs": (
             "kubectl logs -n {namespace} -l app={service} --tail=100",
             "kubectl logs -n {namespace} -l app={service} --previous --tail=100",
-        ],
-        "investigate_events": [
+        ),
+        "investigate_events": (
             "kubectl get events -n {namespace} --sort-by=.lastTimestamp",
             "kubectl describe pod -n {namespace} -l app={service}",
-        ],
-        "investigate_resources": [
+        ),
+        "investigate_resources": (
             "kubectl top pods -n {namespace}",
             "kubectl describe nodes",
-        ],
+        ),
     }
 
     # PromQL queries for investigation
@@ -84,6 +101,55 @@ class RunbookGenerator:
         ],
     }
 
+    # Grafana links; namespace and service are substituted URL-quoted
+    DASHBOARD_LINKS = (
+        ("Kubernetes Overview", Template("$grafana/d/kubernetes-overview?var-namespace=$ns")),
+        ("Pod Resources", Template("$grafana/d/pod-resources?var-namespace=$ns&var-pod=$svc")),
+        ("Application Metrics", Template("$grafana/d/application-metrics?var-namespace=$ns&var-service=$svc")),
+        (
+            "Logs Explorer",
+            Template(
+                "$grafana/explore?orgId=1&left=%5B%22now-1h%22,%22now%22,%22Loki%22,"
+                "%7B%22expr%22:%22%7Bnamespace%3D%5C%22${ns}%5C%22%7D%22%7D%5D"
+            ),
+        ),
+    )
+
+    # Investigation guide: base steps, then category-specific ones, then the final ones
+    BASE_STEPS = (
+        "1. Review the incident summary and top hypothesis",
+        "2. Check the investigation commands section for relevant kubectl commands",
+        "3. Execute the log inspection commands to identify specific errors",
+        "4. Review Prometheus queries for metric anomalies",
+        "5. Open the relevant Grafana dashboards for visual analysis",
+    )
+    CATEGORY_STEPS = {
+        "bad_deployment": (
+            "6. Check recent deployments with: kubectl rollout history",
+            "7. If recent deployment is the cause, consider rollback",
+        ),
+        "resource_exhaustion": (
+            "6. Check resource limits and requests",
+            "7. Review memory/CPU graphs for leak patterns",
+        ),
+        "dependency_failure": (
+            "6. Check connectivity to external dependencies",
+            "7. Verify DNS resolution and network policies",
+        ),
+    }
+    FINAL_STEPS = (
+        "8. Execute remediation if root cause is confirmed",
+        "9. Monitor metrics to verify improvement",
+    )
+
+    # Always included, whatever the category
+    HEALTH_QUERIES = [
+        {
+            "name": "Pod restarts",
+            "query": 'increase(kube_pod_container_status_restarts_total{{namespace="{namespace}"}}[30m])',
+        },
+    ]
+
     async def generate(
         self,
         incident: Incident,
@@ -100,7 +166,7 @@ class RunbookGenerator:
         steps = self._generate_investigation_steps(hypotheses)
 
         runbook = {
-            "id": str(uuid4()),
+            "id": str(uuid7()),
             "incident_id": str(incident.id),
             "title": f"Runbook: {incident.title}",
             "generated_at": datetime.now(UTC).isoformat(),
@@ -148,22 +214,25 @@ class RunbookGenerator:
         hypotheses: list[dict]
     ) -> list[dict]:
         """Generate kubectl commands."""
-        commands = []
-        namespace = incident.namespace
         service = incident.service or ""
+        # One substitution context serves every template
+        context = {
+            "namespace": incident.namespace,
+            "service": service,
+            "deployment": service,
+            "pod_name": f"{service}-xxx",
+            "replicas": 3,
+        }
 
         # Always include investigation commands
-        for cmd in self.COMMAND_TEMPLATES["investigate_logs"]:
-            commands.append({
-                "description": "View recent logs",
-                "command": cmd.format(namespace=namespace, service=service),
-            })
-
-        for cmd in self.COMMAND_TEMPLATES["investigate_events"]:
-            commands.append({
-                "description": "View recent events",
-                "command": cmd.format(namespace=namespace, service=service),
-            })
+        commands = [
+            {"description": "View recent logs", "command": cmd.format_map(context)}
+            for cmd in self.COMMAND_TEMPLATES["investigate_logs"]
+        ]
+        commands.extend(
+            {"description": "View recent events", "command": cmd.format_map(context)}
+            for cmd in self.COMMAND_TEMPLATES["investigate_events"]
+        )
 
         # Add remediation commands based on hypotheses
         if hypotheses:
@@ -175,100 +244,43 @@ class RunbookGenerator:
                         "command": action,
                     })
                 elif action in self.COMMAND_TEMPLATES:
-                    for cmd in self.COMMAND_TEMPLATES[action]:
-                        commands.append({
-                            "description": f"Execute: {action}",
-                            "command": cmd.format(
-                                namespace=namespace,
-                                deployment=service,
-                                service=service,
-                                pod_name=f"{service}-xxx",
-                                replicas=3,
-                            ),
-                        })
+                    commands.extend(
+                        {"description": f"Execute: {action}", "command": cmd.format_map(context)}
+                        for cmd in self.COMMAND_TEMPLATES[action]
+                    )
 
         return commands
 
     def _generate_queries(self, incident: Incident, category: str) -> list[dict]:
         """Generate PromQL queries for investigation."""
-        queries = []
-        namespace = incident.namespace
-
-        # Get category-specific queries
-        category_queries = self.INVESTIGATION_QUERIES.get(category, [])
-
-        for q in category_queries:
-            queries.append({
-                "name": q["name"],
-                "query": q["query"].format(namespace=namespace),
-            })
-
-        # Always include general health queries
-        queries.append({
-            "name": "Pod restarts",
-            "query": f'increase(kube_pod_container_status_restarts_total{{namespace="{namespace}"}}[30m])',
-        })
+        return [
+            {"name": name, "query": query}
+            for name, query in self._render_queries(category, incident.namespace)
+        ]
 
-        return queries
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _render_queries(cls, category: str, namespace: str) -> tuple[tuple[str, str], ...]:
+        """(name, PromQL) pairs for a category, rendered once per namespace."""
+        # Category-specific queries, then the general health queries
+        templates = [*cls.INVESTIGATION_QUERIES.get(category, []), *cls.HEALTH_QUERIES]
+        return tuple((q["name"], q["query"].format(namespace=namespace)) for q in templates)
 
     def _generate_dashboard_links(self, incident: Incident) -> list[dict]:
         """Generate Grafana dashboard links."""
         grafana_url = settings.grafana_url
-        namespace = incident.namespace
-        service = incident.service or ""
+        namespace = quote(incident.namespace, safe="")
+        service = quote(incident.service or "", safe="")
 
         return [
-            {
-                "name": "Kubernetes Overview",
-                "url": f"{grafana_url}/d/kubernetes-overview?var-namespace={namespace}",
-            },
-            {
-                "name": "Pod Resources",
-                "url": f"{grafana_url}/d/pod-resources?var-namespace={namespace}&var-pod={service}",
-            },
-            {
-                "name": "Application Metrics",
-                "url": f"{grafana_url}/d/application-metrics?var-namespace={namespace}&var-service={service}",
-            },
-            {
-                "name": "Logs Explorer",
-                "url": f"{grafana_url}/explore?orgId=1&left=%5B%22now-1h%22,%22now%22,%22Loki%22,%7B%22expr%22:%22%7Bnamespace%3D%5C%22{namespace}%5C%22%7D%22%7D%5D",
-            },
+            {"name": name, "url": url.substitute(grafana=grafana_url, ns=namespace, svc=service)}
+            for name, url in self.DASHBOARD_LINKS
         ]
 
     def _generate_investigation_steps(self, hypotheses: list[dict]) -> list[str]:
         """Generate step-by-step investigation guide."""
-        steps = [
-            "1. Review the incident summary and top hypothesis",
-            "2. Check the investigation commands section for relevant kubectl commands",
-            "3. Execute the log inspection commands to identify specific errors",
-            "4. Review Prometheus queries for metric anomalies",
-            "5. Open the relevant Grafana dashboards for visual analysis",
-        ]
-
-        if hypotheses:
-            category = hypotheses[0].get("category", "")
-
-            if category == "bad_deployment":
-                steps.extend([
-                    "6. Check recent deployments with: kubectl rollout history",
-                    "7. If recent deployment is the cause, consider rollback",
-                ])
-            elif category == "resource_exhaustion":
-                steps.extend([
-                    "6. Check resource limits and requests",
-                    "7. Review memory/CPU graphs for leak patterns",
-                ])
-            elif category == "dependency_failure":
-                steps.extend([
-                    "6. Check connectivity to external dependencies",
-                    "7. Verify DNS resolution and network policies",
-                ])
-
-        steps.append("8. Execute remediation if root cause is confirmed")
-        steps.append("9. Monitor metrics to verify improvement")
-
-        return steps
+        category = hypotheses[0].get("category", "") if hypotheses else ""
+        return [*self.BASE_STEPS, *self.CATEGORY_STEPS.get(category, ()), *self.FINAL_STEPS]
 
     async def _store_runbook(self, runbook: dict, incident: Incident) -> None:
         """Store runbook in database."""
@@ -281,13 +293,19 @@ class RunbookGenerator:
                     VALUES (:id, :incident_id, :title, :content, :commands, :dashboard_links, :generated_at)
                     ON CONFLICT (id) DO NOTHING
                 """),
-                {
-                    "id": runbook["id"],
-                    "incident_id": str(incident.id),
-                    "title": runbook["title"],
-                    "content": json.dumps(runbook["sections"]),
-                    "commands": json.dumps(runbook["sections"]["investigation_commands"]),
-                    "dashboard_links": json.dumps(runbook["sections"]["dashboard_links"]),
-                    "generated_at": datetime.now(UTC),
-                }
+                self._runbook_row(runbook, incident),
             )
+
+    def _runbook_row(self, runbook: dict, incident: Incident) -> dict:
+        """Insert parameters for a runbook."""
+        sections = runbook["sections"]
+        return {
+            "id": runbook["id"],
+            "incident_id": str(incident.id),
+            "title": runbook["title"],
+            "content": orjson.dumps(sections).decode(),
+            "commands": orjson.dumps(sections["investigation_commands"]).decode(),
+            "dashboard_links": orjson.dumps(sections["dashboard_links"]).decode(),
+            # The same timestamp the generated runbook reports
+            "generated_at": datetime.fromisoformat(runbook["generated_at"]),
+        }
@@ -2,29 +2,68 @@
 Temporal Activities for Incident Workflow.
 These are the individual tasks executed by the workflow.
 """
-import json
-from datetime import UTC, datetime
+import asyncio
+import time
+from functools import lru_cache
 
+import orjson
 import structlog
+from pydantic import TypeAdapter
+from sqlalchemy import text
 from temporalio import activity
 
 from src.config import settings
 from src.database import GraphService, get_session
-from src.models import Incident
+from src.models import Evidence, GraphEntity, GraphRelation, Incident
 from src.services.collectors import (
     DeployDiffCollector,
     KubernetesCollector,
     LogsCollector,
     MetricsCollector,
 )
+from src.services.integrations.slack_client import JiraClient, SlackClient
+from src.services.policy.opa_client import OPAClient
+from src.services.rca.hypothesis_ranker import HypothesisRanker
+from src.services.rca.llm_summarizer import LLMSummarizer
+from src.services.rca.rules_engine import RulesEngine
+from src.services.remediation.executor import RemediationExecutor
+from src.services.remediation.orchestrator import RemediationOrchestrator
+from src.services.remediation.verifier import RemediationVerifier
+from src.services.runbook.generator import RunbookGenerator
 
 logger = structlog.get_logger()
 
+# Whole-list serializers for collector results (one call per list, not per model)
+_EVIDENCE_LIST = TypeAdapter(list[Evidence])
+_ENTITY_LIST = TypeAdapter(list[GraphEntity])
+_RELATION_LIST = TypeAdapter(list[GraphRelation])
+
+# Rows per evidence INSERT statement
+EVIDENCE_INSERT_BATCH = 500
+
+# Seconds between recovery checks while the workflow waits to verify
+RECOVERY_POLL_SECONDS = 10.0
+
+
+@lru_cache(maxsize=256)
+def _parse_incident(payload: bytes) -> Incident:
+    return Incident.model_validate_json(payload)
+
+
+def _incident_from_payload(incident_data: dict) -> Incident:
+    """
+    Incident for an activity's payload. Every activity of a workflow receives
+    the same incident dict, so each distinct payload is validated once per
+    worker; callers get their own copy of the parsed model.
+    """
+    payload = orjson.dumps(incident_data, option=orjson.OPT_SORT_KEYS)
+    return _parse_incident(payload).model_copy()
+
 
 @activity.defn
 async def collect_all_evidence(incident_data: dict) -> dict:
     """Collect evidence from all sources in parallel."""
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     results = {
         "total_evidence": 0,
@@ -41,46 +80,24 @@ async def collect_all_evidence(incident_data: dict) -> dict:
         DeployDiffCollector(incident),
     ]
 
-    for collector in collectors:
-        try:
-            result = await collector.run()
-
-            # Aggregate results
-            results["evidence"].extend([e.model_dump(mode="json") for e in result.evidence])
-            results["entities"].extend([e.model_dump(mode="json") for e in result.entities])
-            results["relations"].extend([r.model_dump(mode="json") for r in result.relations])
-            results["errors"].extend(result.errors)
-            results["total_evidence"] += len(result.evidence)
+    # Collectors are I/O bound; run them concurrently and aggregate in order
+    collected = await asyncio.gather(
+        *(collector.run() for collector in collectors),
+        return_exceptions=True,
+    )
 
-        except Exception as e:
-            logger.error(f"Collector {collector.name} failed", error=str(e))
-            results["errors"].append(f"{collector.name}: {e}")
+    for collector, result in zip(collectors, collected):
+        if isinstance(result, Exception):
+            logger.error(f"Collector {collector.name} failed", error=str(result))
+            results["errors"].append(f"{collector.name}: {result}")
+            continue
 
-    # Store evidence in database
-    async with get_session() as session:
-        from sqlalchemy import text
-
-        for ev in results["evidence"]:
-            await session.execute(
-                text("""
-                    INSERT INTO evidence (id, incident_id, evidence_type, source, 
-                        entity_name, entity_namespace, data, signal_strength, collected_at)
-                    VALUES (:id, :incident_id, :evidence_type, :source,
-                        :entity_name, :entity_namespace, :data, :signal_strength, :collected_at)
-                    ON CONFLICT (id) DO NOTHING
-                """),
-                {
-                    "id": ev["id"],
-                    "incident_id": str(incident.id),
-                    "evidence_type": ev["evidence_type"],
-                    "source": ev["source"],
-                    "entity_name": ev["entity_name"],
-                    "entity_namespace": ev["entity_namespace"],
-                    "data": json.dumps(ev["data"]),
-                    "signal_strength": ev["signal_strength"],
-                    "collected_at": datetime.now(UTC),
-                }
-            )
+        # Aggregate results
+        results["evidence"].extend(_EVIDENCE_LIST.dump_python(result.evidence, mode="json"))
+        results["entities"].extend(_ENTITY_LIST.dump_python(result.entities, mode="json"))
+        results["relations"].extend(_RELATION_LIST.dump_python(result.relations, mode="json"))
+        results["errors"].extend(result.errors)
+        results["total_evidence"] += len(result.evidence)
 
     logger.info(
         "Evidence collection complete",
@@ -91,16 +108,67 @@ async def collect_all_evidence(incident_data: dict) -> dict:
     return results
 
 
+def _evidence_columns(evidence: list[dict]) -> dict[str, list]:
+    """
+    Column arrays for one INSERT ... SELECT FROM unnest(); data is sent as
+    text[] and cast per row, since jsonb[] binds need a codec.
+    """
+    return {
+        "ids": [ev["id"] for ev in evidence],
+        "evidence_types": [ev["evidence_type"] for ev in evidence],
+        "sources": [ev["source"] for ev in evidence],
+        "entity_names": [ev["entity_name"] for ev in evidence],
+        "entity_namespaces": [ev["entity_namespace"] for ev in evidence],
+        "datas": [orjson.dumps(ev["data"], option=orjson.OPT_NON_STR_KEYS).decode() for ev in evidence],
+        "signal_strengths": [ev["signal_strength"] for ev in evidence],
+    }
+
+
+@activity.defn
+async def persist_evidence(data: dict) -> int:
+    """Store collected evidence in the database."""
+    incident_data = data["incident"]
+    evidence_data = data["evidence"]
+
+    evidence = evidence_data.get("evidence", [])
+    if not evidence:
+        return 0
+
+    async with get_session() as session:
+        insert = text("""
+            INSERT INTO evidence (id, incident_id, evidence_type, source,
+                entity_name, entity_namespace, data, signal_strength, collected_at)
+            SELECT e.id, CAST(:incident_id AS uuid), e.evidence_type, e.source,
+                e.entity_name, e.entity_namespace, CAST(e.data AS jsonb), e.signal_strength,
+                now()
+            FROM unnest(
+                CAST(:ids AS uuid[]), CAST(:evidence_types AS text[]), CAST(:sources AS text[]),
+                CAST(:entity_names AS text[]), CAST(:entity_namespaces AS text[]),
+                CAST(:datas AS text[]), CAST(:signal_strengths AS float8[])
+            ) AS e(id, evidence_type, source, entity_name, entity_namespace, data, signal_strength)
+            ON CONFLICT (id) DO NOTHING
+        """)
+
+        # Bounded batches keep each bind message (and its serialized data
+        # column) small however much evidence the collectors returned
+        for start in range(0, len(evidence), EVIDENCE_INSERT_BATCH):
+            await session.execute(insert, {
+                **_evidence_columns(evidence[start:start + EVIDENCE_INSERT_BATCH]),
+                "incident_id": incident_data["id"],
+            })
+
+    return len(evidence)
+
+
 @activity.defn
 async def build_evidence_graph(data: dict) -> dict:
     """Build the evidence graph in Neo4j."""
     incident_data = data["incident"]
     evidence_data = data["evidence"]
 
-    from src.models import GraphEntity, GraphRelation
-
-    entities = [GraphEntity(**e) for e in evidence_data.get("entities", [])]
-    relations = [GraphRelation(**r) for r in evidence_data.get("relations", [])]
+    # Dumped from validated models by collect_all_evidence, so skip re-validation
+    entities = [GraphEntity.model_construct(**e) for e in evidence_data.get("entities", [])]
+    relations = [GraphRelation.model_construct(**r) for r in evidence_data.get("relations", [])]
 
     # Create entities
     entity_count = await GraphService.create_entities_batch(entities)
@@ -127,10 +195,7 @@ async def generate_hypotheses(data: dict) -> list[dict]:
     incident_data = data["incident"]
     evidence_data = data["evidence"]
 
-    from src.services.rca.llm_summarizer import LLMSummarizer
-    from src.services.rca.rules_engine import RulesEngine
-
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     # Run rules engine
     rules_engine = RulesEngine()
@@ -160,10 +225,8 @@ async def generate_hypotheses(data: dict) -> list[dict]:
 
 
 @activity.defn
-async def rank_hypotheses(hypotheses: list[dict]) -> list[dict]:
-    """Rank hypotheses by confidence."""
-    from src.services.rca.hypothesis_ranker import HypothesisRanker
-
+def rank_hypotheses(hypotheses: list[dict]) -> list[dict]:
+    """Rank hypotheses by confidence. Pure CPU, so it runs on the worker's activity executor."""
     ranker = HypothesisRanker()
     ranked = ranker.rank(hypotheses)
 
@@ -173,12 +236,10 @@ async def rank_hypotheses(hypotheses: list[dict]) -> list[dict]:
 @activity.defn
 async def generate_runbook(data: dict) -> dict:
     """Generate a runbook for the incident."""
-    from src.services.runbook.generator import RunbookGenerator
-
     incident_data = data["incident"]
     hypotheses = data["hypotheses"]
 
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     generator = RunbookGenerator()
     runbook = await generator.generate(
@@ -192,9 +253,7 @@ async def generate_runbook(data: dict) -> dict:
 @activity.defn
 async def calculate_blast_radius(incident_data: dict) -> dict:
     """Calculate blast radius for the incident."""
-    from src.services.remediation.orchestrator import RemediationOrchestrator
-
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
     orchestrator = RemediationOrchestrator()
 
     blast_radius = await orchestrator.calculate_blast_radius(incident)
@@ -205,13 +264,11 @@ async def calculate_blast_radius(incident_data: dict) -> dict:
 @activity.defn
 async def evaluate_remediation_policy(data: dict) -> dict:
     """Evaluate remediation policy using OPA."""
-    from src.services.policy.opa_client import OPAClient
-
     incident_data = data["incident"]
     hypotheses = data["hypotheses"]
     blast_radius = data["blast_radius"]
 
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     # Get top hypothesis
     top_hypothesis = hypotheses[0] if hypotheses else None
@@ -252,8 +309,6 @@ async def request_approval(data: dict) -> dict:
 
     # In production, this would send Slack message and wait
     # For demo purposes, we'll implement a simple approval
-    from src.services.integrations.slack_client import SlackClient
-
     try:
         slack = SlackClient()
         approval = await slack.request_approval(
@@ -270,12 +325,10 @@ async def request_approval(data: dict) -> dict:
 @activity.defn
 async def execute_remediation(data: dict) -> dict:
     """Execute the remediation action."""
-    from src.services.remediation.executor import RemediationExecutor
-
     incident_data = data["incident"]
     action = data["action"]
 
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     executor = RemediationExecutor()
     result = await executor.execute(
@@ -289,11 +342,9 @@ async def execute_remediation(data: dict) -> dict:
 @activity.defn
 async def verify_remediation(data: dict) -> dict:
     """Verify that remediation was successful."""
-    from src.services.remediation.verifier import RemediationVerifier
-
     incident_data = data["incident"]
 
-    incident = Incident(**incident_data)
+    incident = _incident_from_payload(incident_data)
 
     verifier = RemediationVerifier()
     result = await verifier.verify(
@@ -303,6 +354,29 @@ async def verify_remediation(data: dict) -> dict:
     return result
 
 
+@activity.defn
+async def watch_recovery(data: dict) -> bool:
+    """
+    Poll verification until the remediated workload has recovered.
+
+    Returns True as soon as a check succeeds, or False once timeout_seconds
+    have passed. Heartbeats every poll so the workflow can cancel it.
+    """
+    incident = _incident_from_payload(data["incident"])
+    deadline = time.monotonic() + data["timeout_seconds"]
+
+    verifier = RemediationVerifier()
+    while time.monotonic() < deadline:
+        activity.heartbeat()
+        verification = await verifier.verify(incident=incident)
+        if verification.get("success"):
+            logger.info("Recovery detected before verification", incident_id=str(incident.id))
+            return True
+        await asyncio.sleep(min(RECOVERY_POLL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+    return False
+
+
 @activity.defn
 async def create_ticket(data: dict) -> dict:
     """Create a Jira ticket for the incident."""
@@ -314,8 +388,6 @@ async def create_ticket(data: dict) -> dict:
         logger.info("Jira not configured, skipping ticket creation")
         return {"ticket_id": None}
 
-    from src.services.integrations.slack_client import JiraClient
-
     jira = JiraClient()
     ticket = await jira.create_incident_ticket(
         incident=incident_data,
@@ -332,26 +404,24 @@ async def close_incident(data: dict) -> dict:
     incident_data = data["incident"]
     result = data["result"]
 
+    status = "resolved" if result.get("verification_success") else "closed"
     async with get_session() as session:
-        from sqlalchemy import text
-
-        status = "resolved" if result.get("verification_success") else "closed"
-
-        await session.execute(
+        updated = await session.execute(
             text("""
                 UPDATE incidents 
                 SET status = :status, 
-                    resolved_at = :resolved_at,
-                    updated_at = :updated_at
+                    resolved_at = now(),
+                    updated_at = now()
                 WHERE id = :id
+                RETURNING id
             """),
             {
                 "id": incident_data.get("id"),
                 "status": status,
-                "resolved_at": datetime.now(UTC),
-                "updated_at": datetime.now(UTC),
             }
         )
+        if updated.first() is None:
+            logger.warning("Incident to close not found", incident_id=incident_data.get("id"))
 
     logger.info(
         "Incident closed",
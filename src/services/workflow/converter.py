@@ -0,0 +1,59 @@
+"""
+Temporal Data Converter.
+Encodes workflow and activity payloads with orjson instead of stdlib json.
+"""
+import dataclasses
+from typing import Any
+
+import orjson
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import (
+    AdvancedJSONEncoder,
+    CompositePayloadConverter,
+    DataConverter,
+    DefaultPayloadConverter,
+    JSONPlainPayloadConverter,
+    value_to_type,
+)
+
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# Types orjson does not serialize natively (sets, Pydantic v1 models, other
+# iterables) fall back to the SDK encoder's conversions
+_fallback_encoder = AdvancedJSONEncoder()
+
+
+class OrjsonPlainPayloadConverter(JSONPlainPayloadConverter):
+    """
+    'json/plain' converter backed by orjson.
+
+    Payloads stay plain JSON, so other workers and SDKs read them unchanged.
+    """
+
+    def to_payload(self, value: Any) -> Payload | None:
+        return Payload(
+            metadata={"encoding": self.encoding.encode()},
+            data=orjson.dumps(value, default=_fallback_encoder.default, option=_ORJSON_OPTIONS),
+        )
+
+    def from_payload(self, payload: Payload, type_hint: type | None = None) -> Any:
+        try:
+            obj = orjson.loads(payload.data)
+        except orjson.JSONDecodeError as err:
+            raise RuntimeError("Failed parsing") from err
+        if type_hint:
+            obj = value_to_type(type_hint, obj, self._custom_type_converters)
+        return obj
+
+
+class OrjsonPayloadConverter(CompositePayloadConverter):
+    """The SDK's default converter chain with JSON handled by orjson."""
+
+    def __init__(self) -> None:
+        super().__init__(*(
+            OrjsonPlainPayloadConverter() if isinstance(converter, JSONPlainPayloadConverter) else converter
+            for converter in DefaultPayloadConverter.default_encoding_payload_converters
+        ))
+
+
+data_converter = dataclasses.replace(DataConverter.default, payload_converter_class=OrjsonPayloadConverter)
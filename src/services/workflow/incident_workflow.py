@@ -2,6 +2,7 @@
 Temporal Workflow for Incident Processing.
 Orchestrates the full incident lifecycle from evidence collection to remediation.
 """
+import asyncio
 from datetime import timedelta
 
 from temporalio import workflow
@@ -10,6 +11,10 @@ from temporalio.common import RetryPolicy
 with workflow.unsafe.imports_passed_through():
     pass
 
+# Longest wait between remediation and verification; verification starts
+# earlier once metrics recover (watch_recovery activity or signal)
+VERIFICATION_WAIT = timedelta(minutes=2)
+
 
 @workflow.defn
 class IncidentWorkflow:
@@ -20,15 +25,14 @@ class IncidentWorkflow:
     1. Parse and normalize alert
     2. Scope blast radius
     3. Collect evidence in parallel (K8s, logs, metrics, deploy diffs)
-    4. Build evidence graph
-    5. Generate hypotheses
-    6. Rank hypotheses
-    7. Generate runbook
-    8. Evaluate remediation policy
-    9. Execute remediation (if approved)
-    10. Verify remediation
-    11. Create ticket (if needed)
-    12. Close incident
+    4. Store evidence, build evidence graph and generate hypotheses (concurrently)
+    5. Rank hypotheses
+    6. Generate runbook and calculate blast radius (concurrently)
+    7. Evaluate remediation policy
+    8. Execute remediation (if approved)
+    9. Verify remediation
+    10. Create ticket (if needed)
+    11. Close incident
     """
 
     def __init__(self):
@@ -36,6 +40,7 @@ class IncidentWorkflow:
         self._hypotheses = []
         self._evidence_count = 0
         self._remediation_result = None
+        self._metrics_recovered = False
 
     @workflow.query
     def status(self) -> str:
@@ -52,6 +57,38 @@ class IncidentWorkflow:
         """Query evidence count."""
         return self._evidence_count
 
+    @workflow.signal
+    def metrics_recovered(self) -> None:
+        """Signal that the remediated workload has recovered; verify now."""
+        self._metrics_recovered = True
+
+    def _on_recovery_watch_done(self, watch: asyncio.Task) -> None:
+        if not watch.cancelled() and watch.exception() is None and watch.result():
+            self._metrics_recovered = True
+
+    async def _wait_for_recovery(self, incident_data: dict) -> None:
+        """Wait up to VERIFICATION_WAIT, returning early once metrics recover."""
+        recovery_watch = workflow.start_activity(
+            "watch_recovery",
+            {
+                "incident": incident_data,
+                "timeout_seconds": VERIFICATION_WAIT.total_seconds(),
+            },
+            start_to_close_timeout=VERIFICATION_WAIT + timedelta(seconds=30),
+            heartbeat_timeout=timedelta(seconds=30),
+            retry_policy=RetryPolicy(maximum_attempts=1),
+        )
+        recovery_watch.add_done_callback(self._on_recovery_watch_done)
+        try:
+            await workflow.wait_condition(
+                lambda: self._metrics_recovered,
+                timeout=VERIFICATION_WAIT,
+            )
+        except TimeoutError:
+            pass
+        finally:
+            recovery_watch.cancel()
+
     @workflow.run
     async def run(self, incident_data: dict) -> dict:
         """Execute the incident workflow."""
@@ -93,36 +130,80 @@ class IncidentWorkflow:
             result["steps_completed"].append("evidence_collection")
             result["evidence_count"] = self._evidence_count
 
-            # Step 3: Build evidence graph
-            self._status = "building_graph"
+            # Steps 3-4: Store evidence, build the evidence graph and generate
+            # hypotheses
+            self._status = "analyzing"
 
-            graph_result = await workflow.execute_activity(
-                "build_evidence_graph",
-                {
-                    "incident": incident_data,
-                    "evidence": evidence_results,
-                },
-                start_to_close_timeout=timedelta(minutes=2),
-                retry_policy=default_retry,
-            )
+            evidence_payload = {
+                "incident": incident_data,
+                "evidence": evidence_results,
+            }
+            parallel_analysis = workflow.patched("parallel-analysis")
+            if parallel_analysis:
+                # All three only need the collected evidence, so the Postgres
+                # and Neo4j writes overlap with the analysis
+                _, graph_result, hypotheses = await asyncio.gather(
+                    workflow.start_activity(
+                        "persist_evidence",
+                        evidence_payload,
+                        start_to_close_timeout=timedelta(minutes=2),
+                        retry_policy=default_retry,
+                    ),
+                    workflow.start_activity(
+                        "build_evidence_graph",
+                        evidence_payload,
+                        start_to_close_timeout=timedelta(minutes=2),
+                        retry_policy=default_retry,
+                    ),
+                    workflow.start_activity(
+                        "generate_hypotheses",
+                        evidence_payload,
+                        start_to_close_timeout=timedelta(minutes=3),
+                        retry_policy=default_retry,
+                    ),
+                )
+            elif workflow.patched("persist-evidence"):
+                # Histories recorded before parallel-analysis: the writes
+                # overlap, then hypotheses are generated with the graph
+                _, graph_result = await asyncio.gather(
+                    workflow.start_activity(
+                        "persist_evidence",
+                        evidence_payload,
+                        start_to_close_timeout=timedelta(minutes=2),
+                        retry_policy=default_retry,
+                    ),
+                    workflow.start_activity(
+                        "build_evidence_graph",
+                        evidence_payload,
+                        start_to_close_timeout=timedelta(minutes=2),
+                        retry_policy=default_retry,
+                    ),
+                )
+                hypotheses = await workflow.execute_activity(
+                    "generate_hypotheses",
+                    {**evidence_payload, "graph": graph_result},
+                    start_to_close_timeout=timedelta(minutes=3),
+                    retry_policy=default_retry,
+                )
+            else:
+                # Histories recorded before persist_evidence existed, whose
+                # collect_all_evidence stored the evidence rows itself
+                graph_result = await workflow.execute_activity(
+                    "build_evidence_graph",
+                    evidence_payload,
+                    start_to_close_timeout=timedelta(minutes=2),
+                    retry_policy=default_retry,
+                )
+                hypotheses = await workflow.execute_activity(
+                    "generate_hypotheses",
+                    {**evidence_payload, "graph": graph_result},
+                    start_to_close_timeout=timedelta(minutes=3),
+                    retry_policy=default_retry,
+                )
 
             result["steps_completed"].append("graph_building")
             result["graph_nodes"] = graph_result.get("node_count", 0)
 
-            # Step 4: Generate hypotheses
-            self._status = "analyzing"
-
-            hypotheses = await workflow.execute_activity(
-                "generate_hypotheses",
-                {
-                    "incident": incident_data,
-                    "evidence": evidence_results,
-                    "graph": graph_result,
-                },
-                start_to_close_timeout=timedelta(minutes=3),
-                retry_policy=default_retry,
-            )
-
             self._hypotheses = hypotheses
             result["steps_completed"].append("hypothesis_generation")
             result["hypotheses_count"] = len(hypotheses)
@@ -138,30 +219,47 @@ class IncidentWorkflow:
             result["steps_completed"].append("hypothesis_ranking")
             result["top_hypothesis"] = ranked_hypotheses[0] if ranked_hypotheses else None
 
-            # Step 6: Generate runbook
+            # Steps 6-7: Generate runbook and calculate blast radius; neither
+            # depends on the other
             self._status = "generating_runbook"
 
-            runbook = await workflow.execute_activity(
-                "generate_runbook",
-                {
-                    "incident": incident_data,
-                    "hypotheses": ranked_hypotheses,
-                },
-                start_to_close_timeout=timedelta(seconds=30),
-                retry_policy=quick_retry,
-            )
+            if parallel_analysis:
+                runbook, blast_radius = await asyncio.gather(
+                    workflow.start_activity(
+                        "generate_runbook",
+                        {
+                            "incident": incident_data,
+                            "hypotheses": ranked_hypotheses,
+                        },
+                        start_to_close_timeout=timedelta(seconds=30),
+                        retry_policy=quick_retry,
+                    ),
+                    workflow.start_activity(
+                        "calculate_blast_radius",
+                        incident_data,
+                        start_to_close_timeout=timedelta(seconds=30),
+                        retry_policy=quick_retry,
+                    ),
+                )
+            else:
+                runbook = await workflow.execute_activity(
+                    "generate_runbook",
+                    {
+                        "incident": incident_data,
+                        "hypotheses": ranked_hypotheses,
+                    },
+                    start_to_close_timeout=timedelta(seconds=30),
+                    retry_policy=quick_retry,
+                )
+                blast_radius = await workflow.execute_activity(
+                    "calculate_blast_radius",
+                    incident_data,
+                    start_to_close_timeout=timedelta(seconds=30),
+                    retry_policy=quick_retry,
+                )
 
             result["steps_completed"].append("runbook_generation")
             result["runbook_id"] = runbook.get("id")
-
-            # Step 7: Calculate blast radius
-            blast_radius = await workflow.execute_activity(
-                "calculate_blast_radius",
-                incident_data,
-                start_to_close_timeout=timedelta(seconds=30),
-                retry_policy=quick_retry,
-            )
-
             result["blast_radius"] = blast_radius
 
             # Step 8: Evaluate remediation policy
@@ -224,9 +322,13 @@ class IncidentWorkflow:
                     result["steps_completed"].append("remediation_executed")
                     result["remediation_success"] = remediation_result.get("success", False)
 
-                    # Step 10: Wait and verify
+                    # Step 10: Wait for recovery (bounded) and verify
                     self._status = "verifying"
-                    await workflow.sleep(timedelta(minutes=2))
+                    if workflow.patched("recovery-watch"):
+                        await self._wait_for_recovery(incident_data)
+                    else:
+                        # Histories recorded before recovery-watch: fixed wait
+                        await workflow.sleep(VERIFICATION_WAIT)
 
                     verification = await workflow.execute_activity(
                         "verify_remediation",
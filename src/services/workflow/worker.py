@@ -3,12 +3,19 @@ Temporal Worker for Incident Workflows.
 Runs the workflow and activities.
 """
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 import structlog
 from temporalio.client import Client
 from temporalio.worker import Worker
 
-from src.config import settings
+from src.config import configure_logging, settings
+from src.database import close_database, warm_database_pool
+from src.services.integrations.slack_client import SlackClient
+from src.services.policy.opa_client import OPAClient
+from src.services.rca.llm_summarizer import LLMSummarizer
+from src.services.remediation.verifier import RemediationVerifier
+from src.services.remediation.watch_cache import KubernetesWatchCache
 from src.services.workflow.activities import (
     build_evidence_graph,
     calculate_blast_radius,
@@ -19,14 +26,22 @@ from src.services.workflow.activities import (
     execute_remediation,
     generate_hypotheses,
     generate_runbook,
+    persist_evidence,
     rank_hypotheses,
     request_approval,
     verify_remediation,
+    watch_recovery,
 )
+from src.services.workflow.converter import data_converter
 from src.services.workflow.incident_workflow import IncidentWorkflow
 
 logger = structlog.get_logger()
 
+# Sync (CPU-bound) activities run on this many threads, off the event loop
+ACTIVITY_EXECUTOR_THREADS = 32
+MAX_CONCURRENT_ACTIVITIES = 100
+MAX_CONCURRENT_WORKFLOW_TASKS = 50
+
 
 async def run_worker():
     """Start the Temporal worker."""
@@ -36,16 +51,25 @@ async def run_worker():
         task_queue=settings.temporal_task_queue,
     )
 
-    # Connect to Temporal
-    client = await Client.connect(settings.temporal_address)
+    # Connect to Temporal; open database connections before the first activity
+    client = await Client.connect(settings.temporal_address, data_converter=data_converter)
+    try:
+        await warm_database_pool()
+    except Exception as e:
+        logger.warning("Database pool warm-up failed", error=str(e))
 
     # Create and run worker
+    activity_executor = ThreadPoolExecutor(
+        max_workers=ACTIVITY_EXECUTOR_THREADS,
+        thread_name_prefix="activity",
+    )
     worker = Worker(
         client,
         task_queue=settings.temporal_task_queue,
         workflows=[IncidentWorkflow],
         activities=[
             collect_all_evidence,
+            persist_evidence,
             build_evidence_graph,
             generate_hypotheses,
             rank_hypotheses,
@@ -54,18 +78,32 @@ async def run_worker():
             evaluate_remediation_policy,
             request_approval,
             execute_remediation,
+            watch_recovery,
             verify_remediation,
             create_ticket,
             close_incident,
         ],
+        activity_executor=activity_executor,
+        max_concurrent_activities=MAX_CONCURRENT_ACTIVITIES,
+        max_concurrent_workflow_tasks=MAX_CONCURRENT_WORKFLOW_TASKS,
     )
 
     logger.info("Worker started, listening for tasks")
-    await worker.run()
+    try:
+        await worker.run()
+    finally:
+        await OPAClient.aclose()
+        await LLMSummarizer.aclose()
+        await RemediationVerifier.aclose()
+        await SlackClient.close()
+        KubernetesWatchCache.stop()
+        await close_database()
+        activity_executor.shutdown(wait=False)
 
 
 def main():
     """Main entry point."""
+    configure_logging()
     asyncio.run(run_worker())
 
 
@@ -2,10 +2,17 @@
 Incident Simulator.
 Creates test incidents by deploying faulty apps to Kubernetes.
 """
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any
 
 import click
+import orjson
 import structlog
-from kubernetes import client, config
+import yaml
+
+from src.config import configure_logging
 
 logger = structlog.get_logger()
 
@@ -15,7 +22,6 @@ apiVersion: apps/v1
 kind: Deployment
 metadata:
   name: crashloop-demo
-  namespace: {namespace}
   labels:
     app: crashloop-demo
     simulator: aiops-test
@@ -44,7 +50,6 @@ apiVersion: apps/v1
 kind: Deployment
 metadata:
   name: oom-demo
-  namespace: {namespace}
   labels:
     app: oom-demo
     simulator: aiops-test
@@ -73,7 +78,6 @@ apiVersion: apps/v1
 kind: Deployment
 metadata:
   name: imagepull-demo
-  namespace: {namespace}
   labels:
     app: imagepull-demo
     simulator: aiops-test
@@ -101,7 +105,6 @@ apiVersion: apps/v1
 kind: Deployment
 metadata:
   name: slowapp-demo
-  namespace: {namespace}
   labels:
     app: slowapp-demo
     simulator: aiops-test
@@ -148,7 +151,9 @@ apiVersion: v1
 kind: Service
 metadata:
   name: slowapp-demo
-  namespace: {namespace}
+  labels:
+    app: slowapp-demo
+    simulator: aiops-test
 spec:
   selector:
     app: slowapp-demo
@@ -158,121 +163,224 @@ spec:
 """
 
 
+# Server-side apply owner of the simulator's fields
+FIELD_MANAGER = "aiops-simulator"
+
+# Label carried by every simulator resource
+SIMULATOR_SELECTOR = "simulator=aiops-test"
+
+# Lists only object metadata (PartialObjectMetadataList)
+METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"
+
+# Concurrent per-item deletes when collection delete is unavailable
+CLEANUP_WORKERS = 10
+
+# Connections kept by the shared API client; above any worker count here
+API_POOL_MAXSIZE = 32
+
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_manifest(manifest: str) -> tuple[dict, ...]:
+    """Parse a multi-document manifest; namespaces are set per create."""
+    return tuple(doc for doc in yaml.load_all(manifest, Loader=_YAML_LOADER) if doc is not None)
+
+
 class IncidentSimulator:
     """Creates test incidents in Kubernetes."""
 
+    # Manifests are parsed once at import and shared by every create
     SCENARIOS = {
-        "crashloop": CRASHLOOP_MANIFEST,
-        "oom": OOM_MANIFEST,
-        "imagepull": IMAGE_PULL_MANIFEST,
-        "slowapp": SLOW_APP_MANIFEST,
+        "crashloop": _parse_manifest(CRASHLOOP_MANIFEST),
+        "oom": _parse_manifest(OOM_MANIFEST),
+        "imagepull": _parse_manifest(IMAGE_PULL_MANIFEST),
+        "slowapp": _parse_manifest(SLOW_APP_MANIFEST),
     }
 
-    def __init__(self, kubeconfig: str = None):
-        if kubeconfig:
-            config.load_kube_config(kubeconfig)
-        else:
-            try:
-                config.load_incluster_config()
-            except config.ConfigException:
-                config.load_kube_config()
+    # One ApiClient (and urllib3 connection pool) per kubeconfig per process.
+    # The kubernetes package is imported on first use so `list` and --help
+    # stay fast.
+    _api_clients: dict[str | None, Any] = {}
+    _client_lock = threading.Lock()
 
-        self.apps_v1 = client.AppsV1Api()
-        self.core_v1 = client.CoreV1Api()
+    def __init__(self, kubeconfig: str = None):
+        from kubernetes import client
+
+        api_client = self._get_api_client(kubeconfig)
+        self.apps_v1 = client.AppsV1Api(api_client)
+        self.core_v1 = client.CoreV1Api(api_client)
+
+        # Server-side apply call per manifest kind
+        self._patch_funcs = {
+            "Deployment": self.apps_v1.patch_namespaced_deployment,
+            "Service": self.core_v1.patch_namespaced_service,
+        }
+
+    @classmethod
+    def _get_api_client(cls, kubeconfig: str | None) -> Any:
+        """
+        Resolve kubeconfig into its own Configuration once and cache the API
+        client built on it; the global default configuration is left alone.
+        """
+        api_client = cls._api_clients.get(kubeconfig)
+        if api_client is None:
+            from kubernetes import client, config
+
+            with cls._client_lock:
+                api_client = cls._api_clients.get(kubeconfig)
+                if api_client is None:
+                    configuration = client.Configuration()
+                    if kubeconfig:
+                        config.load_kube_config(kubeconfig, client_configuration=configuration)
+                    else:
+                        try:
+                            config.load_incluster_config(client_configuration=configuration)
+                        except config.ConfigException:
+                            config.load_kube_config(client_configuration=configuration)
+
+                    configuration.connection_pool_maxsize = API_POOL_MAXSIZE
+                    api_client = client.ApiClient(configuration)
+                    cls._api_clients[kubeconfig] = api_client
+
+        return api_client
 
     def create_scenario(self, scenario: str, namespace: str = "default") -> bool:
         """Create a test scenario."""
-        if scenario not in self.SCENARIOS:
-            logger.error(f"Unknown scenario: {scenario}")
+        templates = self.SCENARIOS.get(scenario)
+        if templates is None:
+            logger.error("Unknown scenario", scenario=scenario)
             return False
 
-        manifest = self.SCENARIOS[scenario].format(namespace=namespace)
+        # Only metadata differs per create, so the rest of each template is
+        # shared rather than deep-copied; the client never mutates the body
+        docs = [
+            {**template, "metadata": {**template["metadata"], "namespace": namespace}}
+            for template in templates
+        ]
 
         try:
-            # Parse and create resources
-            import yaml
-
-            for doc in yaml.safe_load_all(manifest):
-                if doc is None:
-                    continue
-
-                kind = doc.get("kind")
-
-                if kind == "Deployment":
-                    try:
-                        self.apps_v1.delete_namespaced_deployment(
-                            name=doc["metadata"]["name"],
-                            namespace=namespace,
-                        )
-                    except client.ApiException:
-                        pass
-
-                    self.apps_v1.create_namespaced_deployment(
-                        namespace=namespace,
-                        body=doc,
-                    )
-                    logger.info(f"Created deployment: {doc['metadata']['name']}")
-
-                elif kind == "Service":
-                    try:
-                        self.core_v1.delete_namespaced_service(
-                            name=doc["metadata"]["name"],
-                            namespace=namespace,
-                        )
-                    except client.ApiException:
-                        pass
-
-                    self.core_v1.create_namespaced_service(
-                        namespace=namespace,
-                        body=doc,
-                    )
-                    logger.info(f"Created service: {doc['metadata']['name']}")
-
+            with ThreadPoolExecutor(max_workers=len(docs)) as pool:
+                for future in [pool.submit(self._apply, doc, namespace) for doc in docs]:
+                    future.result()
             return True
 
         except Exception as e:
             logger.error("Failed to create scenario", error=str(e))
             return False
 
+    def _apply(self, doc: dict, namespace: str) -> None:
+        """Server-side apply doc: one idempotent PATCH creates or updates it."""
+        kind = doc["kind"]
+        name = doc["metadata"]["name"]
+        patch_func = self._patch_funcs.get(kind)
+        if patch_func is None:
+            return
+
+        # The applied object is returned in full; errors still raise, so the
+        # body is discarded unread instead of decoded into a model
+        response = patch_func(
+            name=name,
+            namespace=namespace,
+            body=doc,
+            field_manager=FIELD_MANAGER,
+            force=True,
+            _content_type="application/apply-patch+yaml",
+            _preload_content=False,
+        )
+        response.drain_conn()
+        response.release_conn()
+        logger.info("Applied resource", kind=kind, name=name, namespace=namespace)
+
     def cleanup(self, namespace: str = "default") -> None:
         """Clean up all simulator resources."""
+        from kubernetes.client import ApiException
+
         try:
-            deployments = self.apps_v1.list_namespaced_deployment(
+            # Collection deletes: one call per kind, fanned out server-side
+            self.apps_v1.delete_collection_namespaced_deployment(
                 namespace=namespace,
-                label_selector="simulator=aiops-test",
+                label_selector=SIMULATOR_SELECTOR,
+                propagation_policy="Background",
+                grace_period_seconds=0,
             )
+            logger.info("Deleted simulator deployments", namespace=namespace)
 
-            for deploy in deployments.items:
-                self.apps_v1.delete_namespaced_deployment(
-                    name=deploy.metadata.name,
+            try:
+                self.core_v1.delete_collection_namespaced_service(
                     namespace=namespace,
+                    label_selector=SIMULATOR_SELECTOR,
+                    propagation_policy="Background",
                 )
-                logger.info(f"Deleted deployment: {deploy.metadata.name}")
-
-            services = self.core_v1.list_namespaced_service(
-                namespace=namespace,
-                label_selector="simulator=aiops-test",
-            )
-
-            for svc in services.items:
-                self.core_v1.delete_namespaced_service(
-                    name=svc.metadata.name,
-                    namespace=namespace,
+            except ApiException as e:
+                # API servers older than 1.23 do not serve this endpoint
+                if e.status != 405:
+                    raise
+                self._delete_each(
+                    self.core_v1.list_namespaced_service,
+                    self.core_v1.delete_namespaced_service,
+                    "service",
+                    namespace,
                 )
-                logger.info(f"Deleted service: {svc.metadata.name}")
+            logger.info("Deleted simulator services", namespace=namespace)
 
         except Exception as e:
             logger.error("Cleanup failed", error=str(e))
 
-    def list_scenarios(self) -> list[str]:
+    def _delete_each(
+        self,
+        list_func: Callable[..., Any],
+        delete_func: Callable[..., Any],
+        kind: str,
+        namespace: str,
+    ) -> None:
+        """Delete simulator resources one by one, concurrently."""
+        # Metadata-only listing: the server returns name stubs, which are read
+        # as raw JSON rather than deserialized into full models
+        response = list_func(
+            namespace=namespace,
+            label_selector=SIMULATOR_SELECTOR,
+            _headers={"Accept": METADATA_LIST_ACCEPT},
+            _preload_content=False,
+        )
+        names = [item["metadata"]["name"] for item in orjson.loads(response.data)["items"]]
+        response.release_conn()
+
+        from kubernetes.client import ApiException
+
+        def delete(name: str) -> None:
+            try:
+                response = delete_func(
+                    name=name,
+                    namespace=namespace,
+                    propagation_policy="Background",
+                    _preload_content=False,
+                )
+            except ApiException as e:
+                # Already gone since the listing; nothing left to delete
+                if e.status != 404:
+                    raise
+                return
+            response.drain_conn()
+            response.release_conn()
+            logger.info("Deleted resource", kind=kind, name=name, namespace=namespace)
+
+        with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as pool:
+            done, _ = wait([pool.submit(delete, name) for name in names], return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+
+    @classmethod
+    def list_scenarios(cls) -> list[str]:
         """List available scenarios."""
-        return list(self.SCENARIOS.keys())
+        return list(cls.SCENARIOS.keys())
 
 
 @click.group()
-def cli():
+@click.option("--verbose", "-v", is_flag=True, help="Log each resource applied or deleted")
+def cli(verbose: bool):
     """AIOps Incident Simulator CLI."""
-    pass
+    configure_logging("INFO" if verbose else "WARNING")
 
 
 @cli.command()
@@ -284,10 +392,15 @@ def create(scenario: str, namespace: str, kubeconfig: str):
     simulator = IncidentSimulator(kubeconfig)
 
     if scenario == "all":
-        for s in simulator.list_scenarios():
-            simulator.create_scenario(s, namespace)
+        scenarios = simulator.list_scenarios()
+        with ThreadPoolExecutor(max_workers=len(scenarios)) as pool:
+            results = list(pool.map(lambda s: simulator.create_scenario(s, namespace), scenarios))
+        created = all(results)
     else:
-        simulator.create_scenario(scenario, namespace)
+        created = simulator.create_scenario(scenario, namespace)
+
+    if not created:
+        raise click.ClickException(f"Failed to create scenario: {scenario} in namespace: {namespace}")
 
     click.echo(f"✅ Created scenario: {scenario} in namespace: {namespace}")
     click.echo("Watch for alerts in your monitoring system...")
@@ -306,9 +419,8 @@ def cleanup(namespace: str, kubeconfig: str):
 @cli.command("list")
 def list_scenarios():
     """List available test scenarios."""
-    simulator = IncidentSimulator()
     click.echo("Available scenarios:")
-    for s in simulator.list_scenarios():
+    for s in IncidentSimulator.list_scenarios():
         click.echo(f"  - {s}")
 
 
@@ -0,0 +1,71 @@
+"""Tests for workflow activities and their helpers."""
+from contextlib import asynccontextmanager
+
+from temporalio.testing import ActivityEnvironment
+
+from src.models import IncidentSeverity
+from src.services.remediation.verifier import RemediationVerifier
+from src.services.workflow import activities
+from src.services.workflow.activities import _incident_from_payload, _parse_incident
+
+
+def test_incident_payload_parsed_once_and_copied(incident):
+    _parse_incident.cache_clear()
+    payload = incident.model_dump(mode="json")
+
+    first = _incident_from_payload(payload)
+    second = _incident_from_payload(dict(payload))
+
+    assert first == incident
+    assert first is not second
+    assert second.severity is IncidentSeverity(payload["severity"])
+    assert _parse_incident.cache_info().hits == 1
+
+
+async def test_watch_recovery_returns_once_verification_succeeds(incident, monkeypatch):
+    results = iter([{"success": False}, {"success": True}])
+
+    async def verify(self, incident):
+        return next(results)
+
+    monkeypatch.setattr(RemediationVerifier, "verify", verify)
+    monkeypatch.setattr(activities, "RECOVERY_POLL_SECONDS", 0)
+    data = {"incident": incident.model_dump(mode="json"), "timeout_seconds": 60}
+
+    assert await ActivityEnvironment().run(activities.watch_recovery, data) is True
+
+
+async def test_watch_recovery_gives_up_at_timeout(incident):
+    data = {"incident": incident.model_dump(mode="json"), "timeout_seconds": 0}
+
+    assert await ActivityEnvironment().run(activities.watch_recovery, data) is False
+
+
+async def test_persist_evidence_inserts_in_bounded_batches(incident, monkeypatch):
+    executed: list[dict] = []
+
+    class FakeSession:
+        async def execute(self, statement, params):
+            executed.append(params)
+
+    @asynccontextmanager
+    async def get_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(activities, "get_session", get_session)
+    monkeypatch.setattr(activities, "EVIDENCE_INSERT_BATCH", 2)
+    evidence = [
+        {
+            "id": str(i), "evidence_type": "pod_status", "source": "kubernetes",
+            "entity_name": "api", "entity_namespace": "prod", "data": {}, "signal_strength": 0.5,
+        }
+        for i in range(5)
+    ]
+
+    count = await activities.persist_evidence({
+        "incident": incident.model_dump(mode="json"),
+        "evidence": {"evidence": evidence},
+    })
+
+    assert count == 5
+    assert [p["ids"] for p in executed] == [["0", "1"], ["2", "3"], ["4"]]
@@ -1,9 +1,33 @@
 """Tests for alert deduplication against a fake Redis client."""
+import asyncio
 from datetime import timedelta
 
 import pytest
 
-from src.services.ingestion.deduplicator import AlertDeduplicator
+from src.config import settings
+from src.services.ingestion.deduplicator import AlertDeduplicator, FingerprintBloomFilter
+
+
+class FakePipeline:
+    """Queues commands and applies them to the owning FakeRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value))
+
+    def incr(self, key):
+        self.commands.append((key, None))
+
+    def expire(self, key, ttl):
+        pass
+
+    async def execute(self):
+        for key, value in self.commands:
+            self.redis.store[key] = value
+        return [True] * len(self.commands)
 
 
 class FakeRedis:
@@ -27,13 +51,28 @@ class FakeRedis:
     async def expire(self, key, ttl):
         return key in self.store
 
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = (match or "").rstrip("*")
+        for key in list(self.store):
+            if key.startswith(prefix):
+                yield key
+
 
 @pytest.fixture(autouse=True)
 def fake_redis(monkeypatch):
     fake = FakeRedis()
     monkeypatch.setattr(AlertDeduplicator, "_redis_client", fake)
+    AlertDeduplicator._recent.clear()
     yield fake
     AlertDeduplicator._redis_client = None
+    AlertDeduplicator._bloom = None
+    AlertDeduplicator._bloom_built_at = 0.0
 
 
 async def test_new_fingerprint_is_not_a_duplicate(fake_redis):
@@ -72,3 +111,112 @@ async def test_register_fingerprint_uses_default_ttl(fake_redis, monkeypatch):
     await AlertDeduplicator.register_fingerprint("fp-1", "incident-123")
 
     assert captured["ex"] == int(timedelta(hours=4).total_seconds())
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = FingerprintBloomFilter(capacity=1000)
+    fingerprints = [f"fp-{i}" for i in range(1000)]
+    for fp in fingerprints:
+        bloom.add(fp)
+
+    assert all(fp in bloom for fp in fingerprints)
+    assert "never-added" not in bloom
+
+
+async def test_bloom_miss_skips_redis_get(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_bloom_filter_enabled", True)
+    calls = []
+
+    async def tracking_get(key):
+        calls.append(key)
+        return fake_redis.store.get(key)
+
+    monkeypatch.setattr(fake_redis, "get", tracking_get)
+
+    is_duplicate, _ = await AlertDeduplicator.check_duplicate("fp-new")
+
+    assert is_duplicate is False
+    assert calls == []
+
+
+async def test_bloom_is_seeded_from_existing_redis_keys(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_bloom_filter_enabled", True)
+    fake_redis.store["aiops:fingerprint:fp-existing"] = "incident-9"
+
+    is_duplicate, existing_id = await AlertDeduplicator.check_duplicate("fp-existing")
+
+    assert is_duplicate is True
+    assert existing_id == "incident-9"
+
+
+async def test_registered_fingerprint_is_added_to_bloom(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_bloom_filter_enabled", True)
+    await AlertDeduplicator.check_duplicate("fp-warmup")
+
+    await AlertDeduplicator.register_fingerprint("fp-1", "incident-123")
+
+    assert await AlertDeduplicator.check_duplicate("fp-1") == (True, "incident-123")
+
+
+async def test_concurrent_checks_share_one_bloom_rebuild(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_bloom_filter_enabled", True)
+    scans = []
+    scan_iter = fake_redis.scan_iter
+
+    async def tracking_scan_iter(match=None, count=None):
+        scans.append(match)
+        await asyncio.sleep(0)
+        async for key in scan_iter(match=match, count=count):
+            yield key
+
+    monkeypatch.setattr(fake_redis, "scan_iter", tracking_scan_iter)
+
+    await asyncio.gather(*(AlertDeduplicator.check_duplicate(f"fp-{i}") for i in range(5)))
+
+    assert len(scans) == 1
+
+
+async def test_failed_bloom_rebuild_backs_off(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "dedup_bloom_filter_enabled", True)
+    scans = []
+
+    def failing_scan_iter(match=None, count=None):
+        scans.append(match)
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(fake_redis, "scan_iter", failing_scan_iter)
+    fake_redis.store["aiops:fingerprint:fp-1"] = "incident-1"
+
+    assert await AlertDeduplicator.check_duplicate("fp-1") == (True, "incident-1")
+    AlertDeduplicator._recent.clear()
+    assert await AlertDeduplicator.check_duplicate("fp-1") == (True, "incident-1")
+
+    assert len(scans) == 1
+
+
+async def test_check_duplicates_bulk_preserves_order(fake_redis):
+    await AlertDeduplicator.register_fingerprint("fp-2", "incident-2")
+
+    results = await AlertDeduplicator.check_duplicates_bulk(["fp-1", "fp-2", "fp-3"])
+
+    assert results == [(False, None), (True, "incident-2"), (False, None)]
+
+
+async def test_register_fingerprints_bulk_registers_all(fake_redis):
+    await AlertDeduplicator.register_fingerprints_bulk({"fp-1": "incident-1", "fp-2": "incident-2"})
+
+    results = await AlertDeduplicator.check_duplicates_bulk(["fp-1", "fp-2"])
+
+    assert results == [(True, "incident-1"), (True, "incident-2")]
+
+
+async def test_confirmed_duplicate_is_served_from_local_cache(fake_redis, monkeypatch):
+    await AlertDeduplicator.register_fingerprint("fp-1", "incident-123")
+    await AlertDeduplicator.check_duplicate("fp-1")
+
+    async def failing_get(key):
+        raise AssertionError("Redis should not be queried")
+
+    monkeypatch.setattr(fake_redis, "get", failing_get)
+
+    assert await AlertDeduplicator.check_duplicate("fp-1") == (True, "incident-123")
@@ -0,0 +1,66 @@
+"""Tests for remediation execution against a fake Kubernetes API."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.remediation.executor import RemediationExecutor
+
+
+def make_replica_set(revision: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        metadata=SimpleNamespace(annotations={"deployment.kubernetes.io/revision": revision}),
+        spec=SimpleNamespace(template=f"template-{revision}"),
+    )
+
+
+@pytest.fixture
+def executor() -> RemediationExecutor:
+    executor = RemediationExecutor.__new__(RemediationExecutor)
+    executor.core_v1 = MagicMock()
+    executor.apps_v1 = MagicMock()
+    return executor
+
+
+async def test_rollback_restores_second_newest_revision(executor, incident):
+    deploy = SimpleNamespace(spec=SimpleNamespace(template="current"))
+    executor.apps_v1.read_namespaced_deployment.return_value = deploy
+    executor.apps_v1.list_namespaced_replica_set.return_value = SimpleNamespace(
+        items=[make_replica_set("3"), make_replica_set("10"), make_replica_set("9")],
+    )
+
+    result = await executor.execute(incident, "rollback_deployment")
+
+    assert result["success"] is True
+    assert deploy.spec.template == "template-9"
+    executor.apps_v1.replace_namespaced_deployment.assert_called_once()
+
+
+async def test_rollback_without_previous_revision_fails(executor, incident):
+    executor.apps_v1.list_namespaced_replica_set.return_value = SimpleNamespace(items=[make_replica_set("1")])
+
+    result = await executor.execute(incident, "rollback_deployment")
+
+    assert result == {"success": False, "error": "No previous revision available"}
+
+
+def make_pod_list(*names: str) -> SimpleNamespace:
+    return SimpleNamespace(items=[SimpleNamespace(metadata=SimpleNamespace(name=n)) for n in names])
+
+
+async def test_restart_pod_prefers_pod_that_is_not_running(executor, incident):
+    executor.core_v1.list_namespaced_pod.return_value = make_pod_list("api-pending")
+
+    result = await executor.execute(incident, "restart_pod")
+
+    assert result["pod"] == "api-pending"
+    assert executor.core_v1.list_namespaced_pod.call_args.kwargs["field_selector"] == "status.phase!=Running"
+
+
+async def test_restart_pod_falls_back_to_first_pod(executor, incident):
+    executor.core_v1.list_namespaced_pod.side_effect = [make_pod_list(), make_pod_list("api-1")]
+
+    result = await executor.execute(incident, "restart_pod")
+
+    assert result["pod"] == "api-1"
+    assert "field_selector" not in executor.core_v1.list_namespaced_pod.call_args.kwargs
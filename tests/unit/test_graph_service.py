@@ -0,0 +1,93 @@
+"""Tests for batched evidence graph writes."""
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.database import neo4j
+from src.database.neo4j import GraphService
+from src.models import GraphEntity, GraphRelation
+
+
+class FakeSession:
+    def __init__(self):
+        self.runs: list[tuple[str, dict]] = []
+
+    async def run(self, query: str, **params):
+        self.runs.append((query, params))
+
+
+@pytest.fixture
+def session(monkeypatch) -> FakeSession:
+    session = FakeSession()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(neo4j, "get_neo4j_session", fake_session)
+    return session
+
+
+async def test_entities_merged_with_one_statement_per_label_and_batch(session):
+    entities = [
+        GraphEntity(id=f"pod:{i}", type="Pod", properties={"name": f"p{i}"}) for i in range(5)
+    ] + [GraphEntity(id="node:1", type="Node")]
+
+    count = await GraphService.create_entities_batch(entities, batch_size=2)
+
+    assert count == 6
+    assert len(session.runs) == 4
+    assert "MERGE (n:Pod {id: row.id})" in session.runs[0][0]
+    assert session.runs[0][1]["rows"][0] == {"id": "pod:0", "properties": {"name": "p0", "id": "pod:0"}}
+    assert "MERGE (n:Node {id: row.id})" in session.runs[3][0]
+
+
+async def test_relations_grouped_by_type(session):
+    relations = [
+        GraphRelation(source_id="d", target_id="p1", relation_type="OWNS"),
+        GraphRelation(source_id="p1", target_id="n", relation_type="SCHEDULED_ON"),
+        GraphRelation(source_id="d", target_id="p2", relation_type="OWNS"),
+    ]
+
+    count = await GraphService.create_relations_batch(relations)
+
+    assert count == 3
+    assert len(session.runs) == 2
+    assert "[r:OWNS]" in session.runs[0][0]
+    assert [row["target_id"] for row in session.runs[0][1]["rows"]] == ["p1", "p2"]
+
+
+async def test_large_groups_use_concurrent_transactions_when_supported(session, monkeypatch):
+    monkeypatch.setattr(neo4j.Neo4jConnection, "_concurrent_transactions", True)
+    entities = [GraphEntity(id=f"pod:{i}", type="Pod") for i in range(neo4j.CONCURRENT_WRITE_THRESHOLD + 1)]
+
+    await GraphService.create_entities_batch(entities)
+    await GraphService.create_entities_batch(entities[:10])
+
+    assert "IN CONCURRENT TRANSACTIONS OF 1000 ROWS" in session.runs[0][0]
+    assert "CONCURRENT" not in session.runs[1][0]
+
+
+async def test_large_relation_groups_stay_on_the_serial_path(session, monkeypatch):
+    monkeypatch.setattr(neo4j.Neo4jConnection, "_concurrent_transactions", True)
+    relations = [
+        GraphRelation(source_id=f"pod:{i}", target_id="node:1", relation_type="SCHEDULED_ON")
+        for i in range(neo4j.CONCURRENT_WRITE_THRESHOLD + 1)
+    ]
+
+    await GraphService.create_relations_batch(relations)
+
+    assert "CONCURRENT" not in session.runs[0][0]
+
+
+async def test_duplicate_entities_are_folded_into_one_row(session):
+    entities = [
+        GraphEntity(id="pod:1", type="Pod", properties={"name": "p1"}),
+        GraphEntity(id="pod:1", type="Pod", properties={"phase": "Failed"}),
+    ]
+
+    await GraphService.create_entities_batch(entities)
+
+    assert session.runs[0][1]["rows"] == [
+        {"id": "pod:1", "properties": {"name": "p1", "phase": "Failed", "id": "pod:1"}}
+    ]
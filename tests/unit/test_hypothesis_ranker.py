@@ -1,5 +1,5 @@
 """Tests for hypothesis ranking."""
-from src.services.rca.hypothesis_ranker import HypothesisRanker
+from src.services.rca.hypothesis_ranker import CATEGORY_CODES, HypothesisRanker
 
 
 def make_hypothesis(category: str, confidence: float, support_count: int = 0, signal_strength: float = 0.0) -> dict:
@@ -47,3 +47,19 @@ def test_evidence_support_boosts_score():
 
     assert ranked[0]["support_count"] == 5
     assert ranked[0]["final_score"] > ranked[1]["final_score"]
+
+
+def test_stamped_category_code_matches_category_lookup():
+    by_name = make_hypothesis("bad_deployment", 0.6)
+    by_code = make_hypothesis("bad_deployment", 0.6)
+    by_code["category_code"] = CATEGORY_CODES["bad_deployment"]
+
+    ranked = HypothesisRanker().rank([by_name, by_code])
+
+    assert ranked[0]["final_score"] == ranked[1]["final_score"]
+
+
+def test_unrecognized_category_gets_neutral_weight():
+    ranked = HypothesisRanker().rank([make_hypothesis("made_up", 0.5)])
+
+    assert ranked[0]["final_score"] == 0.5
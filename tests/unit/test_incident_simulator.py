@@ -0,0 +1,79 @@
+"""Tests for the incident simulator against a fake Kubernetes API client."""
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from kubernetes.client import ApiException
+
+from src.simulator import incident_simulator
+from src.simulator.incident_simulator import FIELD_MANAGER, IncidentSimulator, cli
+
+
+@pytest.fixture
+def api_client(monkeypatch) -> MagicMock:
+    """Shared ApiClient stand-in; the generated API methods run for real on top of it."""
+    api_client = MagicMock()
+    monkeypatch.setattr(IncidentSimulator, "_api_clients", {None: api_client})
+    return api_client
+
+
+def test_apply_sends_server_side_apply_patch(api_client):
+    [deployment, _] = IncidentSimulator.SCENARIOS["slowapp"]
+
+    IncidentSimulator()._apply({**deployment, "metadata": {**deployment["metadata"], "namespace": "demo"}}, "demo")
+
+    request = api_client.param_serialize.call_args.kwargs
+    assert request["method"] == "PATCH"
+    assert request["resource_path"] == "/apis/apps/v1/namespaces/{namespace}/deployments/{name}"
+    assert request["path_params"] == {"name": "slowapp-demo", "namespace": "demo"}
+    assert request["header_params"]["Content-Type"] == "application/apply-patch+yaml"
+    assert ("fieldManager", FIELD_MANAGER) in request["query_params"]
+    assert ("force", True) in request["query_params"]
+    response = api_client._call_with_legacy_options.return_value
+    response.release_conn.assert_called_once()
+
+
+def test_apply_routes_services_to_the_core_api(api_client):
+    [_, service] = IncidentSimulator.SCENARIOS["slowapp"]
+
+    IncidentSimulator()._apply(service, "demo")
+
+    request = api_client.param_serialize.call_args.kwargs
+    assert request["resource_path"] == "/api/v1/namespaces/{namespace}/services/{name}"
+
+
+def test_create_command_fails_when_scenario_is_not_created(api_client, monkeypatch):
+    monkeypatch.setattr(incident_simulator, "configure_logging", lambda level: None)
+    monkeypatch.setattr(IncidentSimulator, "create_scenario", lambda self, scenario, namespace: False)
+
+    result = CliRunner().invoke(cli, ["create", "--scenario", "oom"])
+
+    assert result.exit_code != 0
+    assert "Failed to create scenario: oom" in result.output
+
+
+def test_cleanup_falls_back_to_metadata_listing_and_per_item_deletes(api_client):
+    requests: list[dict] = []
+
+    def call(request, *args):
+        requests.append(request)
+        if request["resource_path"] == "/api/v1/namespaces/{namespace}/services":
+            if request["method"] == "DELETE":
+                raise ApiException(status=405)
+            response = MagicMock()
+            response.data = b'{"items": [{"metadata": {"name": "svc-a"}}, {"metadata": {"name": "svc-b"}}]}'
+            return response
+        return MagicMock()
+
+    api_client.param_serialize.side_effect = lambda **request: request
+    api_client._call_with_legacy_options.side_effect = call
+
+    IncidentSimulator().cleanup("demo")
+
+    listing = next(r for r in requests if r["method"] == "GET")
+    assert listing["header_params"]["Accept"] == incident_simulator.METADATA_LIST_ACCEPT
+    deleted = sorted(
+        r["path_params"]["name"] for r in requests
+        if r["resource_path"] == "/api/v1/namespaces/{namespace}/services/{name}"
+    )
+    assert deleted == ["svc-a", "svc-b"]
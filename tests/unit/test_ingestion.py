@@ -0,0 +1,107 @@
+"""Tests for batched incident creation in the ingestion service."""
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+import src.database
+from src.models import IncidentCreate, IncidentSeverity, IncidentSource
+from src.services.ingestion import main
+from src.services.ingestion.deduplicator import AlertDeduplicator
+
+
+def make_incident_create(fingerprint: str) -> IncidentCreate:
+    return IncidentCreate(
+        fingerprint=fingerprint,
+        title=f"Alert {fingerprint}",
+        severity=IncidentSeverity.HIGH,
+        source=IncidentSource.ALERTMANAGER,
+        cluster="test-cluster",
+        namespace="default",
+        started_at=datetime.now(UTC),
+    )
+
+
+class FakeSession:
+    """Session whose incidents table already holds some fingerprints."""
+
+    def __init__(self, existing: set[str]):
+        self.existing = existing
+        self.statements: list[str] = []
+        self.copied: dict[str, list[tuple]] = {}
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        if statement is main.INSERT_INCIDENT_SQL:
+            return self._insert(zip(params["id"], params["fingerprint"]))
+        if statement is main.INSERT_STAGED_INCIDENTS_SQL:
+            return self._insert((row[0], row[1]) for row in self.copied["incidents_staging"])
+        return None
+
+    def _insert(self, rows):
+        inserted = [incident_id for incident_id, fingerprint in rows if fingerprint not in self.existing]
+        return SimpleNamespace(scalars=lambda: iter(inserted))
+
+    async def connection(self):
+        session = self
+
+        class Connection:
+            async def get_raw_connection(self):
+                async def copy_records_to_table(table, records, columns):
+                    assert columns == main.INCIDENT_COLUMNS
+                    session.copied[table] = records
+
+                return SimpleNamespace(driver_connection=SimpleNamespace(copy_records_to_table=copy_records_to_table))
+
+        return Connection()
+
+
+@pytest.fixture
+def registered(monkeypatch) -> dict:
+    registered: dict = {}
+
+    async def register_fingerprints_bulk(fingerprints: dict) -> None:
+        registered.update(fingerprints)
+
+    monkeypatch.setattr(AlertDeduplicator, "register_fingerprints_bulk", register_fingerprints_bulk)
+    return registered
+
+
+def use_session(monkeypatch, session: FakeSession) -> None:
+    @asynccontextmanager
+    async def get_session():
+        yield session
+
+    monkeypatch.setattr(src.database, "get_session", get_session)
+
+
+async def test_existing_fingerprint_is_skipped_not_fatal(monkeypatch, registered):
+    session = FakeSession(existing={"fp-stale"})
+    use_session(monkeypatch, session)
+
+    incidents = await main.create_incidents([make_incident_create("fp-new"), make_incident_create("fp-stale")])
+
+    assert [i.fingerprint for i in incidents] == ["fp-new"]
+    assert set(registered) == {"fp-new"}
+    assert "ON CONFLICT (fingerprint) DO NOTHING" in session.statements[0]
+
+
+async def test_manual_incident_reports_conflict_when_nothing_inserted(monkeypatch, registered):
+    use_session(monkeypatch, FakeSession(existing={"fp-stale"}))
+
+    assert await main.create_incident(make_incident_create("fp-stale")) is None
+    assert registered == {}
+
+
+async def test_copy_burst_skips_existing_fingerprints(monkeypatch, registered):
+    session = FakeSession(existing={"fp-3"})
+    use_session(monkeypatch, session)
+    batch = [make_incident_create(f"fp-{i}") for i in range(main.COPY_INSERT_THRESHOLD)]
+
+    incidents = await main.create_incidents(batch)
+
+    assert "incidents" not in session.copied
+    assert len(session.copied["incidents_staging"]) == main.COPY_INSERT_THRESHOLD
+    assert "fp-3" not in {i.fingerprint for i in incidents}
+    assert len(incidents) == main.COPY_INSERT_THRESHOLD - 1
@@ -0,0 +1,200 @@
+"""Tests for LLM hypothesis enhancement."""
+import pytest
+
+from src.config import settings
+from src.services.rca.llm_summarizer import LLMSummarizer
+
+
+@pytest.fixture(autouse=True)
+def clear_enhancement_cache():
+    LLMSummarizer._enhancement_cache.clear()
+    LLMSummarizer._pattern_cache.clear()
+    yield
+    LLMSummarizer._enhancement_cache.clear()
+    LLMSummarizer._pattern_cache.clear()
+
+
+def make_summarizer(responses: list[str]) -> tuple[LLMSummarizer, list[str]]:
+    """Build a summarizer whose provider replies with canned responses in order."""
+    summarizer = LLMSummarizer()
+    prompts: list[str] = []
+
+    async def complete(prompt: str, max_tokens: int) -> str:
+        prompts.append(prompt)
+        return responses.pop(0)
+
+    summarizer._complete = complete
+    return summarizer, prompts
+
+
+async def test_top_hypotheses_enhanced_with_single_batched_call():
+    summarizer, prompts = make_summarizer([
+        '{"hypotheses": [{"id": 2, "reasoning": "r2"}, {"id": 1, "reasoning": "r1"}]}',
+    ])
+    hypotheses = [{"title": "a"}, {"title": "b"}]
+
+    result = await summarizer.enhance_hypotheses(hypotheses, [{"summary": "OOMKilled"}])
+
+    assert len(prompts) == 1
+    assert "[H1] title=a" in prompts[0] and "[H2] title=b" in prompts[0]
+    assert [h["reasoning"] for h in result] == ["r1", "r2"]
+    assert "id" not in result[0]
+
+
+async def test_missing_batch_entries_fall_back_to_single_prompt():
+    summarizer, prompts = make_summarizer([
+        '{"hypotheses": [{"id": 1, "reasoning": "r1"}]}',
+        '{"reasoning": "r2-single"}',
+    ])
+    hypotheses = [{"title": "a"}, {"title": "b"}]
+
+    result = await summarizer.enhance_hypotheses(hypotheses, [])
+
+    assert len(prompts) == 2
+    assert "Hypothesis: b" in prompts[1]
+    assert result[1]["reasoning"] == "r2-single"
+
+
+async def test_only_top_three_hypotheses_are_sent():
+    summarizer, prompts = make_summarizer(['{"hypotheses": []}', "{}", "{}", "{}"])
+    hypotheses = [{"title": str(i)} for i in range(5)]
+
+    await summarizer.enhance_hypotheses(hypotheses, [])
+
+    assert "[H3]" in prompts[0]
+    assert "[H4]" not in prompts[0]
+
+
+async def test_json_extraction_ignores_braces_in_surrounding_text():
+    summarizer, _ = make_summarizer([
+        'Note {see below}: {"reasoning": "r1"} and also {"reasoning": "other"}',
+    ])
+
+    result = await summarizer._enhance_single({"title": "a"}, "")
+
+    assert result == {"reasoning": "r1"}
+
+
+async def test_batch_reply_salvaged_from_surrounding_text():
+    summarizer, prompts = make_summarizer([
+        'Here you go: {"hypotheses": [{"id": 1, "reasoning": "r1"}]} Hope this helps!',
+    ])
+
+    result = await summarizer.enhance_hypotheses([{"title": "a"}], [])
+
+    assert len(prompts) == 1
+    assert result[0]["reasoning"] == "r1"
+
+
+async def test_batch_prompting_disabled_sends_one_prompt_per_hypothesis(monkeypatch):
+    monkeypatch.setattr(settings, "llm_batch_prompting", False)
+    summarizer, prompts = make_summarizer(['{"reasoning": "r1"}', '{"reasoning": "r2"}'])
+
+    result = await summarizer.enhance_hypotheses([{"title": "a"}, {"title": "b"}], [])
+
+    assert len(prompts) == 2
+    assert all(p.startswith("You are a Kubernetes incident analyst. Given") for p in prompts)
+    assert [h["reasoning"] for h in result] == ["r1", "r2"]
+
+
+def test_evidence_summary_orders_by_signal_and_drops_duplicates():
+    evidence = [
+        {"summary": "Pod restarted", "signal_strength": 0.2},
+        {"summary": "OOMKilled", "signal_strength": 0.9},
+        {"summary": "Pod restarted", "signal_strength": 0.5},
+        {"summary": "", "signal_strength": 1.0},
+    ]
+
+    summary = LLMSummarizer()._summarize_evidence(evidence)
+
+    assert summary == "- OOMKilled\n- Pod restarted"
+
+
+def test_evidence_summary_respects_token_budget():
+    evidence = [{"summary": f"{i:04d}" + "x" * 400, "signal_strength": 0.5} for i in range(50)]
+
+    summary = LLMSummarizer()._summarize_evidence(evidence)
+
+    assert 0 < len(summary) <= 4 * 800
+    assert summary.startswith("- 0000")
+
+
+async def test_repeated_hypothesis_and_evidence_served_from_cache():
+    summarizer, prompts = make_summarizer([
+        '{"hypotheses": [{"id": 1, "reasoning": "r1"}]}',
+        '{"hypotheses": [{"id": 1, "reasoning": "r2"}]}',
+    ])
+    evidence = [{"summary": "OOMKilled"}]
+
+    await summarizer.enhance_hypotheses([{"title": "a"}], evidence)
+    cached = await summarizer.enhance_hypotheses([{"title": "a"}, {"title": "b"}], evidence)
+
+    assert len(prompts) == 2
+    assert "[H1] title=b" in prompts[1] and "title=a" not in prompts[1]
+    assert [h["reasoning"] for h in cached] == ["r1", "r2"]
+
+
+@pytest.fixture
+def pattern_cache(monkeypatch):
+    monkeypatch.setattr(LLMSummarizer._pattern_cache, "ttl_seconds", 3600.0)
+
+
+async def test_pattern_cache_is_off_by_default():
+    summarizer, prompts = make_summarizer([
+        '{"hypotheses": [{"id": 1, "reasoning": "r1"}]}',
+        '{"hypotheses": [{"id": 1, "reasoning": "r2"}]}',
+    ])
+
+    await summarizer.enhance_hypotheses([{"title": "a"}], [{"evidence_type": "pod_status", "summary": "x"}])
+    result = await summarizer.enhance_hypotheses(
+        [{"title": "a"}], [{"evidence_type": "pod_status", "summary": "y"}],
+    )
+
+    assert len(prompts) == 2
+    assert result[0]["reasoning"] == "r2"
+
+
+async def test_recurring_incident_pattern_reuses_enhancements(pattern_cache):
+    summarizer, prompts = make_summarizer(['{"hypotheses": [{"id": 1, "reasoning": "r1"}]}'])
+
+    await summarizer.enhance_hypotheses(
+        [{"title": "a", "category": "oom"}],
+        [{"evidence_type": "pod_status", "summary": "api-1 OOMKilled"}],
+    )
+    recurring = await summarizer.enhance_hypotheses(
+        [{"title": "a", "category": "oom"}],
+        [{"evidence_type": "pod_status", "summary": "api-2 OOMKilled"}],
+    )
+
+    assert len(prompts) == 1
+    assert recurring[0]["reasoning"] == "r1"
+
+
+async def test_pattern_hits_get_their_own_copy(pattern_cache):
+    summarizer, _ = make_summarizer(
+        ['{"hypotheses": [{"id": 1, "reasoning": "r1", "additional_steps": ["s1"]}]}']
+    )
+    evidence = [{"evidence_type": "pod_status", "summary": "x"}]
+
+    first = await summarizer.enhance_hypotheses([{"title": "a"}], evidence)
+    first[0]["additional_steps"].append("edited")
+    second = await summarizer.enhance_hypotheses([{"title": "a"}], evidence)
+    second[0]["additional_steps"].append("edited again")
+    third = await summarizer.enhance_hypotheses([{"title": "a"}], evidence)
+
+    assert third[0]["additional_steps"] == ["s1"]
+
+
+async def test_different_evidence_mix_is_not_a_pattern_hit(pattern_cache):
+    summarizer, prompts = make_summarizer([
+        '{"hypotheses": [{"id": 1, "reasoning": "r1"}]}',
+        '{"hypotheses": [{"id": 1, "reasoning": "r2"}]}',
+    ])
+
+    await summarizer.enhance_hypotheses([{"title": "a"}], [{"evidence_type": "pod_status", "summary": "x"}])
+    result = await summarizer.enhance_hypotheses(
+        [{"title": "a"}], [{"evidence_type": "log_pattern", "summary": "y"}],
+    )
+
+    assert len(prompts) == 2
+    assert result[0]["reasoning"] == "r2"
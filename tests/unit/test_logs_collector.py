@@ -0,0 +1,64 @@
+"""Tests for log pattern extraction in the logs collector."""
+import pytest
+
+from src.services.collectors.logs_collector import LogsCollector
+
+
+@pytest.fixture
+def collector(incident) -> LogsCollector:
+    return LogsCollector(incident)
+
+
+def test_extract_log_patterns_reports_categories_in_pattern_order(collector):
+    entries = [
+        {"line": "dial tcp: connection refused"},
+        {"line": "ERROR: request failed"},
+        {"line": "container OOMKilled"},
+    ]
+
+    analysis = collector._extract_log_patterns(entries)
+
+    assert analysis["patterns_found"] == ["error", "oom", "network"]
+    assert analysis["error_count"] == 1
+    assert analysis["warning_count"] == 2
+
+
+def test_oom_pattern_raises_signal_strength(collector):
+    analysis = collector._extract_log_patterns([{"line": "container OOMKilled"}])
+
+    assert collector._calculate_log_signal_strength(analysis) == 0.95
+
+
+def test_error_keyword_past_scan_window_is_ignored(collector):
+    analysis = collector._extract_log_patterns([{"line": "x" * 600 + " error"}])
+
+    assert analysis["patterns_found"] == []
+
+
+def test_keyword_and_regex_patterns_match_case_insensitively(collector):
+    entries = [
+        {"line": "write: No Space Left on device"},
+        {"line": "storage volume is FULL"},
+        {"line": "Tls Handshake aborted"},
+    ]
+
+    analysis = collector._extract_log_patterns(entries)
+
+    assert analysis["patterns_found"] == ["disk", "tls"]
+    assert analysis["warning_count"] == 3
+
+
+def test_stack_traces_from_each_runtime_are_captured(collector):
+    stack_traces: list = []
+    lines = [
+        "    at com.example.Api.handle(Api.java:42)",
+        'File "/app/main.py", line 7, in <module>',
+        "goroutine 1 [running]:",
+        "    at handler (/app/index.js:10:5)",
+        "plain log line",
+    ]
+
+    for line in lines:
+        collector._match_stack_traces(line, stack_traces)
+
+    assert stack_traces == lines[:4]
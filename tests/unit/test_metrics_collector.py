@@ -0,0 +1,78 @@
+"""Tests for Prometheus result processing in the metrics collector."""
+import pytest
+
+from src.services.collectors import metrics_collector
+from src.services.collectors.metrics_collector import MetricsCollector
+
+
+@pytest.fixture
+def collector(incident) -> MetricsCollector:
+    return MetricsCollector(incident)
+
+
+def test_process_results_keeps_labels_once_per_series(collector):
+    results = [
+        {"metric": {"pod": "api-1"}, "values": [[1.0, "1"], [3.0, "3"]]},
+        {"metric": {"pod": "api-2"}, "values": [[2.0, "2"], [4.0, "NaN-ish"]]},
+    ]
+
+    metric_data = collector._process_results(results)
+
+    assert metric_data["series"] == [{"pod": "api-1"}, {"pod": "api-2"}]
+    assert metric_data["values"] == [(1.0, 1.0, 0), (2.0, 2.0, 1), (3.0, 3.0, 0)]
+
+
+def test_process_results_drops_infinite_values(collector):
+    results = [{"metric": {}, "values": [[1.0, "+Inf"], [2.0, "5"]]}]
+
+    metric_data = collector._process_results(results)
+
+    assert metric_data["values"] == [(2.0, 5.0, 0)]
+    assert metric_data["current_value"] == 5.0
+
+
+def test_signal_strength_uses_first_matching_keyword(collector):
+    # "memory_usage_percentage" must hit the memory check, not fall through.
+    assert collector._calculate_signal_strength({"current_value": 95}, "memory_usage_percentage") == 0.9
+    assert collector._calculate_signal_strength({"current_value": 0.2}, "http_5xx_rate") == 0.9
+    assert collector._calculate_signal_strength({"current_value": 1}, "unmatched") == 0.3
+
+
+def test_calculate_stats_single_pass_matches_reductions(collector):
+    values = [(1.0, 4.0, 0), (2.0, -1.0, 0), (3.0, 9.0, 0), (4.0, 2.0, 0)]
+
+    stats = collector._calculate_stats(values)
+
+    assert stats["min_value"] == -1.0
+    assert stats["max_value"] == 9.0
+    assert stats["avg_value"] == 3.5
+    assert stats["current_value"] == 2.0
+
+
+def test_calculate_stats_empty_values(collector):
+    stats = collector._calculate_stats([])
+
+    assert stats["values"] == []
+    assert stats["max_value"] is None
+
+
+def test_queries_are_loaded_once_per_process(incident):
+    metrics_collector._parse_queries_file.cache_clear()
+    first = MetricsCollector(incident)
+    second = MetricsCollector(incident)
+
+    assert metrics_collector._parse_queries_file.cache_info().misses == 1
+    assert "crashloop" in first.queries
+    first.queries["crashloop"].clear()
+    assert second.queries["crashloop"]
+    assert second.queries == MetricsCollector(incident).queries
+
+
+def test_failed_query_load_is_retried(incident, tmp_path, monkeypatch):
+    queries_file = tmp_path / "promql_queries.yaml"
+    monkeypatch.setattr(metrics_collector, "QUERIES_FILE", queries_file)
+
+    assert MetricsCollector(incident).queries == {}
+
+    queries_file.write_text("crashloop:\n  - name: restarts\n")
+    assert MetricsCollector(incident).queries == {"crashloop": [{"name": "restarts"}]}
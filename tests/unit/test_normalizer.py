@@ -71,3 +71,45 @@ def test_normalize_alertmanager_defaults_when_fields_missing():
     assert incident.title == "Unknown Alert"
     assert incident.namespace == "default"
     assert incident.severity == IncidentSeverity.MEDIUM
+
+
+def test_normalize_alertmanager_parses_zulu_starts_at():
+    alert = {"labels": {}, "annotations": {}, "startsAt": "2026-01-05T05:00:00Z"}
+
+    incident = AlertNormalizer.normalize_alertmanager(alert, {})
+
+    assert incident.started_at.isoformat() == "2026-01-05T05:00:00+00:00"
+
+
+def test_normalize_alertmanager_invalid_starts_at_falls_back_to_now():
+    alert = {"labels": {}, "annotations": {}, "startsAt": "not-a-timestamp"}
+
+    incident = AlertNormalizer.normalize_alertmanager(alert, {})
+
+    assert incident.started_at.tzinfo is not None
+
+
+def test_severity_mapping_is_case_insensitive():
+    alert = {"labels": {"severity": "CRITICAL"}, "annotations": {}}
+
+    incident = AlertNormalizer.normalize_alertmanager(alert, {})
+
+    assert incident.severity == IncidentSeverity.CRITICAL
+
+
+def test_normalize_alertmanager_parses_nanosecond_starts_at():
+    alert = {"labels": {}, "annotations": {}, "startsAt": "2026-01-05T05:00:00.123456789Z"}
+
+    incident = AlertNormalizer.normalize_alertmanager(alert, {})
+
+    assert incident.started_at.isoformat() == "2026-01-05T05:00:00.123456+00:00"
+
+
+def test_normalize_grafana_alert_labels_override_common_labels():
+    alert = {"labels": {"namespace": "staging"}, "annotations": {}}
+    payload = {"commonLabels": {"alertname": "HighLatency", "namespace": "prod"}}
+
+    incident = AlertNormalizer.normalize_grafana(alert, payload)
+
+    assert incident.namespace == "staging"
+    assert incident.labels == {"alertname": "HighLatency", "namespace": "staging"}
@@ -0,0 +1,130 @@
+"""Tests for OPA policy client decision caching."""
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from src.services.policy.opa_client import INPUT_HASH_HEADER, OPAClient
+
+
+@pytest.fixture(autouse=True)
+def clear_decision_cache():
+    OPAClient._decisions.clear()
+    yield
+    OPAClient._decisions.clear()
+
+
+def make_client(results: list) -> tuple[OPAClient, list[bytes]]:
+    """Build a client whose OPA queries return (or raise) the given results in order."""
+    client = OPAClient()
+    queries: list[bytes] = []
+
+    async def query(body: bytes, input_hash: str) -> dict:
+        queries.append(body)
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client._query_opa = query
+    return client, queries
+
+
+async def evaluate(client: OPAClient, score: float = 20.0) -> dict:
+    return await client.evaluate_remediation(
+        action_type="restart_pod",
+        environment="staging",
+        blast_radius_score=score,
+        namespace="payments",
+    )
+
+
+async def test_repeated_input_served_from_cache():
+    client, queries = make_client([{"allow": True, "requires_approval": False}])
+
+    first = await evaluate(client)
+    second = await evaluate(client)
+
+    assert len(queries) == 1
+    assert first == second
+    assert second["allow"] is True
+
+
+async def test_different_blast_radius_is_queried_separately():
+    client, queries = make_client([{"allow": True}, {"allow": False, "deny": ["too big"]}])
+
+    await evaluate(client, score=20.0)
+    result = await evaluate(client, score=80.0)
+
+    assert len(queries) == 2
+    assert result["reason"] == "too big"
+
+
+async def test_errors_are_not_cached():
+    client, queries = make_client([RuntimeError("connection refused"), {"allow": True}])
+
+    failed = await evaluate(client)
+    recovered = await evaluate(client)
+
+    assert failed["allow"] is False
+    assert recovered["allow"] is True
+    assert len(queries) == 2
+
+
+async def test_concurrent_misses_share_one_query():
+    client = OPAClient()
+    queries: list[bytes] = []
+
+    async def query(body: bytes, input_hash: str) -> dict:
+        queries.append(body)
+        await asyncio.sleep(0.01)
+        return {"allow": True, "requires_approval": False}
+
+    client._query_opa = query
+
+    results = await asyncio.gather(*(
+        client.evaluate_remediation("restart_pod", "staging", 20.0, "payments") for _ in range(3)
+    ))
+
+    assert len(queries) == 1
+    assert all(r["allow"] for r in results)
+    assert not OPAClient._inflight
+
+
+async def test_cancelled_caller_does_not_cancel_coalesced_query():
+    client = OPAClient()
+    release = asyncio.Event()
+
+    async def query(body: bytes, input_hash: str) -> dict:
+        await release.wait()
+        return {"allow": True, "requires_approval": False}
+
+    client._query_opa = query
+
+    first = asyncio.create_task(evaluate(client))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(evaluate(client))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert (await second)["allow"] is True
+    assert first.cancelled()
+    assert not OPAClient._inflight
+
+
+async def test_query_sends_encoded_input_and_hash_header(monkeypatch):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"result": {"allow": True}})
+
+    monkeypatch.setattr(OPAClient, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    await evaluate(OPAClient())
+
+    (request,) = requests
+    assert orjson.loads(request.content)["input"]["namespace"] == "payments"
+    assert len(request.headers[INPUT_HASH_HEADER]) == 32
@@ -0,0 +1,60 @@
+"""Tests for remediation blast radius calculation."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from kubernetes import client
+
+from src.services.remediation import orchestrator
+from src.services.remediation.orchestrator import RemediationOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def clear_deployment_cache():
+    RemediationOrchestrator._deployments.clear()
+    RemediationOrchestrator._blast_failures.clear()
+    yield
+    RemediationOrchestrator._deployments.clear()
+    RemediationOrchestrator._blast_failures.clear()
+
+
+@pytest.fixture
+def apps_v1(monkeypatch) -> MagicMock:
+    api = MagicMock()
+    monkeypatch.setattr(orchestrator, "get_kube_clients", lambda: (MagicMock(), api))
+    return api
+
+
+async def test_repeated_blast_radius_reads_deployment_once(apps_v1, incident):
+    apps_v1.read_namespaced_deployment.return_value = SimpleNamespace(spec=SimpleNamespace(replicas=3))
+    orchestrator = RemediationOrchestrator()
+
+    first = await orchestrator.calculate_blast_radius(incident)
+    second = await orchestrator.calculate_blast_radius(incident)
+
+    assert first == second
+    assert first["affected_pods"] == 3
+    apps_v1.read_namespaced_deployment.assert_called_once()
+
+
+async def test_missing_deployment_is_cached_as_empty(apps_v1, incident):
+    apps_v1.read_namespaced_deployment.side_effect = client.ApiException(status=404)
+    orchestrator = RemediationOrchestrator()
+
+    await orchestrator.calculate_blast_radius(incident)
+    result = await orchestrator.calculate_blast_radius(incident)
+
+    assert result["affected_pods"] == 0
+    apps_v1.read_namespaced_deployment.assert_called_once()
+
+
+async def test_blast_radius_failure_is_cached(apps_v1, incident):
+    apps_v1.read_namespaced_deployment.side_effect = ConnectionError("apiserver unavailable")
+    orchestrator = RemediationOrchestrator()
+
+    await orchestrator.calculate_blast_radius(incident)
+    result = await orchestrator.calculate_blast_radius(incident)
+
+    assert result["score"] == 100
+    assert result["is_acceptable"] is False
+    apps_v1.read_namespaced_deployment.assert_called_once()
@@ -0,0 +1,116 @@
+"""Tests for circuit breaking, HTTP retries and TTL caching."""
+import httpx
+import pytest
+
+from src.services import resilience
+from src.services.resilience import CircuitBreaker, CircuitOpenError, TTLCache, send_with_retry
+
+
+async def fail():
+    raise httpx.ConnectError("connection refused")
+
+
+async def succeed():
+    return "ok"
+
+
+async def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await breaker.call(fail)
+
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(succeed)
+
+
+async def test_half_open_trial_success_closes_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+
+    with pytest.raises(httpx.ConnectError):
+        await breaker.call(fail)
+    assert breaker.is_open
+
+    assert await breaker.call(succeed) == "ok"
+    assert not breaker.is_open
+
+
+async def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+    with pytest.raises(httpx.ConnectError):
+        await breaker.call(fail)
+    await breaker.call(succeed)
+    with pytest.raises(httpx.ConnectError):
+        await breaker.call(fail)
+
+    assert not breaker.is_open
+
+
+def make_sender(status_codes: list[int]):
+    request = httpx.Request("POST", "http://opa.test/v1/data")
+    sent: list[int] = []
+
+    async def send() -> httpx.Response:
+        sent.append(1)
+        return httpx.Response(status_codes.pop(0), request=request)
+
+    return send, sent
+
+
+async def test_retryable_status_is_retried_once():
+    send, sent = make_sender([503, 200])
+
+    response = await send_with_retry(send, base_delay=0)
+
+    assert response.status_code == 200
+    assert len(sent) == 2
+
+
+async def test_client_errors_are_not_retried():
+    send, sent = make_sender([400, 200])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await send_with_retry(send, base_delay=0)
+
+    assert len(sent) == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(max_size=4, ttl_seconds=0)
+
+    cache.put(("key",), {"allow": True})
+
+    assert cache.get(("key",)) is None
+
+
+def test_ttl_cache_expires_and_discards(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    cache = TTLCache(max_size=4, ttl_seconds=30)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    cache.discard("a")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    now += 31
+
+    assert cache.get("b") is None
@@ -100,3 +100,84 @@ async def test_hypotheses_sorted_by_confidence_descending(engine, incident):
 
     confidences = [h["confidence"] for h in hypotheses]
     assert confidences == sorted(confidences, reverse=True)
+
+
+def test_every_rule_condition_has_a_handler():
+    from src.services.rca.rules_engine import CONDITION_CHECKS, DIAGNOSIS_RULES
+
+    for rule in DIAGNOSIS_RULES:
+        for condition in rule["conditions"]:
+            assert condition["type"] in CONDITION_CHECKS, (rule["id"], condition["type"])
+
+
+def test_candidate_rules_never_skip_a_matching_rule(engine):
+    from src.services.rca.rules_engine import COMPILED_RULES, candidate_rule_indices, rule_strength
+
+    evidence_sets = [
+        [make_pod_evidence(waiting_reason="CrashLoopBackOff")],
+        [make_pod_evidence(waiting_reason="ErrImagePull"), make_deploy_evidence(is_recent_change=True)],
+        [make_pod_evidence(terminated_reason="CreateContainerConfigError")],
+        [make_log_evidence(patterns_found=["connection", "network"], error_count=20)],
+        [
+            make_pod_evidence(evidence_id="ev-1", terminated_reason="OOMKilled", node_name="node-1"),
+            make_pod_evidence(evidence_id="ev-2", restart_count=2, node_name="node-1"),
+            make_node_evidence(node_name="node-1", ready=False),
+        ],
+    ]
+
+    for evidence in evidence_sets:
+        signals = engine._extract_signals(evidence)
+        full_scan = {i for i, rule in enumerate(COMPILED_RULES) if rule_strength(rule, signals) is not None}
+        indexed = {i for i in candidate_rule_indices(signals) if rule_strength(COMPILED_RULES[i], signals) is not None}
+        assert full_scan
+        assert indexed == full_scan
+
+
+async def test_repeated_signals_reuse_memoized_matches(engine, incident):
+    from src.services.rca.rules_engine import match_signal_key
+
+    match_signal_key.cache_clear()
+    first = await engine.generate_hypotheses(incident, [make_pod_evidence(evidence_id="ev-1", terminated_reason="OOMKilled")])
+    second = await engine.generate_hypotheses(incident, [make_pod_evidence(evidence_id="ev-2", terminated_reason="OOMKilled")])
+
+    assert match_signal_key.cache_info().hits == 1
+    assert [h["rule_id"] for h in first] == [h["rule_id"] for h in second]
+    assert first[0]["id"] != second[0]["id"]
+    assert second[0]["supporting_evidence_ids"] == ["ev-2"]
+
+
+async def test_evidence_generator_consumed_with_bounded_evidence_ids(engine, incident):
+    evidence = (
+        make_pod_evidence(evidence_id=f"ev-{i}", terminated_reason="OOMKilled", node_name=f"node-{i}")
+        for i in range(20)
+    )
+
+    hypotheses = await engine.generate_hypotheses(incident, evidence)
+
+    assert hypotheses[0]["supporting_evidence_ids"] == ["ev-0", "ev-1", "ev-2", "ev-3", "ev-4"]
+
+
+def test_counts_between_thresholds_share_a_signal_key(engine):
+    from src.services.rca.rules_engine import signal_key
+
+    keys = {
+        signal_key(engine._extract_signals([make_log_evidence(patterns_found=["network"], error_count=count)]))
+        for count in (101, 102, 5000)
+    }
+    below = signal_key(engine._extract_signals([make_log_evidence(patterns_found=["network"], error_count=9)]))
+
+    assert len(keys) == 1
+    assert below not in keys
+
+
+async def test_top_k_keeps_most_confident_hypotheses(engine, incident):
+    evidence = [
+        make_pod_evidence(terminated_reason="OOMKilled"),
+        make_log_evidence(patterns_found=["network"], error_count=15),
+    ]
+
+    all_hypotheses = await engine.generate_hypotheses(incident, evidence)
+    top = await engine.generate_hypotheses(incident, evidence, top_k=1)
+
+    assert len(all_hypotheses) > 1
+    assert [h["rule_id"] for h in top] == [all_hypotheses[0]["rule_id"]]
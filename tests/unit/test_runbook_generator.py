@@ -0,0 +1,68 @@
+"""Tests for runbook generation and storage rows."""
+import json
+import uuid
+
+from src.config import settings
+from src.services.runbook.generator import RunbookGenerator, uuid7
+
+
+def test_runbook_row_content_round_trips_sections(incident):
+    sections = {
+        "summary": 'Pod "api" crash looping',
+        "investigation_commands": [{"name": "Logs", "command": "kubectl logs api"}],
+        "dashboard_links": [{"name": "Overview", "url": "http://grafana/d/x"}],
+    }
+    runbook = {
+        "id": "rb-1",
+        "title": "Runbook",
+        "generated_at": "2024-05-01T12:00:00+00:00",
+        "sections": sections,
+    }
+
+    row = RunbookGenerator()._runbook_row(runbook, incident)
+
+    assert row["generated_at"].isoformat() == runbook["generated_at"]
+    assert json.loads(row["content"]) == sections
+    assert json.loads(row["commands"]) == sections["investigation_commands"]
+    assert json.loads(row["dashboard_links"]) == sections["dashboard_links"]
+
+
+def test_commands_fill_templates_for_incident_service(incident):
+    hypotheses = [{"recommended_actions": ["restart_deployment", "kubectl get hpa -n default"]}]
+
+    commands = RunbookGenerator()._generate_commands(incident, hypotheses)
+
+    assert commands[0]["command"] == "kubectl logs -n default -l app=api-server --tail=100"
+    assert "kubectl rollout restart deployment/api-server -n default" in [c["command"] for c in commands]
+    assert commands[-1] == {"description": "Recommended action", "command": "kubectl get hpa -n default"}
+
+
+def test_dashboard_links_quote_service_and_namespace(incident, monkeypatch):
+    monkeypatch.setattr(settings, "grafana_url", "http://grafana")
+    incident.service = "api server"
+
+    links = RunbookGenerator()._generate_dashboard_links(incident)
+
+    assert [link["name"] for link in links] == [
+        "Kubernetes Overview", "Pod Resources", "Application Metrics", "Logs Explorer",
+    ]
+    assert links[1]["url"] == "http://grafana/d/pod-resources?var-namespace=default&var-pod=api%20server"
+    assert "%7Bnamespace%3D%5C%22default%5C%22%7D" in links[3]["url"]
+
+
+def test_uuid7_ids_are_version_7_and_time_ordered():
+    ids = [uuid7() for _ in range(100)]
+
+    assert all(i.version == 7 and i.variant == uuid.RFC_4122 for i in ids)
+    assert [i.int >> 80 for i in ids] == sorted(i.int >> 80 for i in ids)
+
+
+def test_investigation_steps_include_category_steps():
+    generator = RunbookGenerator()
+
+    steps = generator._generate_investigation_steps([{"category": "bad_deployment"}])
+    unknown = generator._generate_investigation_steps([])
+
+    assert steps[5] == "6. Check recent deployments with: kubectl rollout history"
+    assert len(steps) == 9
+    assert unknown[-2:] == list(RunbookGenerator.FINAL_STEPS) and len(unknown) == 7
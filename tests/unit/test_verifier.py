@@ -6,21 +6,37 @@ were a boolean, instead of pod_health["all_healthy"]. That made "success" and
 "metrics_improved" evaluate truthy whenever at least one pod was healthy,
 even if the rest of the fleet was still crashing.
 """
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
-from src.services.remediation.verifier import RemediationVerifier
+from src.config import settings
+from src.services.remediation.verifier import BATCH_KEY_LABEL, RemediationVerifier
+from src.services.remediation.watch_cache import KubernetesWatchCache
 
 
-@pytest.fixture
-def verifier() -> RemediationVerifier:
+@pytest.fixture(params=[True, False], ids=["batched", "per-check"])
+def verifier(request, monkeypatch) -> RemediationVerifier:
+    monkeypatch.setattr(settings, "prometheus_batch_verification_queries", request.param)
     return RemediationVerifier()
 
 
+def stub_rates(verifier, monkeypatch, error_improved: bool, restart_improved: bool) -> AsyncMock:
+    """Stub the batched and per-check rate probes; returns the error rate probe verify() uses."""
+    error_rate, restart_rate = {"improved": error_improved}, {"improved": restart_improved}
+    per_check = AsyncMock(return_value=error_rate)
+    batched = AsyncMock(return_value=(error_rate, restart_rate))
+    monkeypatch.setattr(verifier, "_check_error_rate", per_check)
+    monkeypatch.setattr(verifier, "_check_restart_rate", AsyncMock(return_value=restart_rate))
+    monkeypatch.setattr(verifier, "_check_rates_batched", batched)
+    return batched if settings.prometheus_batch_verification_queries else per_check
+
+
 async def test_verify_fails_when_pods_still_unhealthy(verifier, incident, monkeypatch):
-    monkeypatch.setattr(verifier, "_check_error_rate", AsyncMock(return_value={"improved": False}))
-    monkeypatch.setattr(verifier, "_check_restart_rate", AsyncMock(return_value={"improved": False}))
+    stub_rates(verifier, monkeypatch, error_improved=False, restart_improved=False)
     monkeypatch.setattr(
         verifier,
         "_check_pod_health",
@@ -34,8 +50,7 @@ async def test_verify_fails_when_pods_still_unhealthy(verifier, incident, monkey
 
 
 async def test_verify_succeeds_when_all_pods_healthy_and_metric_improved(verifier, incident, monkeypatch):
-    monkeypatch.setattr(verifier, "_check_error_rate", AsyncMock(return_value={"improved": True}))
-    monkeypatch.setattr(verifier, "_check_restart_rate", AsyncMock(return_value={"improved": False}))
+    stub_rates(verifier, monkeypatch, error_improved=True, restart_improved=False)
     monkeypatch.setattr(
         verifier,
         "_check_pod_health",
@@ -50,8 +65,7 @@ async def test_verify_succeeds_when_all_pods_healthy_and_metric_improved(verifie
 
 async def test_verify_does_not_succeed_on_improved_metric_alone(verifier, incident, monkeypatch):
     """metrics_improved alone (e.g. error rate down) must not mark success if pods aren't all healthy."""
-    monkeypatch.setattr(verifier, "_check_error_rate", AsyncMock(return_value={"improved": True}))
-    monkeypatch.setattr(verifier, "_check_restart_rate", AsyncMock(return_value={"improved": False}))
+    stub_rates(verifier, monkeypatch, error_improved=True, restart_improved=False)
     monkeypatch.setattr(
         verifier,
         "_check_pod_health",
@@ -62,3 +76,92 @@ async def test_verify_does_not_succeed_on_improved_metric_alone(verifier, incide
 
     assert result["metrics_improved"] is True
     assert result["success"] is False
+
+
+async def test_concurrent_verifications_of_same_incident_share_one_run(verifier, incident, monkeypatch):
+    error_rate = stub_rates(verifier, monkeypatch, error_improved=True, restart_improved=False)
+    monkeypatch.setattr(
+        verifier,
+        "_check_pod_health",
+        lambda namespace, service: {"total": 3, "healthy": 3, "all_healthy": True},
+    )
+
+    first, second = await asyncio.gather(verifier.verify(incident), verifier.verify(incident))
+
+    assert first is second
+    assert error_rate.await_count == 1
+    assert RemediationVerifier._inflight == {}
+
+
+async def test_cancelled_caller_does_not_cancel_joined_verification(verifier, incident, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_verify(incident):
+        await release.wait()
+        return {"success": True}
+
+    monkeypatch.setattr(verifier, "_verify", slow_verify)
+
+    first = asyncio.create_task(verifier.verify(incident))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(verifier.verify(incident))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == {"success": True}
+    assert first.cancelled()
+    assert RemediationVerifier._inflight == {}
+
+
+class FakePrometheus:
+    """Stands in for the shared HTTP client and answers batched queries."""
+
+    def __init__(self, values: dict[str, str]):
+        self.values = values
+        self.posts: list[dict] = []
+
+    async def post(self, url: str, data: dict) -> httpx.Response:
+        self.posts.append(data)
+        result = [
+            {"metric": {BATCH_KEY_LABEL: key}, "value": [0, value]}
+            for key, value in self.values.items()
+        ]
+        return httpx.Response(
+            200,
+            json={"status": "success", "data": {"resultType": "vector", "result": result}},
+            request=httpx.Request("POST", url),
+        )
+
+
+async def test_batched_rates_use_one_request(incident, monkeypatch):
+    prometheus = FakePrometheus({
+        "error_rate_current": "0.01",
+        "error_rate_before": "0.2",
+        "restart_rate_current": "3",
+    })
+    monkeypatch.setattr(RemediationVerifier, "_get_http_client", classmethod(lambda cls: prometheus))
+
+    error_rate, restart_rate = await RemediationVerifier()._check_rates_batched("default", "api-server")
+
+    assert len(prometheus.posts) == 1
+    assert prometheus.posts[0]["query"].count(" or ") == 3
+    assert error_rate == {"current": 0.01, "before": 0.2, "improved": True}
+    assert restart_rate == {"current": 3.0, "before": None, "improved": False}
+
+
+def make_pod(phase: str, ready: str | None) -> SimpleNamespace:
+    conditions = [SimpleNamespace(type="Ready", status=ready)] if ready else None
+    return SimpleNamespace(status=SimpleNamespace(phase=phase, conditions=conditions))
+
+
+def test_pod_health_counts_running_and_ready_pods(verifier, monkeypatch):
+    pods = [make_pod("Running", "True"), make_pod("Running", None), make_pod("Running", "False"), make_pod("Pending", "True")]
+    monkeypatch.setattr(settings, "kubernetes_watch_cache_enabled", True)
+    monkeypatch.setattr(KubernetesWatchCache, "pods", classmethod(lambda cls, namespace, app: pods))
+
+    health = verifier._check_pod_health("default", "api-server")
+
+    assert health["total"] == 4
+    assert health["healthy"] == 2
+    assert health["all_healthy"] is False
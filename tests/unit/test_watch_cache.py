@@ -0,0 +1,50 @@
+"""Tests for the informer-style Kubernetes watch cache."""
+import threading
+from types import SimpleNamespace
+
+from src.services.remediation import watch_cache
+from src.services.remediation.watch_cache import NamespaceWatch
+
+
+def make_pod(name: str, app: str | None = "api") -> SimpleNamespace:
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, labels={"app": app} if app else None))
+
+
+def make_listing(*pods) -> SimpleNamespace:
+    return SimpleNamespace(items=list(pods), metadata=SimpleNamespace(resource_version="42"))
+
+
+def test_events_update_name_and_app_indexes():
+    mirror = NamespaceWatch(lambda **kwargs: None, "default")
+
+    mirror._apply("ADDED", make_pod("api-1"))
+    mirror._apply("ADDED", make_pod("worker-1", app="worker"))
+    mirror._apply("MODIFIED", make_pod("api-1", app="api-v2"))
+    mirror._apply("DELETED", make_pod("worker-1", app="worker"))
+
+    assert mirror.by_app("api") == []
+    assert [p.metadata.name for p in mirror.by_app("api-v2")] == ["api-1"]
+    assert [p.metadata.name for p in mirror.by_app(None)] == ["api-1"]
+    assert mirror.get("worker-1") is None
+
+
+def test_watch_lists_then_applies_stream_events(monkeypatch):
+    done = threading.Event()
+
+    class FakeWatch:
+        def stream(self, list_func, **kwargs):
+            assert kwargs["resource_version"] == "42"
+            yield {"type": "ADDED", "object": make_pod("api-2")}
+            done.set()
+            mirror.stop()
+            yield {"type": "ADDED", "object": make_pod("api-3")}
+
+    monkeypatch.setattr(watch_cache.watch, "Watch", FakeWatch)
+    mirror = NamespaceWatch(lambda **kwargs: make_listing(make_pod("api-1")), "default")
+
+    mirror.start()
+
+    assert done.wait(timeout=2)
+    mirror._thread.join(timeout=2)
+    assert mirror.synced.is_set()
+    assert sorted(p.metadata.name for p in mirror.by_app("api")) == ["api-1", "api-2"]
@@ -0,0 +1,27 @@
+"""Tests for the orjson-backed Temporal payload converter."""
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from src.services.workflow.converter import data_converter
+
+
+def test_payloads_round_trip_as_plain_json():
+    converter = data_converter.payload_converter
+    incident_id = uuid4()
+    value = {"incident_id": incident_id, "tags": {"oom"}, "at": datetime(2024, 1, 1, tzinfo=UTC), "n": 3}
+
+    [payload] = converter.to_payloads([value])
+
+    assert payload.metadata["encoding"] == b"json/plain"
+    assert converter.from_payloads([payload])[0] == {
+        "incident_id": str(incident_id),
+        "tags": ["oom"],
+        "at": "2024-01-01T00:00:00Z",
+        "n": 3,
+    }
+
+
+def test_non_json_payloads_keep_default_encodings():
+    [payload] = data_converter.payload_converter.to_payloads([b"raw"])
+
+    assert payload.metadata["encoding"] == b"binary/plain"